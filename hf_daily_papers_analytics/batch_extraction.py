@@ -0,0 +1,355 @@
+"""Bulk author_info extraction through the OpenAI Batch API.
+
+Instead of one chat completion per paper, every paper's extraction request is written
+to JSONL request files (one line per paper, `custom_id` = paper_id), uploaded and run
+as batches, then the output files are parsed back into author_info lists. Requests
+point at the HF thumbnail URLs directly, so nothing is downloaded locally.
+
+The client only needs the subset of the `openai.OpenAI` interface used here
+(`files.create`, `files.content`, `batches.create`, `batches.retrieve`), so
+`LocalBatchClient` can stand in for the API offline. Submitted batch ids and the request
+files not yet submitted are kept in a state file, updated after every submission, so an
+interrupted run submits only the remaining files and resumes polling the rest.
+"""
+
+import json
+import os
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Callable
+
+from hf_daily_papers_analytics.hf_papers_scraper import (
+    build_extraction_request,
+    image_part,
+    parse_author_info,
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Batch API input file limits: 50,000 requests and 200 MB per file
+MAX_REQUESTS_PER_FILE = 50_000
+MAX_BYTES_PER_FILE = 200 * 1024 * 1024
+
+DEFAULT_BATCH_DIR = ".cache/openai_batches"
+DEFAULT_POLL_INTERVAL = 60.0  # seconds
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_requests(paper_url_map: dict[str, str]) -> list[dict]:
+    """One Batch API request line per paper, asking for the authors in its thumbnail."""
+    return [
+        {
+            "custom_id": str(paper_id),
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": build_extraction_request(image_part(url)),
+        }
+        for paper_id, url in paper_url_map.items()
+    ]
+
+
+def write_batch_files(
+    requests: list[dict],
+    batch_dir: str,
+    max_requests: int = MAX_REQUESTS_PER_FILE,
+    max_bytes: int = MAX_BYTES_PER_FILE,
+) -> list[str]:
+    """Writes requests to as many JSONL files as the per-file limits require."""
+    os.makedirs(batch_dir, exist_ok=True)
+    paths = []
+    lines, size = [], 0
+
+    def flush():
+        path = os.path.join(batch_dir, f"requests-{len(paths):04d}.jsonl")
+        with open(path, "w") as f:
+            f.writelines(lines)
+        paths.append(path)
+
+    for request in requests:
+        line = json.dumps(request) + "\n"
+        line_size = len(line.encode("utf-8"))
+        if lines and (len(lines) >= max_requests or size + line_size > max_bytes):
+            flush()
+            lines, size = [], 0
+        lines.append(line)
+        size += line_size
+    if lines:
+        flush()
+    return paths
+
+
+def submit_batch_files(
+    client,
+    paths: list[str],
+    on_submitted: Callable[[str, str], None] | None = None,
+) -> list[str]:
+    """Uploads each request file and starts a batch on it. Returns the batch ids.
+
+    on_submitted(path, batch_id) is called after each batch is created, so callers can
+    record it before the next upload (which may fail).
+    """
+    batch_ids = []
+    for path in paths:
+        with open(path, "rb") as f:
+            input_file = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+        )
+        print(f"  Submitted {os.path.basename(path)} as batch {batch.id}")
+        batch_ids.append(batch.id)
+        if on_submitted is not None:
+            on_submitted(path, batch.id)
+    return batch_ids
+
+
+def poll_batches(client, batch_ids: list[str], interval: float = DEFAULT_POLL_INTERVAL) -> list:
+    """Waits until every batch reaches a terminal status and returns the batch objects."""
+    batches = {}
+    while True:
+        for batch_id in batch_ids:
+            if batch_id not in batches or batches[batch_id].status not in TERMINAL_STATUSES:
+                batches[batch_id] = client.batches.retrieve(batch_id)
+        pending = [b for b in batches.values() if b.status not in TERMINAL_STATUSES]
+        done = sum(b.request_counts.completed + b.request_counts.failed for b in batches.values())
+        total = sum(b.request_counts.total for b in batches.values())
+        print(f"  {len(batch_ids) - len(pending)}/{len(batch_ids)} batches finished, "
+              f"{done}/{total} requests processed")
+        if not pending:
+            return [batches[batch_id] for batch_id in batch_ids]
+        time.sleep(interval)
+
+
+def parse_batch_output(text: str) -> tuple[dict[str, list[dict]], set[str]]:
+    """Parses a batch output (or error) file into paper_id -> author_info.
+
+    Returns the parsed results and the paper_ids of lines that errored or could not
+    be parsed; those papers are left out and get picked up by the next run.
+    """
+    results = {}
+    failed = set()
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            failed.add(record["custom_id"])
+            continue
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            authors = parse_author_info(content)
+        except (KeyError, IndexError, TypeError, ValueError):
+            failed.add(record["custom_id"])
+            continue
+        results[record["custom_id"]] = [author.model_dump() for author in authors]
+    return results, failed
+
+
+def collect_batch_results(client, batches: list) -> tuple[dict[str, list[dict]], int]:
+    """Downloads and parses the outputs of finished batches.
+
+    Expired batches still have an output file with the requests that completed in
+    time. Failed requests are read from both the output and the error files and
+    counted once per paper_id. Returns paper_id -> author_info and the number of
+    papers whose request failed.
+    """
+    results = {}
+    failed = set()
+    for batch in batches:
+        if batch.status != "completed":
+            print(f"  Batch {batch.id} ended with status {batch.status}")
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                file_results, file_failed = parse_batch_output(client.files.content(file_id).text)
+                results.update(file_results)
+                failed |= file_failed
+    return results, len(failed - results.keys())
+
+
+def load_batch_state(batch_dir: str) -> dict:
+    """Returns {"batch_ids": [...], "pending_files": [...]} for a run not yet ingested.
+
+    batch_ids are the batches submitted so far; pending_files the request files
+    written but not submitted yet.
+    """
+    path = os.path.join(batch_dir, "state.json")
+    if not os.path.exists(path):
+        return {"batch_ids": [], "pending_files": []}
+    with open(path) as f:
+        state = json.load(f)
+    state.setdefault("pending_files", [])
+    return state
+
+
+def save_batch_state(state: dict, batch_dir: str) -> None:
+    os.makedirs(batch_dir, exist_ok=True)
+    path = os.path.join(batch_dir, "state.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_batch_extraction(
+    client,
+    paper_url_map: dict[str, str],
+    batch_dir: str = DEFAULT_BATCH_DIR,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    on_results: Callable[[dict[str, list[dict]]], None] | None = None,
+) -> dict[str, list[dict]]:
+    """Extracts author_info for paper_url_map (paper_id -> thumbnail URL) in batches.
+
+    The state file is saved after every submission. A run interrupted while
+    submitting or polling is resumed from it: remaining request files are submitted,
+    and the batches are polled and ingested instead of writing new requests.
+    on_results is called with the parsed results before the state file is cleared,
+    so callers can persist them first; if it raises, the next run ingests the same
+    batches again.
+    """
+    state = load_batch_state(batch_dir)
+    if state["batch_ids"] or state["pending_files"]:
+        print(f"Resuming {len(state['batch_ids'])} submitted batches and "
+              f"{len(state['pending_files'])} unsubmitted files from {batch_dir}")
+    else:
+        requests = build_batch_requests(paper_url_map)
+        paths = write_batch_files(requests, batch_dir)
+        print(f"Wrote {len(requests)} requests to {len(paths)} batch files in {batch_dir}")
+        state = {"batch_ids": [], "pending_files": paths}
+        save_batch_state(state, batch_dir)
+
+    def record_submission(path, batch_id):
+        state["batch_ids"].append(batch_id)
+        state["pending_files"].remove(path)
+        save_batch_state(state, batch_dir)
+
+    submit_batch_files(client, list(state["pending_files"]), on_submitted=record_submission)
+
+    batches = poll_batches(client, state["batch_ids"], poll_interval)
+    results, num_failed = collect_batch_results(client, batches)
+    print(f"Parsed author info for {len(results)} papers ({num_failed} failed requests)")
+    if on_results is not None:
+        on_results(results)
+    save_batch_state({"batch_ids": [], "pending_files": []}, batch_dir)
+    return results
+
+
+def placeholder_response(request: dict) -> str:
+    """LocalBatchClient's default answer: one placeholder author named after the paper."""
+    return json.dumps({
+        "authors": [{"name": f"Author of {request['custom_id']}", "affiliation": "", "email": ""}]
+    })
+
+
+class LocalBatchClient:
+    """Offline stand-in for the OpenAI Batch API, keeping files and batches in a directory.
+
+    Batches are persisted next to the files, so a later process (e.g. a resumed run)
+    can retrieve them. A batch runs on the retrieve call that reaches
+    polls_to_complete: each request line is answered by respond(request) -> message
+    content, or recorded as a failed request if respond raises.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        respond: Callable[[dict], str] = placeholder_response,
+        polls_to_complete: int = 1,
+    ):
+        self.root = root
+        self.respond = respond
+        self.polls_to_complete = polls_to_complete
+        os.makedirs(root, exist_ok=True)
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def _write_file(self, data: bytes) -> str:
+        file_id = f"file-{uuid.uuid4().hex}"
+        with open(os.path.join(self.root, file_id), "wb") as f:
+            f.write(data)
+        return file_id
+
+    def _create_file(self, file, purpose: str):
+        return SimpleNamespace(id=self._write_file(file.read()), purpose=purpose)
+
+    def _file_content(self, file_id: str):
+        with open(os.path.join(self.root, file_id), "rb") as f:
+            return SimpleNamespace(text=f.read().decode("utf-8"))
+
+    def _save_batch(self, record: dict) -> None:
+        with open(os.path.join(self.root, f"{record['id']}.json"), "w") as f:
+            json.dump(record, f)
+
+    @staticmethod
+    def _batch_object(record: dict):
+        return SimpleNamespace(
+            id=record["id"],
+            status=record["status"],
+            input_file_id=record["input_file_id"],
+            output_file_id=record["output_file_id"],
+            error_file_id=record["error_file_id"],
+            request_counts=SimpleNamespace(**record["request_counts"]),
+        )
+
+    def _create_batch(self, input_file_id: str, endpoint: str, completion_window: str):
+        with open(os.path.join(self.root, input_file_id)) as f:
+            total = sum(1 for line in f if line.strip())
+        record = {
+            "id": f"batch_{uuid.uuid4().hex}",
+            "status": "validating",
+            "input_file_id": input_file_id,
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": total, "completed": 0, "failed": 0},
+            "polls": 0,
+        }
+        self._save_batch(record)
+        return self._batch_object(record)
+
+    def _retrieve_batch(self, batch_id: str):
+        with open(os.path.join(self.root, f"{batch_id}.json")) as f:
+            record = json.load(f)
+        if record["status"] not in TERMINAL_STATUSES:
+            record["polls"] += 1
+            if record["polls"] < self.polls_to_complete:
+                record["status"] = "in_progress"
+            else:
+                self._run_batch(record)
+            self._save_batch(record)
+        return self._batch_object(record)
+
+    def _run_batch(self, record: dict) -> None:
+        outputs, errors = [], []
+        with open(os.path.join(self.root, record["input_file_id"])) as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        for request in requests:
+            line = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": request["custom_id"]}
+            try:
+                content = self.respond(request)
+            except Exception as e:
+                errors.append({
+                    **line,
+                    "response": None,
+                    "error": {"code": type(e).__name__, "message": str(e)},
+                })
+                continue
+            outputs.append({
+                **line,
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+                },
+                "error": None,
+            })
+
+        def jsonl(records):
+            return "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+
+        record["output_file_id"] = self._write_file(jsonl(outputs)) if outputs else None
+        record["error_file_id"] = self._write_file(jsonl(errors)) if errors else None
+        record["request_counts"] = {"total": len(requests), "completed": len(outputs), "failed": len(errors)}
+        record["status"] = "completed"
@@ -0,0 +1,165 @@
+"""Co-authorship graph over papers and integer-coded authors (or institutions).
+
+Members are interned to integer ids once and stored as a papers x members incidence
+matrix, so collaboration counts are derived from array operations on its nonzero
+entries rather than from a Python tuple per pair. Pair counts come from the sparse
+product `A.T @ A`; graphs that keep duplicate members enumerate pairs with numpy.
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# pair_milestones expands at most about this many pair instances at a time
+MILESTONE_BLOCK_PAIRS = 1_000_000
+
+
+class CoauthorGraph:
+    """Papers x members incidence of a collaboration dataset.
+
+    papers and members are parallel sequences with one entry per (paper, member)
+    membership. Member ids follow sorted member order, so a pair (i, j) with i < j is
+    the same pair `itertools.combinations(sorted(names), 2)` yields. Paper ids follow
+    first appearance, so passing memberships in date order makes them chronological.
+    With dedupe=False, a member listed twice on a paper counts twice, and pairs of a
+    member with itself are kept, as combinations over the raw list would produce.
+    """
+
+    def __init__(self, papers, members, dedupe: bool = True):
+        member_codes, self.members = pd.factorize(pd.Series(members), sort=True)
+        paper_codes, self.papers = pd.factorize(pd.Series(papers), sort=False)
+        valid = (member_codes >= 0) & (paper_codes >= 0)
+        paper_codes, member_codes = paper_codes[valid], member_codes[valid]
+
+        order = np.lexsort((member_codes, paper_codes))
+        paper_codes, member_codes = paper_codes[order], member_codes[order]
+        if dedupe and len(paper_codes):
+            keep = np.ones(len(paper_codes), dtype=bool)
+            keep[1:] = (paper_codes[1:] != paper_codes[:-1]) | (member_codes[1:] != member_codes[:-1])
+            paper_codes, member_codes = paper_codes[keep], member_codes[keep]
+
+        self.dedupe = dedupe
+        self.paper_codes = paper_codes
+        self.member_codes = member_codes
+        self.num_papers = len(self.papers)
+        self.num_members = len(self.members)
+        self.paper_sizes = np.bincount(paper_codes, minlength=self.num_papers)
+        self.paper_offsets = np.cumsum(self.paper_sizes) - self.paper_sizes
+
+    def incidence_matrix(self):
+        """Returns the papers x members matrix A as a scipy CSR matrix."""
+        return sp.csr_matrix(
+            (np.ones(len(self.paper_codes), dtype=np.int64), (self.paper_codes, self.member_codes)),
+            shape=(self.num_papers, self.num_members),
+        )
+
+    def pair_instances(self, start: int = 0, stop: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns (paper, member_1, member_2) for every co-occurring pair on papers [start, stop).
+
+        Covers every paper by default. Instances are ordered by paper, then by pair,
+        matching a loop over the papers calling combinations(sorted(members), 2).
+        """
+        stop = self.num_papers if stop is None else stop
+        sizes = self.paper_sizes[start:stop]
+        offsets = self.paper_offsets
+        papers, firsts, seconds = [], [], []
+        for size in np.unique(sizes[sizes >= 2]):
+            # Every paper with `size` members shares the same upper-triangle layout
+            group = start + np.flatnonzero(sizes == size)
+            left, right = np.triu_indices(size, k=1)
+            papers.append(np.repeat(group, len(left)))
+            firsts.append((offsets[group][:, None] + left).ravel())
+            seconds.append((offsets[group][:, None] + right).ravel())
+        if not papers:
+            empty = np.array([], dtype=np.int64)
+            return empty, empty, empty
+        papers = np.concatenate(papers)
+        order = np.argsort(papers, kind="stable")
+        return (
+            papers[order],
+            self.member_codes[np.concatenate(firsts)[order]],
+            self.member_codes[np.concatenate(seconds)[order]],
+        )
+
+    def pair_counts(self) -> pd.DataFrame:
+        """Returns one row per distinct pair: member_1, member_2 (ids) and num_papers."""
+        if self.dedupe:
+            a = self.incidence_matrix()
+            counts = sp.triu(a.T @ a, k=1).tocoo()
+            first, second, num_papers = counts.row, counts.col, counts.data
+        else:
+            _, first, second = self.pair_instances()
+            codes, num_papers = np.unique(
+                first.astype(np.int64) * self.num_members + second, return_counts=True
+            )
+            first, second = np.divmod(codes, self.num_members)
+        return pd.DataFrame({
+            "member_1": first.astype(np.int64),
+            "member_2": second.astype(np.int64),
+            "num_papers": num_papers.astype(np.int64),
+        })
+
+    def top_pairs(self, k: int = 100, columns: tuple[str, str, str] = ("member_1", "member_2", "num_papers")) -> pd.DataFrame:
+        """The k most frequent pairs as names, ties broken by member order."""
+        counts = self.pair_counts().sort_values(
+            ["num_papers", "member_1", "member_2"], ascending=[False, True, True], kind="stable"
+        ).head(k)
+        return pd.DataFrame({
+            columns[0]: np.asarray(self.members)[counts["member_1"].to_numpy()],
+            columns[1]: np.asarray(self.members)[counts["member_2"].to_numpy()],
+            columns[2]: counts["num_papers"].to_numpy(),
+        })
+
+    def num_repeat_pairs(self) -> int:
+        """Number of distinct pairs that share at least two papers."""
+        return int((self.pair_counts()["num_papers"] >= 2).sum())
+
+    def pair_milestones(self, block_pairs: int = MILESTONE_BLOCK_PAIRS) -> tuple[np.ndarray, np.ndarray]:
+        """Returns, per distinct pair, the papers of its first and second co-occurrence.
+
+        The second entry is -1 for pairs that only co-occur once. Papers are streamed
+        in order, about block_pairs pair instances at a time, and each block is folded
+        into a running (pair, first paper, second paper) table. Memory is therefore
+        bounded by the number of distinct pairs plus one block, not by every pair
+        instance of the dataset.
+        """
+        codes = np.array([], dtype=np.int64)
+        firsts = np.array([], dtype=np.int64)
+        seconds = np.array([], dtype=np.int64)
+        pairs_through = np.cumsum(self.paper_sizes * (self.paper_sizes - 1) // 2)
+        start = 0
+        while start < self.num_papers:
+            done = pairs_through[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(pairs_through, done + block_pairs, side="right")))
+            papers, first, second = self.pair_instances(start, stop)
+            if len(papers):
+                block_codes = first.astype(np.int64) * self.num_members + second
+                codes, firsts, seconds = _fold_milestones(codes, firsts, seconds, block_codes, papers)
+            start = stop
+        return firsts, seconds
+
+
+def _fold_milestones(codes, firsts, seconds, block_codes, block_papers):
+    """Merges a block of pair instances into the sorted (code, first, second) milestone table.
+
+    block_papers must all come after the papers already folded in, in ascending order.
+    """
+    order = np.argsort(block_codes, kind="stable")
+    block_codes, block_papers = block_codes[order], block_papers[order]
+    starts = np.flatnonzero(np.r_[True, block_codes[1:] != block_codes[:-1]])
+    ends = np.r_[starts[1:], len(block_codes)]
+    block_seconds = np.where(
+        ends - starts >= 2, block_papers[np.minimum(starts + 1, len(block_codes) - 1)], -1
+    )
+
+    # A pair already in the table sorts right before its entry from this block
+    all_codes = np.concatenate([codes, block_codes[starts]])
+    order = np.argsort(all_codes, kind="stable")
+    all_codes = all_codes[order]
+    all_firsts = np.concatenate([firsts, block_papers[starts]])[order]
+    all_seconds = np.concatenate([seconds, block_seconds])[order]
+    seen = np.flatnonzero(all_codes[1:] == all_codes[:-1])
+    all_seconds[seen] = np.where(all_seconds[seen] >= 0, all_seconds[seen], all_firsts[seen + 1])
+    keep = np.ones(len(all_codes), dtype=bool)
+    keep[seen + 1] = False
+    return all_codes[keep], all_firsts[keep], all_seconds[keep]
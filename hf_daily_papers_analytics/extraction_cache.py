@@ -0,0 +1,55 @@
+"""Content-addressed on-disk cache of author_info extractions.
+
+Entries are keyed by the SHA-256 of the image/PDF bytes that were sent to the model,
+together with the model name and prompt version, so the same thumbnail or PDF is only
+ever paid for once per (model, prompt) and a changed prompt naturally misses.
+"""
+
+import hashlib
+import time
+
+from hf_daily_papers_analytics.file_cache import JsonFileCache
+
+DEFAULT_EXTRACTION_CACHE_DIR = ".cache/extractions"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+
+def extraction_key(content: bytes, model: str, prompt_version: str) -> str:
+    """Cache key for extracting from content with a given model and prompt version."""
+    digest = hashlib.sha256(content).hexdigest()
+    return hashlib.sha256(f"{digest}:{model}:{prompt_version}".encode("utf-8")).hexdigest()
+
+
+class ExtractionCache(JsonFileCache):
+    """One JSON file per extraction, evicted least-recently-used first.
+
+    Once the cache exceeds max_bytes, the oldest entries are removed. Stored values
+    are the parsed author lists, as dicts.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_EXTRACTION_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content: bytes, model: str, prompt_version: str) -> list[dict] | None:
+        """Returns the cached authors extracted from content, or None on a miss."""
+        entry = self.read(extraction_key(content, model, prompt_version))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["authors"]
+
+    def put(self, content: bytes, model: str, prompt_version: str, authors: list[dict]) -> None:
+        """Stores the authors extracted from content."""
+        self.write(
+            extraction_key(content, model, prompt_version),
+            {
+                "model": model,
+                "prompt_version": prompt_version,
+                "content_sha256": hashlib.sha256(content).hexdigest(),
+                "stored_at": time.time(),
+                "authors": authors,
+            },
+        )
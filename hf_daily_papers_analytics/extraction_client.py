@@ -0,0 +1,50 @@
+"""Shared async OpenAI client for author_info extraction.
+
+One `AsyncOpenAI` client is created per run and shared by every extraction, so its
+HTTP connection pool stays warm across papers instead of a new `OpenAI()` (and pool)
+being built per call and driven from executor threads. A semaphore bounds in-flight
+requests; callers size it to the same concurrency as their download semaphores, so
+the pool never holds more connections than there are concurrent extractions.
+"""
+
+import asyncio
+
+from openai import AsyncOpenAI
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+class ExtractionClient:
+    """Sends chat completion requests through one long-lived AsyncOpenAI client.
+
+    base_url and api_key default to the OPENAI_BASE_URL / OPENAI_API_KEY environment
+    variables, so pointing OPENAI_BASE_URL at fake_openai_server runs offline.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        client: AsyncOpenAI | None = None,
+    ):
+        self.client = client if client is not None else AsyncOpenAI(base_url=base_url, api_key=api_key)
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.num_requests = 0
+
+    async def complete(self, request: dict) -> str:
+        """Sends a chat completions request body and returns the message content."""
+        async with self.semaphore:
+            response = await self.client.chat.completions.create(**request)
+        self.num_requests += 1
+        return response.choices[0].message.content
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -0,0 +1,125 @@
+"""Local stand-in for the OpenAI chat completions endpoint, for offline runs and tests.
+
+Serves `POST /v1/chat/completions` with aiohttp and answers every request with
+respond(request_body) -> message content, after an optional simulated latency. It
+records how many requests it served and the peak number in flight, so client-side
+concurrency limits can be checked.
+
+Usage:
+    python -m hf_daily_papers_analytics.fake_openai_server --port 8001 --latency 0.5
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=test \
+        poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input /tmp/papers.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Callable
+
+from aiohttp import web
+
+
+def placeholder_content(body: dict) -> str:
+    """Default answer: a single placeholder author."""
+    return json.dumps({"authors": [{"name": "Placeholder Author", "affiliation": "", "email": ""}]})
+
+
+class FakeOpenAIServer:
+    """aiohttp server answering chat completions with respond(body)."""
+
+    def __init__(
+        self,
+        respond: Callable[[dict], str] = placeholder_content,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.respond = respond
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.num_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._runner = None
+
+        self.app = web.Application(client_max_size=64 * 1024 * 1024)
+        self.app.router.add_post("/v1/chat/completions", self._chat_completions)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def _chat_completions(self, request: web.Request) -> web.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            body = await request.json()
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            content = self.respond(body)
+            self.num_requests += 1
+        finally:
+            self.in_flight -= 1
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        })
+
+    async def start(self) -> str:
+        """Starts serving and returns the base URL (a free port is picked if port=0)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+
+async def _serve(port: int, latency: float) -> None:
+    async with FakeOpenAIServer(latency=latency, port=port) as server:
+        print(f"Serving fake chat completions at {server.base_url}")
+        print(f"  export OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=test")
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI chat completions server.")
+    parser.add_argument("--port", type=int, default=8001, help="Port to listen on (default: 8001).")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before answering each request (default: 0).",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.port, args.latency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""Precomputed paper and author feature tables, kept up to date incrementally.
+
+A feature store is a directory of Parquet tables derived from the papers dataset:
+
+    papers_features.parquet  one row per paper: num_authors, word counts,
+                             has_author_info, num_institutions (+ a content hash)
+    author_paper.parquet     one row per author per paper, with author position flags
+    per_author.parquet       one row per author name: papers, upvotes, roles, affiliations
+
+`update_feature_store` hashes each paper's source fields and only recomputes papers
+whose hash changed since the last update (plus the per-author rows of the authors on
+them), so refreshing after a daily merge touches the last few weeks of papers rather
+than the whole history. `load_features` reads a table back with pandas.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from hf_daily_papers_analytics.utils import has_author_info
+
+FEATURE_TABLES = ("papers_features", "author_paper", "per_author")
+META_FILE = "meta.json"
+
+# Fields of a paper that the feature tables are derived from
+SOURCE_COLUMNS = ["date", "paper_id", "title", "summary", "authors", "upvotes", "author_info"]
+
+
+def paper_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Derived per-paper columns, aligned with df, for whichever source columns df has."""
+    features = pd.DataFrame(index=df.index)
+    if "authors" in df.columns:
+        features["num_authors"] = df["authors"].str.len()
+    # Counting runs of non-whitespace gives str.split() lengths without building token lists
+    if "title" in df.columns:
+        features["title_word_count"] = df["title"].str.count(r"\S+")
+    if "summary" in df.columns:
+        features["abstract_word_count"] = df["summary"].str.count(r"\S+")
+    if "author_info" in df.columns:
+        with_info = has_author_info(df["author_info"])
+        features["has_author_info"] = with_info
+        # Number of distinct non-empty (stripped) affiliations per paper
+        lists = df["author_info"][with_info]
+        rows = np.repeat(np.arange(len(df))[with_info.to_numpy()], lists.str.len().to_numpy().astype(int))
+        affs = pd.Series([a.get("affiliation", "") for a in lists.explode()], dtype=object).str.strip()
+        listed = pd.DataFrame({"row": rows, "affiliation": affs})[affs.fillna("").ne("").to_numpy()]
+        counts = listed.drop_duplicates().groupby("row").size()
+        features["num_institutions"] = counts.reindex(np.arange(len(df)), fill_value=0).to_numpy()
+    return features
+
+
+def author_paper_table(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per author per paper: date, paper_id, upvotes, name, affiliation, email, position flags."""
+    columns = [
+        "date", "paper_id", "upvotes", "author_name", "affiliation", "email",
+        "is_first_author", "is_last_author",
+    ]
+    with_info = has_author_info(df["author_info"]).to_numpy()
+    lists = df["author_info"][with_info]
+    if lists.empty:
+        return pd.DataFrame(columns=columns)
+    num_authors = lists.str.len().to_numpy().astype(int)
+    authors = lists.explode().tolist()
+
+    papers = df.loc[with_info, ["date", "paper_id", "upvotes"]]
+    author_df = papers.take(np.repeat(np.arange(len(papers)), num_authors)).reset_index(drop=True)
+    author_df["author_name"] = [a.get("name", "") for a in authors]
+    author_df["affiliation"] = [a.get("affiliation", "") for a in authors]
+    author_df["email"] = [a.get("email", "") for a in authors]
+
+    # Position of each author within its paper's list, from the list offsets
+    offsets = np.repeat(np.cumsum(num_authors) - num_authors, num_authors)
+    position = np.arange(len(author_df)) - offsets
+    author_df["is_first_author"] = position == 0
+    author_df["is_last_author"] = position == np.repeat(num_authors, num_authors) - 1
+    return author_df
+
+
+def per_author_table(author_paper: pd.DataFrame) -> pd.DataFrame:
+    """Per-author aggregates of an author_paper table, one row per name sorted by name.
+
+    num_unique_affiliations counts distinct non-empty affiliations case-insensitively;
+    affiliations lists the distinct stripped affiliations, sorted and "; "-joined.
+    """
+    per_author = author_paper.groupby("author_name").agg(
+        num_papers=("paper_id", "nunique"),
+        total_upvotes=("upvotes", "sum"),
+        was_first_author=("is_first_author", "any"),
+        was_last_author=("is_last_author", "any"),
+    )
+
+    affs = pd.DataFrame({
+        "author_name": author_paper["author_name"],
+        "affiliation": author_paper["affiliation"].str.strip(),
+    })
+    affs = affs[affs["affiliation"].fillna("") != ""]
+    per_author["num_unique_affiliations"] = (
+        affs.assign(affiliation=affs["affiliation"].str.lower())
+        .drop_duplicates()
+        .groupby("author_name").size()
+        .reindex(per_author.index, fill_value=0)
+    )
+    per_author["affiliations"] = (
+        affs.drop_duplicates()
+        .sort_values(["author_name", "affiliation"])
+        .groupby("author_name")["affiliation"].agg("; ".join)
+        .reindex(per_author.index, fill_value="")
+    )
+    return per_author.reset_index()
+
+
+def _canonical_authors(author_info) -> list | None:
+    """author_info without unset fields, which a Parquet round trip fills in as None."""
+    if not isinstance(author_info, list):
+        return None
+    return [{key: value for key, value in author.items() if value is not None} for author in author_info]
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Content hash of each paper's SOURCE_COLUMNS, to detect added or changed papers.
+
+    Hashes only depend on the content, not on how the dataset was read: dates count
+    by day and paper_ids as strings, whether they came from JSONL, Parquet or memory.
+    """
+    columns = [column for column in SOURCE_COLUMNS if column in df.columns]
+    values = {column: df[column].tolist() for column in columns}
+    if "date" in values:
+        values["date"] = df["date"].astype(str).str[:10].tolist()
+    if "paper_id" in values:
+        values["paper_id"] = df["paper_id"].astype(str).tolist()
+    if "author_info" in values:
+        values["author_info"] = [_canonical_authors(info) for info in values["author_info"]]
+    rows = zip(*values.values())
+    return np.array([
+        hashlib.blake2b(json.dumps(row, default=str).encode("utf-8"), digest_size=16).hexdigest()
+        for row in rows
+    ], dtype=object)
+
+
+def _paper_keys(df: pd.DataFrame) -> pd.Series:
+    return df["date"].astype(str).str[:10] + "|" + df["paper_id"].astype(str)
+
+
+def _concat(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates frames, skipping empty ones so they can't upcast column dtypes."""
+    non_empty = [frame for frame in frames if not frame.empty]
+    if not non_empty:
+        return frames[0].iloc[:0]
+    return pd.concat(non_empty, ignore_index=True)
+
+
+def load_features(store_dir: str, table: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Reads one of FEATURE_TABLES from a feature store."""
+    if table not in FEATURE_TABLES:
+        raise ValueError(f"Unknown feature table {table!r}: expected one of {', '.join(FEATURE_TABLES)}.")
+    return pd.read_parquet(os.path.join(store_dir, f"{table}.parquet"), columns=columns)
+
+
+def _write_table(df: pd.DataFrame, store_dir: str, table: str) -> None:
+    path = os.path.join(store_dir, f"{table}.parquet")
+    tmp_path = f"{path}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def update_feature_store(df: pd.DataFrame, store_dir: str) -> dict:
+    """Brings the feature tables in store_dir up to date with the papers in df.
+
+    Papers are keyed by (date, paper_id). Only papers that are new or whose source
+    fields changed are recomputed, rows of papers no longer in df are dropped, and
+    per_author is re-aggregated only for authors appearing on those papers. Returns
+    the number of changed and removed papers and of re-aggregated authors.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    df = df.copy()
+    df["date"] = df["date"].astype(str).str[:10]
+    df["paper_id"] = df["paper_id"].astype(str)
+    keys = _paper_keys(df)
+    hashes = row_hashes(df)
+
+    exists = all(os.path.exists(os.path.join(store_dir, f"{t}.parquet")) for t in FEATURE_TABLES)
+    if exists:
+        old_features = load_features(store_dir, "papers_features")
+        old_author_paper = load_features(store_dir, "author_paper")
+        old_per_author = load_features(store_dir, "per_author")
+    else:
+        old_features = pd.DataFrame(columns=["date", "paper_id", "row_hash"])
+        old_author_paper = pd.DataFrame(columns=["date", "paper_id", "author_name"])
+        old_per_author = pd.DataFrame(columns=["author_name"])
+
+    old_keys = _paper_keys(old_features)
+    previous_hash = pd.Series(old_features["row_hash"].to_numpy(), index=old_keys.to_numpy())
+    changed = (previous_hash.reindex(keys.to_numpy()).to_numpy() != hashes)
+    stale_keys = set(keys[changed]) | (set(old_keys) - set(keys))
+    if exists and not stale_keys:
+        return {"changed": 0, "removed": 0, "authors_updated": 0}
+
+    changed_df = df[changed]
+    new_features = pd.concat([changed_df[["date", "paper_id"]], paper_features(changed_df)], axis=1)
+    new_features["row_hash"] = hashes[changed]
+    features = _concat([old_features[~old_keys.isin(stale_keys).to_numpy()], new_features])
+
+    old_paper_keys = _paper_keys(old_author_paper)
+    stale_rows = old_paper_keys.isin(stale_keys).to_numpy()
+    new_author_paper = author_paper_table(changed_df)
+    author_paper = _concat([old_author_paper[~stale_rows], new_author_paper])
+
+    touched = set(old_author_paper.loc[stale_rows, "author_name"]) | set(new_author_paper["author_name"])
+    per_author = _concat([
+        old_per_author[~old_per_author["author_name"].isin(touched)],
+        per_author_table(author_paper[author_paper["author_name"].isin(touched)]),
+    ]).sort_values("author_name", kind="stable").reset_index(drop=True)
+
+    # Keep the dataset's newest-first order, so appended papers don't end up last
+    features = features.sort_values("date", ascending=False, kind="stable").reset_index(drop=True)
+    author_paper = author_paper.sort_values("date", ascending=False, kind="stable").reset_index(drop=True)
+
+    _write_table(features, store_dir, "papers_features")
+    _write_table(author_paper, store_dir, "author_paper")
+    _write_table(per_author, store_dir, "per_author")
+    with open(os.path.join(store_dir, META_FILE), "w") as f:
+        json.dump({
+            "num_papers": len(features),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }, f, indent=2)
+
+    return {
+        "changed": int(changed.sum()),
+        "removed": len(stale_keys) - int(changed.sum()),
+        "authors_updated": len(touched),
+    }
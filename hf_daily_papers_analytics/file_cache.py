@@ -0,0 +1,94 @@
+"""A directory of JSON entry files with least-recently-used eviction.
+
+Shared by the HTTP and extraction caches, which differ only in how they key and
+shape their entries.
+"""
+
+import json
+import os
+import time
+
+
+class JsonFileCache:
+    """One JSON file per key, evicted least-recently-used first.
+
+    An entry's mtime is its last use. With max_age, entries unused for longer are
+    dropped; once the directory exceeds max_bytes, the oldest entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_age: float | None = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _scan(self) -> list[tuple[float, int, str]]:
+        """Returns (mtime, size, path) for every entry in the cache directory."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._total_bytes -= size
+
+    def _expired(self, mtime: float, now: float) -> bool:
+        return self.max_age is not None and now - mtime > self.max_age
+
+    def read(self, key: str) -> dict | None:
+        """Returns the entry stored under key and marks it used, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            if self._expired(os.path.getmtime(path), time.time()):
+                self._remove(path)
+                return None
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            self._remove(path)
+            return None
+        os.utime(path)  # Mark as recently used
+        return entry
+
+    def write(self, key: str, entry: dict) -> None:
+        """Stores entry under key atomically, evicting old entries if over max_bytes."""
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        if os.path.exists(path):
+            self._total_bytes -= os.path.getsize(path)
+        os.replace(tmp_path, path)
+        self._total_bytes += os.path.getsize(path)
+
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drops expired entries, then the least recently used ones until under max_bytes.
+
+        Returns the number of entries removed.
+        """
+        now = time.time()
+        entries = sorted(self._scan())
+        self._total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, _, path in entries:
+            if not self._expired(mtime, now) and self._total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            removed += 1
+        return removed
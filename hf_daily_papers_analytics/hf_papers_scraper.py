@@ -1,23 +1,69 @@
 import asyncio
 import base64
-import io
+import contextlib
+import hashlib
 import json
 import os
+from collections import Counter
 from datetime import datetime, timedelta
 
-import aiohttp
 import pandas as pd
 from aiohttp import ClientSession
-from openai import OpenAI
-from pypdf import PdfReader, PdfWriter
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from tqdm.asyncio import tqdm_asyncio
 
+from hf_daily_papers_analytics.extraction_cache import ExtractionCache
+from hf_daily_papers_analytics.extraction_client import ExtractionClient
+from hf_daily_papers_analytics.http_cache import HttpCache, conditional_headers
+from hf_daily_papers_analytics.jsonl_writer import CheckpointedJsonlWriter
+from hf_daily_papers_analytics.pdf_preprocessing import first_page_pdf
+from hf_daily_papers_analytics.rate_limiter import (
+    RETRYABLE_STATUSES,
+    AdaptiveLimiter,
+    backoff_delay,
+    is_throttling_error,
+    parse_retry_after,
+)
+from hf_daily_papers_analytics.sessions import create_session
+from hf_daily_papers_analytics.storage import dataset_format, read_papers, write_papers
+
+# Optional fast JSON decoders for the daily_papers payloads. msgspec decodes straight
+# into typed structs; orjson is a faster drop-in for json.loads. Either is used if
+# installed, falling back to the stdlib json module.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
 HF_API_BASE = "https://huggingface.co/api"
 
+# Incremental scraping: per-date state lives here between runs. A date is only
+# re-fetched until it has been fetched at least DEFAULT_SETTLE_DAYS after it was
+# posted, since upvotes and comments stabilize within 1-2 weeks.
+DEFAULT_STATE_FILE = ".cache/scrape_state.json"
+DEFAULT_SETTLE_DAYS = 14
+
+# Dates that still fail after all retries are recorded here with their error class.
+DEFAULT_LEDGER_FILE = ".cache/failed_dates.json"
+
+
+class DateFetchError(Exception):
+    """Raised when every attempt to fetch a date failed."""
+
+    def __init__(self, date: str, error_class: str, message: str, attempts: int):
+        super().__init__(f"{date}: {error_class} after {attempts} attempts ({message})")
+        self.date = date
+        self.error_class = error_class
+        self.message = message
+        self.attempts = attempts
+
 
 class AuthorInfo(BaseModel):
     name: str
@@ -35,6 +81,11 @@ async def get_pdf_bytes(pdf_url: str, session: ClientSession) -> bytes:
         return await response.read()
 
 
+EXTRACTION_MODEL = "gpt-5.4"
+# Bump whenever _AUTHOR_EXTRACTION_PROMPT or the request shape changes, so cached
+# extractions made with the old prompt are no longer used
+PROMPT_VERSION = "1"
+
 _AUTHOR_EXTRACTION_PROMPT = (
     "Extract author information from this paper. "
     "Return a JSON object with a single key 'authors' containing an array of objects, "
@@ -43,85 +94,116 @@ _AUTHOR_EXTRACTION_PROMPT = (
 )
 
 
-async def extract_author_info_from_pdf(pdf_bytes: bytes) -> list[AuthorInfo]:
-    """
-    Sends PDF first page to OpenAI GPT-5.4 to extract author information.
-    Uses run_in_executor to avoid blocking the event loop.
+def image_part(url: str) -> dict:
+    """Chat message part for an image, given as an https:// or base64 data: URL."""
+    return {"type": "image_url", "image_url": {"url": url}}
+
+
+def pdf_part(pdf_bytes: bytes) -> dict:
+    """Chat message part carrying a PDF inline as base64."""
+    b64_pdf = base64.standard_b64encode(pdf_bytes).decode("utf-8")
+    return {
+        "type": "file",
+        "file": {
+            "filename": "paper.pdf",
+            "file_data": f"data:application/pdf;base64,{b64_pdf}",
+        },
+    }
+
+
+def build_extraction_request(part: dict) -> dict:
+    """Chat completions request body asking for the authors shown in part.
+
+    Used both as keyword arguments to `chat.completions.create` and as the body of a
+    Batch API request line.
     """
-    loop = asyncio.get_event_loop()
-
-    def _call_openai_api():
-        client = OpenAI()
-
-        # Extract only the first page to stay under file size limits
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        writer = PdfWriter()
-        writer.add_page(reader.pages[0])
-        first_page_buf = io.BytesIO()
-        writer.write(first_page_buf)
-        first_page_bytes = first_page_buf.getvalue()
-
-        b64_pdf = base64.standard_b64encode(first_page_bytes).decode("utf-8")
-
-        response = client.chat.completions.create(
-            model="gpt-5.4",
-            response_format={"type": "json_object"},
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": _AUTHOR_EXTRACTION_PROMPT},
-                        {
-                            "type": "file",
-                            "file": {
-                                "filename": "paper.pdf",
-                                "file_data": f"data:application/pdf;base64,{b64_pdf}",
-                            },
-                        },
-                    ],
-                }
-            ],
-        )
+    return {
+        "model": EXTRACTION_MODEL,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {
+                "role": "user",
+                "content": [{"type": "text", "text": _AUTHOR_EXTRACTION_PROMPT}, part],
+            }
+        ],
+    }
 
-        result = json.loads(response.choices[0].message.content)
-        return [AuthorInfo(**author) for author in result["authors"]]
 
-    return await loop.run_in_executor(None, _call_openai_api)
+def parse_author_info(content: str) -> list[AuthorInfo]:
+    """Parses the JSON message content of an extraction response."""
+    result = json.loads(content)
+    return [AuthorInfo(**author) for author in result["authors"]]
 
 
-async def extract_author_info_from_thumbnail(image_bytes: bytes) -> list[AuthorInfo]:
+async def extract_author_info_from_pdf(
+    pdf_bytes: bytes,
+    cache: ExtractionCache | None = None,
+    client: ExtractionClient | None = None,
+    is_first_page: bool = False,
+) -> list[AuthorInfo]:
+    """
+    Sends PDF first page to OpenAI GPT-5.4 to extract author information.
+    The CPU-bound page split runs in an executor thread, or is skipped when
+    is_first_page says pdf_bytes was already split (e.g. by pdf_preprocessing); the
+    request goes through the shared async client (a temporary one if none is given).
+    With a cache, a PDF already extracted with the same model and prompt version is
+    not sent again (empty results are not cached).
+    """
+    if cache is not None:
+        cached = cache.get(pdf_bytes, EXTRACTION_MODEL, PROMPT_VERSION)
+        if cached is not None:
+            return [AuthorInfo(**author) for author in cached]
+    if client is None:
+        async with ExtractionClient(max_concurrency=1) as client:
+            return await extract_author_info_from_pdf(pdf_bytes, cache, client, is_first_page)
+
+    # Extract only the first page to stay under file size limits
+    if is_first_page:
+        first_page_bytes = pdf_bytes
+    else:
+        loop = asyncio.get_running_loop()
+        first_page_bytes = await loop.run_in_executor(None, first_page_pdf, pdf_bytes)
+
+    content = await client.complete(build_extraction_request(pdf_part(first_page_bytes)))
+    authors = parse_author_info(content)
+    if cache is not None and authors:
+        cache.put(pdf_bytes, EXTRACTION_MODEL, PROMPT_VERSION, [a.model_dump() for a in authors])
+    return authors
+
+
+async def extract_author_info_from_thumbnail(
+    image_bytes: bytes,
+    cache: ExtractionCache | None = None,
+    client: ExtractionClient | None = None,
+) -> list[AuthorInfo]:
     """
     Sends a thumbnail image to OpenAI GPT-5.4 to extract author information.
     Much faster than PDF extraction since thumbnails are served from HF CDN
-    with no rate limits.
+    with no rate limits. The request goes through the shared async client (a
+    temporary one if none is given). With a cache, an image already extracted with
+    the same model and prompt version is not sent again (empty results are not cached).
     """
-    loop = asyncio.get_event_loop()
-
-    def _call_openai_api():
-        client = OpenAI()
-        b64_img = base64.standard_b64encode(image_bytes).decode("utf-8")
-
-        response = client.chat.completions.create(
-            model="gpt-5.4",
-            response_format={"type": "json_object"},
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": _AUTHOR_EXTRACTION_PROMPT},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{b64_img}"},
-                        },
-                    ],
-                }
-            ],
-        )
+    if cache is not None:
+        cached = cache.get(image_bytes, EXTRACTION_MODEL, PROMPT_VERSION)
+        if cached is not None:
+            return [AuthorInfo(**author) for author in cached]
+    if client is None:
+        async with ExtractionClient(max_concurrency=1) as client:
+            return await extract_author_info_from_thumbnail(image_bytes, cache, client)
+
+    b64_img = base64.standard_b64encode(image_bytes).decode("utf-8")
+    content = await client.complete(
+        build_extraction_request(image_part(f"data:image/png;base64,{b64_img}"))
+    )
+    authors = parse_author_info(content)
+    if cache is not None and authors:
+        cache.put(image_bytes, EXTRACTION_MODEL, PROMPT_VERSION, [a.model_dump() for a in authors])
+    return authors
 
-        result = json.loads(response.choices[0].message.content)
-        return [AuthorInfo(**author) for author in result["authors"]]
 
-    return await loop.run_in_executor(None, _call_openai_api)
+# Version of the flat schema produced by decode_daily_papers. The HTTP cache stores
+# parsed payloads and serves them on 304s, so bump this whenever the parsing changes.
+PARSER_VERSION = "1"
 
 
 def _parse_api_paper(entry: dict, date: str) -> dict:
@@ -152,73 +234,443 @@ def _parse_api_paper(entry: dict, date: str) -> dict:
     }
 
 
+if msgspec is not None:
+
+    class _ApiAuthor(msgspec.Struct):
+        name: str
+
+    class _ApiSubmitter(msgspec.Struct):
+        user: str | None = ""
+
+    class _ApiPaper(msgspec.Struct):
+        id: str
+        title: str | None = ""
+        authors: list[_ApiAuthor] = []
+        summary: str | None = ""
+        publishedAt: str | None = ""
+        submittedOnDailyAt: str | None = ""
+        submittedOnDailyBy: _ApiSubmitter | None = None
+        upvotes: int | None = 0
+        ai_summary: str | None = ""
+        ai_keywords: list[str] | None = []
+        githubRepo: str | None = None
+        githubStars: int | None = None
+
+    class _ApiEntry(msgspec.Struct):
+        paper: _ApiPaper
+        numComments: int | None = 0
+        thumbnail: str | None = ""
+
+    _DAILY_PAPERS_DECODER = msgspec.json.Decoder(list[_ApiEntry])
+
+    def _flatten_api_entry(entry: "_ApiEntry", date: str) -> dict:
+        """Same output as _parse_api_paper, from an already validated entry."""
+        paper = entry.paper
+        submitter = paper.submittedOnDailyBy
+        return {
+            "date": date,
+            "paper_id": paper.id,
+            "title": paper.title,
+            "authors": [a.name for a in paper.authors],
+            "summary": paper.summary,
+            "publishedAt": paper.publishedAt,
+            "submittedOnDailyAt": paper.submittedOnDailyAt,
+            "submittedBy": submitter.user if submitter else "",
+            "upvotes": paper.upvotes,
+            "numComments": entry.numComments,
+            "ai_summary": paper.ai_summary,
+            "ai_keywords": paper.ai_keywords,
+            "githubRepo": paper.githubRepo,
+            "githubStars": paper.githubStars,
+            "thumbnail": entry.thumbnail,
+            "url": f"https://huggingface.co/papers/{paper.id}",
+            "pdf_link": f"https://arxiv.org/pdf/{paper.id}",
+            "author_info": None,
+        }
+
+
+def decode_daily_papers(body: bytes, date: str, decoder: str | None = None) -> list[dict]:
+    """Decodes a daily_papers response body into our flat schema.
+
+    Uses msgspec's typed decoder when available, which validates and builds only the
+    fields we keep in a single pass, then orjson, then the stdlib json module. Pass
+    decoder="msgspec" / "orjson" / "json" to force one (used by the benchmark).
+    """
+    if decoder is None:
+        decoder = "msgspec" if msgspec else "orjson" if orjson else "json"
+
+    if decoder == "msgspec":
+        try:
+            return [_flatten_api_entry(entry, date) for entry in _DAILY_PAPERS_DECODER.decode(body)]
+        except msgspec.ValidationError as e:
+            print(f"Unexpected payload schema for {date} ({e}), decoding without schema.")
+            decoder = "orjson" if orjson else "json"
+
+    data = orjson.loads(body) if decoder == "orjson" else json.loads(body)
+    return [_parse_api_paper(entry, date) for entry in data]
+
+
 async def fetch_papers_for_date(
-    date: str, session: ClientSession, retries: int = 3, cooldown: int = 2
+    date: str,
+    session: ClientSession,
+    retries: int = 3,
+    cooldown: int = 2,
+    cache: HttpCache | None = None,
+    limiter: AdaptiveLimiter | None = None,
 ) -> list[dict]:
-    """Fetches all papers for a given date from the HuggingFace API."""
+    """Fetches all papers for a given date from the HuggingFace API.
+
+    With a cache, sends a conditional request and returns the cached papers on a
+    304 Not Modified, skipping the download and JSON decoding.
+
+    Each attempt holds a slot of the shared limiter, which shrinks on 429/5xx and
+    timeouts (not on other errors such as 404s or undecodable payloads) and honors
+    Retry-After. Between attempts, waits for the Retry-After hint or a jittered
+    exponential backoff starting at cooldown seconds, whichever is longer.
+
+    Raises DateFetchError if every attempt failed, so a failed date can't be mistaken
+    for a day with no papers. Its error_class is "http_<status>" for error responses
+    or the exception type name (e.g. "ClientConnectorError") otherwise.
+    """
     url = f"{HF_API_BASE}/daily_papers?date={date}"
+    error_class, message = "unknown", ""
     for attempt in range(retries):
+        retry_after = None
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
+            async with limiter or contextlib.nullcontext():
+                cached = cache.get(url, PARSER_VERSION) if cache else None
+                async with session.get(url, headers=conditional_headers(cached)) as response:
+                    if response.status == 304 and cached is not None:
+                        if limiter:
+                            limiter.record_success()
+                        return cached["payload"]
+                    if response.status == 200:
+                        papers = decode_daily_papers(await response.read(), date)
+                        if cache:
+                            cache.put(
+                                url,
+                                papers,
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified"),
+                                parser_version=PARSER_VERSION,
+                            )
+                        if limiter:
+                            limiter.record_success()
+                        return papers
+
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if limiter and response.status in RETRYABLE_STATUSES:
+                        limiter.record_failure(retry_after)
+                    error_class = f"http_{response.status}"
+                    message = response.reason or ""
                     print(f"Got status {response.status} for {date} (attempt {attempt + 1})")
-                    await asyncio.sleep(cooldown)
-                    continue
-                data = await response.json()
-                return [_parse_api_paper(entry, date) for entry in data]
         except Exception as e:
+            if limiter and is_throttling_error(e):
+                limiter.record_failure()
+            error_class, message = type(e).__name__, str(e)
             print(f"Error fetching {date} (attempt {attempt + 1}): {e}")
-            await asyncio.sleep(cooldown)
+        if attempt < retries - 1:
+            await asyncio.sleep(max(retry_after or 0, backoff_delay(attempt, base=cooldown)))
     print(f"All retries failed for {date}")
-    return []
+    raise DateFetchError(date, error_class, message, retries)
+
+
+def load_scrape_state(state_file: str) -> dict[str, dict]:
+    """Loads the per-date scrape state, or an empty state if there is none yet."""
+    if not os.path.exists(state_file):
+        return {}
+    with open(state_file) as f:
+        return json.load(f)
+
+
+def _write_json_atomic(obj, path: str) -> None:
+    """Writes obj as JSON to a temp file, then renames it over path."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def save_scrape_state(state: dict[str, dict], state_file: str) -> None:
+    """Writes the per-date scrape state atomically."""
+    _write_json_atomic(state, state_file)
+
+
+def pending_state_file(state_file: str) -> str:
+    """Where run_scraper(save_state=False) leaves the updated state until it is committed."""
+    return f"{state_file}.pending"
+
+
+def commit_scrape_state(state_file: str) -> None:
+    """Replaces state_file with the pending state of the last run_scraper(save_state=False).
+
+    Call once the scraped papers are safely saved or uploaded; until then, the next
+    incremental run still re-fetches the dates of the uncommitted run.
+    """
+    pending = pending_state_file(state_file)
+    if os.path.exists(pending):
+        os.replace(pending, state_file)
+
+
+def load_failed_dates(ledger_file: str) -> list[dict]:
+    """Loads the failed-date ledger written by run_scraper, or [] if there is none."""
+    if not os.path.exists(ledger_file):
+        return []
+    with open(ledger_file) as f:
+        return json.load(f)
+
+
+def _is_settled(date: str, record: dict | None, settle_days: int) -> bool:
+    """A date is settled once it was successfully fetched settle_days or more after it was posted."""
+    if not record or record.get("status") != "ok":
+        return False
+    fetched_at = datetime.fromisoformat(record["fetched_at"])
+    return fetched_at >= datetime.strptime(date, "%Y-%m-%d") + timedelta(days=settle_days)
+
+
+def select_dates_to_fetch(
+    dates: list[str], state: dict[str, dict], settle_days: int = DEFAULT_SETTLE_DAYS
+) -> list[str]:
+    """Returns the dates that are missing, failed, or still settling according to state."""
+    return [date for date in dates if not _is_settled(date, state.get(date), settle_days)]
+
+
+def _content_hash(papers: list[dict]) -> str:
+    return hashlib.sha256(
+        json.dumps(papers, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+async def _fetch_dates(
+    dates: list[str],
+    session: ClientSession,
+    on_result,
+    max_concurrent: int,
+    retries: int,
+    cooldown: int,
+    cache: HttpCache | None,
+    desc: str = "Fetching papers",
+) -> dict[str, DateFetchError]:
+    """Fetches dates under one adaptive limiter, calling on_result(date, papers) as each completes.
+
+    Returns the errors for dates that failed every retry.
+    """
+    limiter = AdaptiveLimiter(max_limit=max_concurrent)
+    failures = {}
+
+    async def fetch_date(date):
+        try:
+            return date, await fetch_papers_for_date(
+                date,
+                session,
+                retries=retries,
+                cooldown=cooldown,
+                cache=cache,
+                limiter=limiter,
+            )
+        except DateFetchError as e:
+            return date, e
+
+    tasks = [fetch_date(date) for date in dates]
+    for next_result in tqdm_asyncio.as_completed(tasks, desc=desc):
+        date, result = await next_result
+        if isinstance(result, DateFetchError):
+            failures[date] = result
+        else:
+            on_result(date, result)
+
+    if limiter.num_throttled:
+        print(
+            f"Throttled {limiter.num_throttled} times; "
+            f"final concurrency limit {limiter.limit:.1f}/{max_concurrent}."
+        )
+    return failures
 
 
 async def run_scraper(
-    start_date: str,
-    end_date: str,
+    start_date: str | None,
+    end_date: str | None,
     output_file: str | None,
     retries: int = 3,
     cooldown: int = 2,
     max_concurrent: int = 20,
-) -> pd.DataFrame:
-    """Fetches daily papers from the HuggingFace API for a date range."""
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    dates = [
-        (start + timedelta(days=i)).strftime("%Y-%m-%d")
-        for i in range((end - start).days + 1)
-    ]
+    state_file: str | None = None,
+    settle_days: int = DEFAULT_SETTLE_DAYS,
+    full_refresh: bool = False,
+    cache_dir: str | None = None,
+    stream: bool = False,
+    resume: bool = False,
+    return_df: bool = True,
+    dates: list[str] | None = None,
+    ledger_file: str | None = None,
+    requeue_failed: bool = True,
+    save_state: bool = True,
+) -> tuple[pd.DataFrame | None, list[dict]]:
+    """Fetches daily papers from the HuggingFace API for a date range.
+
+    Pass dates to fetch an explicit list of dates (e.g. from a failed-date ledger)
+    instead of the start_date..end_date range.
+
+    If state_file is given, runs incrementally: only dates that are missing from the
+    state, previously failed, or still inside the settle_days window are fetched, and
+    the state is updated with each date's fetch time, paper count and content hash.
+    Pass full_refresh=True to re-fetch every date in the range regardless of state.
+    The state is only written once the papers are saved to output_file (if any). A
+    caller that saves or uploads the papers itself should pass save_state=False and
+    call commit_scrape_state(state_file) after it succeeds, so dates whose papers
+    never made it anywhere are fetched again by the next run.
+
+    If cache_dir is given, responses are cached on disk and revalidated with
+    ETag / If-Modified-Since, so unchanged dates come back as cheap 304s.
+
+    Concurrency starts at max_concurrent and adapts to the API: it is cut on 429/5xx
+    responses (and paused for any Retry-After) and grows back as requests succeed.
+    Dates that still fail are re-queued once at a quarter of max_concurrent
+    (requeue_failed=True).
+
+    With stream=True, each date's papers are appended to the .jsonl output_file as
+    soon as they arrive (in completion order, with periodic fsync'd checkpoints)
+    instead of being buffered in memory. resume=True continues a partially written
+    file, skipping dates it already contains. With return_df=False nothing is kept
+    in memory and None is returned; otherwise the DataFrame is read back from the file.
+
+    output_file may be .json, .jsonl or .parquet (month-partitioned, see storage).
+
+    Returns (df, failed_dates), where failed_dates lists the dates that failed every
+    attempt with their error class. It is also written to ledger_file if given.
+    """
+    if dates is None:
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        dates = [
+            (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            for i in range((end - start).days + 1)
+        ]
+
+    state = load_scrape_state(state_file) if state_file else {}
+    if state_file and not full_refresh:
+        num_requested = len(dates)
+        dates = select_dates_to_fetch(dates, state, settle_days)
+        print(
+            f"Incremental mode: fetching {len(dates)} of {num_requested} dates "
+            f"({num_requested - len(dates)} already settled)."
+        )
 
-    semaphore = asyncio.Semaphore(max_concurrent)
+    if output_file:
+        dataset_format(output_file)  # Fail on unsupported extensions before scraping
+
+    writer = None
+    if stream:
+        if not output_file or dataset_format(output_file) != "jsonl":
+            raise ValueError("stream=True requires a .jsonl output_file.")
+        writer = CheckpointedJsonlWriter(output_file, resume=resume)
+        if writer.completed:
+            dates = [date for date in dates if date not in writer.completed]
+            print(f"Resuming {output_file}: {len(writer.completed)} dates already written.")
+
+    cache = HttpCache(cache_dir) if cache_dir else None
 
     headers = {}
     hf_token = os.getenv("HUGGINGFACE_HUB_TOKEN")
     if hf_token:
         headers["Authorization"] = f"Bearer {hf_token}"
 
-    async with aiohttp.ClientSession(headers=headers) as session:
+    fetched_at = datetime.now().isoformat(timespec="seconds")
+    all_papers = []
+    num_papers = 0
+    num_changed = 0
+
+    def on_result(date, date_papers):
+        nonlocal num_papers, num_changed
+        if state_file:
+            content_hash = _content_hash(date_papers)
+            if state.get(date, {}).get("content_hash") != content_hash:
+                num_changed += 1
+            state[date] = {
+                "status": "ok",
+                "fetched_at": fetched_at,
+                "num_papers": len(date_papers),
+                "content_hash": content_hash,
+            }
+        num_papers += len(date_papers)
+        if writer:
+            writer.write(date, date_papers)
+        else:
+            all_papers.extend(date_papers)
 
-        async def limited_fetch(date):
-            async with semaphore:
-                return await fetch_papers_for_date(
-                    date, session, retries=retries, cooldown=cooldown
+    failures = {}
+    async with create_session(max_concurrent, headers=headers) as session:
+        try:
+            fetch_kwargs = dict(retries=retries, cooldown=cooldown, cache=cache)
+            failures = await _fetch_dates(
+                dates, session, on_result, max_concurrent, **fetch_kwargs
+            )
+            if failures and requeue_failed:
+                requeue_concurrency = max(1, max_concurrent // 4)
+                print(
+                    f"Re-queuing {len(failures)} failed dates "
+                    f"with concurrency {requeue_concurrency}..."
                 )
+                failures = await _fetch_dates(
+                    sorted(failures),
+                    session,
+                    on_result,
+                    requeue_concurrency,
+                    desc="Retrying failed dates",
+                    **fetch_kwargs,
+                )
+        finally:
+            if writer:
+                writer.close()
+
+    def persist_state():
+        if not state_file:
+            return
+        for date, error in failures.items():
+            state[date] = {
+                **state.get(date, {}),
+                "status": "failed",
+                "fetched_at": fetched_at,
+                "error_class": error.error_class,
+            }
+        save_scrape_state(state, state_file if save_state else pending_state_file(state_file))
+
+    failed_dates = [
+        {
+            "date": date,
+            "error_class": error.error_class,
+            "message": error.message,
+            "attempts": error.attempts,
+            "failed_at": fetched_at,
+        }
+        for date, error in sorted(failures.items())
+    ]
+    if ledger_file:
+        _write_json_atomic(failed_dates, ledger_file)
+
+    if state_file:
+        print(f"{num_changed} of {len(dates)} fetched dates changed since the last run.")
+    if failed_dates:
+        error_counts = Counter(failed["error_class"] for failed in failed_dates)
+        print(
+            f"{len(failed_dates)} dates failed: "
+            + ", ".join(f"{error} x{count}" for error, count in error_counts.most_common())
+        )
+    print(f"Fetched {num_papers} papers across {len(dates)} dates.")
 
-        tasks = [limited_fetch(date) for date in dates]
-        results = await tqdm_asyncio.gather(*tasks, desc="Fetching papers")
-
-    all_papers = [paper for date_papers in results for paper in date_papers]
-    print(f"Fetched {len(all_papers)} papers across {len(dates)} dates.")
+    if writer:
+        print(f"Data streamed to {output_file}")
+        persist_state()
+        if not return_df:
+            return None, failed_dates
+        return read_papers(output_file), failed_dates
 
     df = pd.DataFrame(all_papers)
 
     if output_file and not df.empty:
-        if output_file.endswith(".json"):
-            df.to_json(output_file, orient="records")
-        elif output_file.endswith(".jsonl"):
-            df.to_json(output_file, orient="records", lines=True)
-        else:
-            print("Output file must be a .json or .jsonl file. Data not saved.")
+        write_papers(df, output_file)
         print(f"Data saved to {output_file}")
+    persist_state()
 
-    return df
+    return df, failed_dates
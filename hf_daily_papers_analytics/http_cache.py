@@ -0,0 +1,76 @@
+"""On-disk cache for conditional HTTP requests (ETag / If-Modified-Since), keyed by URL.
+
+Each entry stores the response validators together with the already-parsed payload,
+so a 304 Not Modified answer can be served without downloading or decoding the body.
+Since a 304 never re-runs the parser, the parser's version is part of the key: bumping
+it makes every entry miss once and be re-downloaded and re-parsed.
+"""
+
+import hashlib
+import time
+
+from hf_daily_papers_analytics.file_cache import JsonFileCache
+
+DEFAULT_CACHE_DIR = ".cache/http"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+DEFAULT_MAX_AGE = 90 * 24 * 60 * 60  # 90 days without being used
+
+
+def url_key(url: str, parser_version: str = "") -> str:
+    """Cache key for the payload parsed from url by a given parser version."""
+    return hashlib.sha256(f"{url}:{parser_version}".encode("utf-8")).hexdigest()
+
+
+class HttpCache(JsonFileCache):
+    """One JSON file per (URL, parser version), evicted least-recently-used first.
+
+    Entries unused for more than max_age seconds are dropped, and the oldest entries
+    are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        super().__init__(cache_dir, max_bytes, max_age)
+
+    def get(self, url: str, parser_version: str = "") -> dict | None:
+        """Returns the cached entry for url, or None if missing or expired."""
+        return self.read(url_key(url, parser_version))
+
+    def put(
+        self,
+        url: str,
+        payload,
+        etag: str | None,
+        last_modified: str | None,
+        parser_version: str = "",
+    ) -> None:
+        """Stores payload with its validators. Responses without validators aren't cached."""
+        if not etag and not last_modified:
+            return
+        self.write(
+            url_key(url, parser_version),
+            {
+                "url": url,
+                "parser_version": parser_version,
+                "etag": etag,
+                "last_modified": last_modified,
+                "stored_at": time.time(),
+                "payload": payload,
+            },
+        )
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    """Builds If-None-Match / If-Modified-Since headers from a cached entry."""
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
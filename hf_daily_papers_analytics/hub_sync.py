@@ -0,0 +1,224 @@
+"""Delta-only uploads of the papers dataset to a Hugging Face dataset repo.
+
+The dataset is stored as one Parquet shard per month of `date`
+(`data/train-2025-03.parquet`, matching the `data/train-*` pattern that `load_dataset`
+already uses for the train split), plus a manifest with each shard's content hash.
+A sync hashes every shard of the merged dataset, compares against the manifest from
+the previous run and commits only the shards that changed, so a daily run uploads the
+last month or two instead of the whole history.
+
+The dataset card (README.md) left by an earlier `push_to_hub` records the split sizes
+and features in its `dataset_info` metadata, and `load_dataset` verifies the data
+against them. Since a sync changes the shards without regenerating that block, it is
+dropped from the card in the sync's commit.
+
+`LocalHubRepo` is a directory stand-in for the Hub with the same interface as
+`HfHubRepo`, so syncs can be run and inspected offline.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from hf_daily_papers_analytics.storage import papers_to_table, table_to_papers
+
+SHARD_DIR = "data"
+MANIFEST_PATH = "shards_manifest.json"
+README_PATH = "README.md"
+
+
+def shard_path(month: str) -> str:
+    """Returns the repo path of the shard holding papers dated in month (YYYY-MM)."""
+    return f"{SHARD_DIR}/train-{month}.parquet"
+
+
+def build_shards(df: pd.DataFrame) -> dict[str, pa.Table]:
+    """Splits a papers DataFrame into one Arrow table per month, keyed by shard path.
+
+    Rows are put in a canonical order (date descending, then paper_id) so that a
+    shard's content hash only changes when its data does.
+    """
+    df = df.copy()
+    df["date"] = df["date"].astype(str).str[:10]
+    df["paper_id"] = df["paper_id"].astype(str)
+    df = df.sort_values(["date", "paper_id"], ascending=[False, True], kind="stable")
+    months = df["date"].str[:7]
+    return {
+        shard_path(month): papers_to_table(group.reset_index(drop=True))
+        for month, group in df.groupby(months, sort=False)
+    }
+
+
+def shard_digest(table: pa.Table) -> str:
+    """sha256 of a shard's Arrow IPC serialization (schema + data, no writer metadata)."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return hashlib.sha256(sink.getvalue()).hexdigest()
+
+
+def shard_bytes(table: pa.Table) -> bytes:
+    """Serializes a shard to Parquet."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+
+def strip_dataset_info(card: str) -> str | None:
+    """Returns the dataset card without the `dataset_info` block of its metadata.
+
+    Returns None if the card has no such block (nothing to rewrite).
+    """
+    from huggingface_hub import DatasetCard
+
+    dataset_card = DatasetCard(card)
+    if "dataset_info" not in dataset_card.data.to_dict():
+        return None
+    dataset_card.data.pop("dataset_info")
+    return str(dataset_card)
+
+
+class LocalHubRepo:
+    """A local directory laid out like the Hub dataset repo, for offline syncs."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def read_file(self, path_in_repo: str) -> bytes | None:
+        path = os.path.join(self.root, path_in_repo)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def list_files(self) -> list[str]:
+        files = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                files.append(os.path.relpath(os.path.join(dirpath, filename), self.root))
+        return sorted(path.replace(os.sep, "/") for path in files)
+
+    def commit(self, uploads: dict[str, bytes], deletions: list[str], message: str) -> None:
+        for path_in_repo, data in uploads.items():
+            path = os.path.join(self.root, path_in_repo)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        for path_in_repo in deletions:
+            os.remove(os.path.join(self.root, path_in_repo))
+
+    def load_papers(self) -> pd.DataFrame:
+        """Reads every shard back into one DataFrame, newest dates first."""
+        shards = [
+            pq.read_table(os.path.join(self.root, path))
+            for path in self.list_files()
+            if path.startswith(f"{SHARD_DIR}/") and path.endswith(".parquet")
+        ]
+        if not shards:
+            return pd.DataFrame()
+        df = table_to_papers(pa.concat_tables(shards, promote_options="default"))
+        return df.sort_values("date", ascending=False, kind="stable").reset_index(drop=True)
+
+
+class HfHubRepo:
+    """A dataset repo on the Hugging Face Hub."""
+
+    def __init__(self, repo_id: str, token: str | None = None):
+        from huggingface_hub import HfApi
+
+        self.repo_id = repo_id
+        self.api = HfApi(token=token)
+
+    def read_file(self, path_in_repo: str) -> bytes | None:
+        from huggingface_hub import hf_hub_download
+        from huggingface_hub.utils import EntryNotFoundError, RepositoryNotFoundError
+
+        try:
+            path = hf_hub_download(
+                self.repo_id,
+                path_in_repo,
+                repo_type="dataset",
+                token=self.api.token,
+            )
+        except (EntryNotFoundError, RepositoryNotFoundError):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def list_files(self) -> list[str]:
+        return self.api.list_repo_files(self.repo_id, repo_type="dataset")
+
+    def commit(self, uploads: dict[str, bytes], deletions: list[str], message: str) -> None:
+        from huggingface_hub import CommitOperationAdd, CommitOperationDelete
+
+        operations = [
+            CommitOperationAdd(path_in_repo=path, path_or_fileobj=data)
+            for path, data in uploads.items()
+        ]
+        operations += [CommitOperationDelete(path_in_repo=path) for path in deletions]
+        self.api.create_commit(
+            self.repo_id,
+            operations=operations,
+            commit_message=message,
+            repo_type="dataset",
+        )
+
+
+def sync_shards(
+    df: pd.DataFrame,
+    repo: LocalHubRepo | HfHubRepo,
+    message: str = "Update daily papers",
+) -> dict:
+    """Uploads the shards of df whose content differs from the repo's manifest.
+
+    A shard the manifest lists but the repo no longer holds is uploaded again: a full
+    `push_to_hub` deletes every `data/train-*` file but leaves the manifest behind.
+    Shard files in the repo that no longer correspond to a month of df (including the
+    `train-XXXXX-of-XXXXX.parquet` files left by a previous `push_to_hub`) are deleted
+    in the same commit, which also drops the card's stale `dataset_info` if there is
+    one. Returns a summary with the uploaded/deleted shard paths, the number of
+    unchanged shards, the bytes uploaded and whether the card was rewritten.
+    """
+    manifest_bytes = repo.read_file(MANIFEST_PATH)
+    manifest = json.loads(manifest_bytes) if manifest_bytes else {"shards": {}}
+    previous = manifest.get("shards", {})
+    shards = build_shards(df)
+    repo_files = set(repo.list_files())
+
+    uploads = {}
+    entries = {}
+    for path, table in shards.items():
+        digest = shard_digest(table)
+        entries[path] = {"sha256": digest, "num_rows": table.num_rows}
+        if path not in repo_files or previous.get(path, {}).get("sha256") != digest:
+            uploads[path] = shard_bytes(table)
+
+    deletions = [
+        path
+        for path in sorted(repo_files)
+        if path.startswith(f"{SHARD_DIR}/") and path not in shards
+    ]
+    card = repo.read_file(README_PATH)
+    stripped_card = strip_dataset_info(card.decode("utf-8")) if card else None
+    summary = {
+        "uploaded": sorted(uploads),
+        "deleted": sorted(deletions),
+        "unchanged": len(shards) - len(uploads),
+        "bytes": sum(len(data) for data in uploads.values()),
+        "card_updated": stripped_card is not None,
+    }
+    if not uploads and not deletions and stripped_card is None:
+        return summary
+
+    if stripped_card is not None:
+        uploads[README_PATH] = stripped_card.encode("utf-8")
+    new_manifest = {"shards": dict(sorted(entries.items()))}
+    uploads[MANIFEST_PATH] = json.dumps(new_manifest, indent=2).encode("utf-8")
+    repo.commit(uploads, deletions, message)
+    return summary
@@ -0,0 +1,139 @@
+"""Append-only JSONL writers with fsync'd checkpoints that survive a crash mid-write."""
+
+import json
+import os
+
+DEFAULT_CHECKPOINT_EVERY = 25
+
+
+class CheckpointedJsonlWriter:
+    """Appends groups of records (e.g. one date's papers) to a JSONL file.
+
+    Every checkpoint_every groups, the file is flushed and fsync'd, and a sidecar
+    `<path>.checkpoint.json` records the byte offset and the keys of all groups
+    written so far. On resume, the file is truncated back to the last checkpoint
+    (dropping any half-written group) and `completed` lists the groups to skip.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resume: bool = False,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ):
+        self.path = path
+        self.checkpoint_path = f"{path}.checkpoint.json"
+        self.checkpoint_every = checkpoint_every
+        self.completed: set[str] = set()
+        self._pending = 0
+
+        offset = 0
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+            offset = checkpoint["offset"]
+            self.completed = set(checkpoint["completed"])
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab" if offset else "wb")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+
+    def write(self, key: str, records: list[dict]) -> None:
+        """Appends a group of records and marks key as completed."""
+        if records:
+            self._file.write(
+                "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8")
+            )
+        self.completed.add(key)
+        self._pending += 1
+        if self._pending >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Makes everything written so far durable and records it in the sidecar."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"offset": self._file.tell(), "completed": sorted(self.completed)}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self._pending = 0
+
+    def close(self) -> None:
+        self.checkpoint()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+DEFAULT_SYNC_EVERY = 10
+
+
+class DurableJsonlLog:
+    """Append-only JSONL log of single records, fsync'd every sync_every appends.
+
+    Used as a side log of results that are merged into a larger file later: each
+    result costs one appended line, and after a crash `read_records` returns every
+    complete line (a torn final line is ignored). Opening the log appends to it.
+    """
+
+    def __init__(self, path: str, sync_every: int = DEFAULT_SYNC_EVERY):
+        self.path = path
+        self.sync_every = sync_every
+        self._pending = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")
+        # Start on a fresh line if the previous run died mid-record
+        if self._file.tell() and not _ends_with_newline(path):
+            self._file.write(b"\n")
+
+    def append(self, record: dict) -> None:
+        self._file.write((json.dumps(record, default=str) + "\n").encode("utf-8"))
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Makes every appended record durable."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        self.sync()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def read_records(path: str) -> list[dict]:
+        """Returns the complete records in a log, or [] if it doesn't exist."""
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
@@ -0,0 +1,245 @@
+"""PDF preprocessing for author_info extraction: streamed download and first-page split.
+
+Only a paper's first page is sent to the model, so the whole PDF is rarely needed.
+Downloads are streamed in chunks; for a linearized ("fast web view") PDF the first
+page's objects and cross-reference section come first, so the download stops at the
+end of the first-page section (/E in the linearization dictionary) and the prefix is
+closed with a startxref pointing at the first-page xref. Other PDFs keep their xref
+at the end of the file and are read in full.
+
+The CPU-bound pypdf split runs in worker processes (pass a ProcessPoolExecutor), so
+it does not hold the GIL the event loop and extraction requests need. Every PDF gets
+a stats dict with bytes read, download time, split CPU time and worker peak RSS.
+"""
+
+import asyncio
+import io
+import re
+import time
+from concurrent.futures import Executor
+
+from aiohttp import ClientResponse, ClientSession
+from pypdf import PdfReader, PdfWriter
+
+# resource is Unix-only; elsewhere the memory stats are None
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# The linearization dictionary must be the first object in the file, within its
+# first 1024 bytes
+LINEARIZATION_WINDOW = 1024
+
+_LINEARIZATION_DICT = re.compile(rb"\d+\s+\d+\s+obj\s*<<(.*?)>>\s*endobj", re.DOTALL)
+_LINEARIZATION_ENTRY = re.compile(rb"/(Linearized|L|E)\s+(\d+(?:\.\d+)?)")
+# The first-page xref follows the linearization dictionary, either as a classic
+# `xref` table or as a cross-reference stream object
+_FIRST_PAGE_XREF = re.compile(rb"\s*(xref\s|\d+\s+\d+\s+obj\s*<<[^>]*?/Type\s*/XRef)")
+
+
+def linearization_info(head: bytes) -> dict | None:
+    """Parses the linearization dictionary at the start of a PDF.
+
+    Returns {"length", "first_page_end", "xref_offset"} for a linearized PDF, or None
+    if head (the first LINEARIZATION_WINDOW bytes or more) doesn't start with one.
+    """
+    match = _LINEARIZATION_DICT.search(head, 0, LINEARIZATION_WINDOW)
+    if match is None:
+        return None
+    entries = {key.decode(): float(value) for key, value in _LINEARIZATION_ENTRY.findall(match.group(1))}
+    if not {"Linearized", "L", "E"} <= entries.keys():
+        return None
+    xref = _FIRST_PAGE_XREF.match(head, match.end())
+    if xref is None:
+        return None
+    return {
+        "length": int(entries["L"]),
+        "first_page_end": int(entries["E"]),
+        "xref_offset": xref.start(1),
+    }
+
+
+def close_prefix(prefix: bytes, xref_offset: int) -> bytes:
+    """Makes the first-page prefix of a linearized PDF parseable on its own."""
+    return prefix + b"\nstartxref\n%d\n%%%%EOF\n" % xref_offset
+
+
+class _PdfStream:
+    """A PDF response read in chunks, which can stop after the first page and resume.
+
+    Everything read so far is kept, so when the first-page prefix turns out not to
+    parse, the rest of the same response is read instead of downloading it again.
+    """
+
+    def __init__(self, url: str, response: ClientResponse, chunk_size: int, requested_at: float):
+        self.url = url
+        self.content_length = response.content_length
+        self._chunks = response.content.iter_chunked(chunk_size)
+        self._buf = bytearray()
+        self._info = None
+        # Download time includes waiting for the response headers
+        self._download_s = time.perf_counter() - requested_at
+
+    async def _read(self, stop_at: int | None = None) -> None:
+        """Reads chunks until at least stop_at bytes are buffered, or to the end."""
+        start = time.perf_counter()
+        if stop_at is None or len(self._buf) < stop_at:
+            async for chunk in self._chunks:
+                self._buf += chunk
+                if stop_at is not None and len(self._buf) >= stop_at:
+                    break
+        self._download_s += time.perf_counter() - start
+
+    def _stats(self, truncated: bool, prefix_fallback: bool = False) -> dict:
+        return {
+            "url": self.url,
+            "content_length": self.content_length,
+            "bytes_read": len(self._buf),
+            "linearized": self._info is not None,
+            "truncated": truncated,
+            "prefix_fallback": prefix_fallback,
+            "download_s": self._download_s,
+        }
+
+    async def read(self, first_page_only: bool = True) -> tuple[bytes, dict]:
+        """Reads up to the end of the first page when the PDF is linearized, else all of it.
+
+        The early stop only applies when the linearization dictionary's /L matches the
+        served length (otherwise the file was updated after linearizing and /E can't
+        be trusted). Returns the PDF (or closed first-page prefix) and download stats.
+        """
+        await self._read(LINEARIZATION_WINDOW)
+        first_page_end = None
+        if len(self._buf) >= LINEARIZATION_WINDOW:
+            self._info = linearization_info(bytes(self._buf[:LINEARIZATION_WINDOW]))
+            if first_page_only and self._info is not None and self.content_length in (None, self._info["length"]):
+                first_page_end = self._info["first_page_end"]
+        await self._read(first_page_end)
+
+        truncated = first_page_end is not None and len(self._buf) >= first_page_end
+        if truncated:
+            pdf_bytes = close_prefix(bytes(self._buf[:first_page_end]), self._info["xref_offset"])
+        else:
+            pdf_bytes = bytes(self._buf)
+        return pdf_bytes, self._stats(truncated)
+
+    async def read_rest(self) -> tuple[bytes, dict]:
+        """Reads the rest of the PDF after read() stopped at the first page."""
+        await self._read()
+        return bytes(self._buf), self._stats(truncated=False, prefix_fallback=True)
+
+
+def _check_status(url: str, response: ClientResponse) -> None:
+    if response.status != 200:
+        raise ValueError(f"Failed to fetch PDF from {url}, status code: {response.status}")
+
+
+async def stream_pdf(
+    url: str,
+    session: ClientSession,
+    first_page_only: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[bytes, dict]:
+    """Downloads a PDF in chunks, stopping after the first page when it is linearized.
+
+    Returns the PDF (or closed first-page prefix) and download stats; see _PdfStream.read.
+    """
+    start = time.perf_counter()
+    async with session.get(url) as response:
+        _check_status(url, response)
+        return await _PdfStream(url, response, chunk_size, start).read(first_page_only)
+
+
+def first_page_pdf(pdf_bytes: bytes) -> bytes:
+    """Returns a one-page PDF holding only the first page of pdf_bytes."""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    writer = PdfWriter()
+    writer.add_page(reader.pages[0])
+    first_page_buf = io.BytesIO()
+    writer.write(first_page_buf)
+    return first_page_buf.getvalue()
+
+
+def _max_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def split_first_page(pdf_bytes: bytes) -> tuple[bytes, dict]:
+    """first_page_pdf plus the CPU time and peak RSS of the process that ran it.
+
+    Meant to run in a worker process: process_time covers only that process, and
+    rss_growth_mb is how much this PDF raised the worker's peak.
+    """
+    rss_before = _max_rss_mb()
+    cpu_start = time.process_time()
+    first_page_bytes = first_page_pdf(pdf_bytes)
+    stats = {
+        "split_cpu_s": time.process_time() - cpu_start,
+        "input_bytes": len(pdf_bytes),
+        "first_page_bytes": len(first_page_bytes),
+        "worker_peak_rss_mb": None,
+        "rss_growth_mb": None,
+    }
+    if rss_before is not None:
+        stats["worker_peak_rss_mb"] = _max_rss_mb()
+        stats["rss_growth_mb"] = stats["worker_peak_rss_mb"] - rss_before
+    return first_page_bytes, stats
+
+
+async def preprocess_pdf(
+    url: str,
+    session: ClientSession,
+    executor: Executor | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[bytes, dict]:
+    """Streams a PDF and splits off its first page in executor.
+
+    The response stays open while the first-page prefix is split. If the prefix
+    doesn't parse (its trailer or page tree may point past /E), the rest of the same
+    response is read and the full PDF is split instead, and the stats record the
+    fallback as prefix_fallback. Returns the one-page PDF and the combined stats.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    async with session.get(url) as response:
+        _check_status(url, response)
+        stream = _PdfStream(url, response, chunk_size, start)
+        pdf_bytes, stats = await stream.read()
+        try:
+            first_page_bytes, split_stats = await loop.run_in_executor(executor, split_first_page, pdf_bytes)
+        except Exception as e:
+            if not stats["truncated"]:
+                raise
+            print(f"First-page prefix of {url} didn't parse ({e}); reading the rest of the PDF")
+            pdf_bytes, stats = await stream.read_rest()
+            first_page_bytes, split_stats = await loop.run_in_executor(executor, split_first_page, pdf_bytes)
+    stats.update(split_stats)
+    return first_page_bytes, stats
+
+
+def summarize_pdf_stats(all_stats: list[dict]) -> str:
+    """One-line summary of preprocess_pdf stats over a run."""
+    if not all_stats:
+        return "No PDFs preprocessed"
+    num = len(all_stats)
+    num_truncated = sum(s["truncated"] for s in all_stats)
+    num_fallback = sum(s["prefix_fallback"] for s in all_stats)
+    bytes_read = sum(s["bytes_read"] for s in all_stats)
+    full_bytes = sum(s["content_length"] or s["bytes_read"] for s in all_stats)
+    cpu = [s["split_cpu_s"] for s in all_stats]
+    summary = (
+        f"{num} PDFs preprocessed, {num_truncated} stopped after the first page, "
+        f"{num_fallback} read in full after the prefix didn't parse; "
+        f"read {bytes_read / 1e6:.1f} of {full_bytes / 1e6:.1f} MB; "
+        f"split CPU mean {sum(cpu) / num:.3f}s, max {max(cpu):.3f}s"
+    )
+    rss = [s["worker_peak_rss_mb"] for s in all_stats if s["worker_peak_rss_mb"] is not None]
+    if rss:
+        summary += f"; worker peak RSS {max(rss):.0f} MB"
+    return summary
@@ -0,0 +1,123 @@
+"""Adaptive concurrency control and retry backoff for rate-limited HTTP APIs."""
+
+import asyncio
+import email.utils
+import random
+import time
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0  # seconds
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header (delay in seconds or an HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Whether an exception means the API is overloaded (a timeout), as opposed to a
+    bad payload, a 404 or a local bug, which shouldn't shrink the concurrency limit."""
+    return isinstance(error, asyncio.TimeoutError)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = MAX_BACKOFF) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class AdaptiveLimiter:
+    """A concurrency limit shared by all requests to one API, adjusted by AIMD.
+
+    Every success grows the limit by 1/limit (about +1 per round of requests), up to
+    max_limit. A 429/5xx or timeout multiplies it by decrease_factor, at
+    most once per decrease_interval seconds so a burst of failures from requests
+    that were already in flight counts as one congestion signal. A Retry-After hint
+    pauses all new requests until it expires. max_rate optionally caps requests per
+    second with a token bucket.
+
+    Use as `async with limiter:` around each individual request attempt.
+    """
+
+    def __init__(
+        self,
+        max_limit: int = 20,
+        initial: int | None = None,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        decrease_interval: float = 1.0,
+        max_rate: float | None = None,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial or max_limit)
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+        self.max_rate = max_rate
+        self.num_throttled = 0
+
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._tokens = float(max_limit)
+        self._last_refill = time.monotonic()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            while (pause := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            await self._take_token()
+        except BaseException:
+            # Cancelled while waiting: __aexit__ won't run, so give the slot back here
+            await self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._release()
+
+    async def _release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    async def _take_token(self) -> None:
+        if not self.max_rate:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.max_limit),
+                self._tokens + (now - self._last_refill) * self.max_rate,
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.max_rate)
+
+    def record_success(self) -> None:
+        self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        """Registers a throttling/server error, backing off every request sharing this limiter."""
+        now = time.monotonic()
+        self.num_throttled += 1
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+        if now - self._last_decrease >= self.decrease_interval:
+            self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+            self._last_decrease = now
@@ -0,0 +1,62 @@
+"""Shared aiohttp session factory with a tuned, keep-alive connection pool.
+
+Every entry point should create its sessions here so that connections, DNS lookups
+and TLS handshakes are reused across requests instead of paid per burst.
+"""
+
+import aiohttp
+
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection stays in the pool
+
+# Timeouts in seconds. TOTAL_TIMEOUT bounds a whole request, body included, so a
+# large PDF on a slow link can exceed it; PDF downloads pass total_timeout=None and
+# rely on READ_TIMEOUT, which applies per socket read and so only trips on a stall.
+TOTAL_TIMEOUT = 300
+CONNECT_TIMEOUT = 15
+READ_TIMEOUT = 60
+
+# aiohttp decodes brotli responses only if a brotli package is installed.
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_session(
+    max_connections_per_host: int,
+    headers: dict | None = None,
+    max_connections: int = 100,
+    total_timeout: float | None = TOTAL_TIMEOUT,
+    connect_timeout: float = CONNECT_TIMEOUT,
+    read_timeout: float = READ_TIMEOUT,
+) -> aiohttp.ClientSession:
+    """Creates a ClientSession whose pool matches the caller's concurrency.
+
+    max_connections_per_host should equal the semaphore/limiter size guarding the
+    requests, so each in-flight request keeps one warm connection and no more.
+    total_timeout=None removes the per-request deadline (for large downloads).
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max(max_connections, max_connections_per_host),
+        limit_per_host=max_connections_per_host,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=total_timeout,
+        connect=connect_timeout,
+        sock_read=read_timeout,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers={"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})},
+    )
@@ -0,0 +1,210 @@
+"""Reading and writing the papers dataset as JSON, JSONL or Parquet, chosen by extension.
+
+A `.parquet` path is a directory holding a hive-partitioned dataset with one
+partition per month of `date` (e.g. `month=2025-03/part-0.parquet`). Nested columns
+(`authors`, `ai_keywords`, `author_info`) are stored with explicit list/struct types
+rather than as Python objects, and readers can load only the columns they need.
+"""
+
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AUTHOR_INFO_TYPE = pa.list_(
+    pa.struct([
+        ("name", pa.string()),
+        ("affiliation", pa.string()),
+        ("email", pa.string()),
+    ])
+)
+
+PAPERS_SCHEMA = pa.schema([
+    ("date", pa.string()),
+    ("paper_id", pa.string()),
+    ("title", pa.string()),
+    ("authors", pa.list_(pa.string())),
+    ("summary", pa.string()),
+    ("publishedAt", pa.string()),
+    ("submittedOnDailyAt", pa.string()),
+    ("submittedBy", pa.string()),
+    ("upvotes", pa.int64()),
+    ("numComments", pa.int64()),
+    ("ai_summary", pa.string()),
+    ("ai_keywords", pa.list_(pa.string())),
+    ("githubRepo", pa.string()),
+    ("githubStars", pa.int64()),
+    ("thumbnail", pa.string()),
+    ("url", pa.string()),
+    ("pdf_link", pa.string()),
+    ("author_info", AUTHOR_INFO_TYPE),
+])
+
+PARTITION_COLUMN = "month"
+
+_FORMATS = {".json": "json", ".jsonl": "jsonl", ".parquet": "parquet"}
+
+
+def dataset_format(path: str) -> str:
+    """Returns "json", "jsonl" or "parquet" for path, based on its extension."""
+    ext = os.path.splitext(str(path).rstrip("/"))[1].lower()
+    if ext not in _FORMATS:
+        raise ValueError(
+            f"Unsupported dataset path {path}: expected a .json, .jsonl or .parquet extension."
+        )
+    return _FORMATS[ext]
+
+
+def papers_to_table(df: pd.DataFrame) -> pa.Table:
+    """Converts a papers DataFrame to Arrow, using PAPERS_SCHEMA types where they apply.
+
+    Columns that aren't part of the schema keep their inferred Arrow types.
+    """
+    df = df.copy()
+    if "date" in df.columns:
+        df["date"] = df["date"].astype(str).str[:10]
+    if "paper_id" in df.columns:
+        df["paper_id"] = df["paper_id"].astype(str)
+
+    fields = []
+    for column in df.columns:
+        if column in PAPERS_SCHEMA.names:
+            fields.append(PAPERS_SCHEMA.field(column))
+        else:
+            fields.append(pa.Schema.from_pandas(df[[column]], preserve_index=False).field(column))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+
+def table_to_papers(table: pa.Table) -> pd.DataFrame:
+    """Converts Arrow back to pandas, with nested columns as Python lists of dicts/strings.
+
+    The rest of the project checks `isinstance(x, list)`, so list columns must not come
+    back as numpy arrays (pyarrow's default).
+    """
+    nested = [
+        field.name
+        for field in table.schema
+        if pa.types.is_list(field.type) or pa.types.is_struct(field.type)
+    ]
+    df = table.drop_columns(nested).to_pandas()
+    for name in nested:
+        df[name] = pd.Series(table.column(name).to_pylist(), index=df.index, dtype=object)
+    return df[table.column_names]
+
+
+def _recover_parquet_swap(path: str) -> None:
+    """Finishes or rolls back a Parquet write that was interrupted mid-swap.
+
+    write_papers moves the current dataset to `<path>.old` before moving the new one
+    into place. If it died in between, path is missing and `.old` still holds the
+    last complete dataset, which is moved back; if it died after the swap, the
+    leftover `.old` is removed.
+    """
+    old_path = f"{path}.old"
+    if not os.path.isdir(old_path):
+        return
+    if os.path.exists(path):
+        shutil.rmtree(old_path)
+    else:
+        os.replace(old_path, path)
+
+
+def read_papers(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Reads a papers dataset, optionally loading only the given columns.
+
+    For Parquet, unrequested columns are never read or decoded; for JSONL they are
+    dropped while streaming through the file.
+    """
+    fmt = dataset_format(path)
+    if fmt == "parquet":
+        path = str(path).rstrip("/")
+        _recover_parquet_swap(path)
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name != PARTITION_COLUMN]
+        return table_to_papers(dataset.to_table(columns=columns))
+
+    if columns is not None and fmt == "jsonl":
+        return _read_jsonl_columns(path, columns)
+
+    df = pd.read_json(
+        path,
+        orient="records",
+        lines=fmt == "jsonl",
+        dtype={"paper_id": str},
+        convert_dates=False,
+    )
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
+    return df
+
+
+def _read_jsonl_columns(path: str, columns: list[str]) -> pd.DataFrame:
+    """Streams a JSONL dataset, keeping only the given fields of each record.
+
+    Every line is still parsed, but unrequested fields (abstracts, AI summaries, ...)
+    are dropped right away instead of being built into DataFrame columns. Columns no
+    record has are left out, as with read_json.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    values = {column: [] for column in columns}
+    present = set()
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads(line)
+            present.update(column for column in columns if column in record)
+            for column, column_values in values.items():
+                column_values.append(record.get(column))
+    df = pd.DataFrame({column: values[column] for column in columns if column in present})
+    if "paper_id" in df.columns:
+        df["paper_id"] = df["paper_id"].astype(str)
+    return df
+
+
+def write_papers(df: pd.DataFrame, path: str) -> None:
+    """Writes a papers dataset in the format implied by path's extension.
+
+    Parquet output replaces the whole directory: the new dataset is written next to it
+    and swapped in, so a failed write never leaves a half-written dataset behind. A
+    crash during the swap itself is repaired by the next read or write.
+    """
+    fmt = dataset_format(path)
+    if fmt == "json":
+        df.to_json(path, orient="records")
+        return
+    if fmt == "jsonl":
+        df.to_json(path, orient="records", lines=True)
+        return
+
+    table = papers_to_table(df)
+    months = pa.array(df["date"].astype(str).str[:7], type=pa.string())
+    table = table.append_column(PARTITION_COLUMN, months)
+
+    path = str(path).rstrip("/")
+    _recover_parquet_swap(path)
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    ds.write_dataset(
+        table,
+        tmp_path,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"),
+        basename_template="part-{i}.parquet",
+    )
+    if os.path.isdir(path):
+        old_path = f"{path}.old"
+        os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path)
+    else:
+        os.replace(tmp_path, path)
@@ -1,47 +1,142 @@
+import numpy as np
 import pandas as pd
 
 
+def has_author_info(author_info: pd.Series) -> pd.Series:
+    """Vectorized mask of rows whose author_info is a non-empty list.
+
+    Uses Arrow list lengths (`.list.len()`) for Arrow-backed columns; for object
+    columns, `.str.len()` returns each list's length (NaN for None/NaN, which
+    compares False) without a Python-level lambda. A column with no lists at all
+    (e.g. all nulls, read back as float64) has no author info.
+    """
+    if isinstance(author_info.dtype, pd.ArrowDtype):
+        lengths = author_info.list.len().fillna(0)
+        return pd.Series(lengths.gt(0).to_numpy(dtype=bool), index=author_info.index)
+    if author_info.dtype != object:
+        return pd.Series(False, index=author_info.index)
+    return author_info.str.len().gt(0)
+
+
+def _normalized_keys(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """Returns (date, paper_id) with date truncated to YYYY-MM-DD and paper_id cast to str.
+
+    Keys from frames with mixed dtypes (e.g. datetime vs string dates) then compare equal.
+    """
+    dates = df["date"]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        dates = dates.dt.strftime("%Y-%m-%d")
+    else:
+        dates = dates.astype(str).str[:10]
+    return dates, df["paper_id"].astype(str)
+
+
+def build_key_index(dates: pd.Series, paper_ids: pd.Series) -> pd.MultiIndex:
+    """Returns a hashable (date, paper_id) index for membership tests between frames."""
+    return pd.MultiIndex.from_arrays([dates, paper_ids], names=["date", "paper_id"])
+
+
+def bulk_update_by_paper_id(
+    df: pd.DataFrame, values: dict, column: str = "author_info", skip_filled: bool = False
+) -> tuple[int, int]:
+    """Sets df[column] to values[paper_id] on every row of each paper_id, in place.
+
+    The paper_ids of values are hashed once into an index that every row's paper_id
+    is looked up in, giving each row's position in values (or -1), and all matched
+    rows are written in a single column assignment. Applying M results to N rows
+    therefore costs O(N + M) instead of one scan of the paper_id column per result.
+    Values are stored as-is (lists stay lists). Rows sharing a paper_id all get its
+    value, and keys that are equal as strings (e.g. 2503 and "2503") count once,
+    the last one winning. With skip_filled, rows that already hold a non-empty list
+    (see has_author_info) keep it.
+    Returns (number of paper_ids updated, number of paper_ids not found in df).
+    """
+    # get_indexer needs unique keys
+    values = {str(paper_id): value for paper_id, value in values.items()}
+    if not values:
+        return 0, 0
+    keys = pd.Index(list(values))
+    # Filled element by element so list values aren't broadcast into a 2-D array
+    value_array = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values.values()):
+        value_array[i] = value
+
+    value_positions = keys.get_indexer(df["paper_id"].astype(str))
+    num_found = len(np.unique(value_positions[value_positions >= 0]))
+    if skip_filled and column in df.columns:
+        value_positions[has_author_info(df[column]).to_numpy()] = -1
+    rows = np.flatnonzero(value_positions >= 0)
+    num_updated = len(np.unique(value_positions[rows]))
+    if len(rows):
+        if column in df.columns:
+            updated = df[column].to_numpy(dtype=object, copy=True)
+        else:
+            updated = np.full(len(df), None, dtype=object)
+        updated[rows] = value_array[value_positions[rows]]
+        df[column] = updated
+    return num_updated, len(values) - num_found
+
+
 def merge_datasets(existing_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
     """Merges newest data with existing data, preferring new data but preserving author_info.
 
     Fresh scrapes return author_info=None for all rows. This merge keeps the new data's
     metadata (upvotes, comments, etc.) but backfills author_info from the existing dataset
     so previously extracted author information is not lost.
+
+    Only existing rows dated on one of new_df's dates are keyed by (date, paper_id) and
+    compared against new_df, and the author_info backfill only looks at existing rows
+    sharing a paper_id with a new row that lacks it. A scrape of the last two weeks
+    therefore does work proportional to those two weeks, plus a few vectorized scans.
+    existing_df is expected to be unique per key, as every dataset written by this
+    function is.
     """
     if existing_df is None or existing_df.empty:
         return new_df
     if new_df is None or new_df.empty:
         return existing_df
 
-    # Build lookup of existing author_info before merging
+    # Later rows of new_df win over earlier ones with the same key
+    new_dates, new_ids = _normalized_keys(new_df)
+    new_keys = build_key_index(new_dates, new_ids)
+    new_unique = ~new_keys.duplicated(keep="last")
+    new_df = new_df[new_unique].copy()
+    new_df["date"] = new_dates[new_unique]
+    new_df["paper_id"] = new_ids[new_unique]
+    new_keys = new_keys[new_unique]
+
+    existing_dates, existing_ids = _normalized_keys(existing_df)
+    keep = np.ones(len(existing_df), dtype=bool)
+    window = existing_dates.isin(new_df["date"].unique()).to_numpy()
+    if window.any():
+        window_keys = build_key_index(existing_dates[window], existing_ids[window])
+        keep[window] = ~window_keys.isin(new_keys)
+    kept_df = existing_df[keep].copy()
+    kept_df["date"] = existing_dates[keep]
+    kept_df["paper_id"] = existing_ids[keep]
+
+    # Backfill author_info for new rows from existing rows of the same paper
     if "author_info" in existing_df.columns:
-        has_info = existing_df.dropna(subset=["author_info"])
-        has_info = has_info[has_info["author_info"].apply(
-            lambda x: isinstance(x, list) and len(x) > 0
-        )]
-        info_lookup = dict(
-            zip(has_info["paper_id"].astype(str), has_info["author_info"])
-        )
-    else:
-        info_lookup = {}
-
-    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-    # Normalize columns to avoid mixed-type comparison failures
-    combined_df["date"] = combined_df["date"].astype(str).str[:10]
-    combined_df["paper_id"] = combined_df["paper_id"].astype(str)
-    merged = (
-        combined_df.drop_duplicates(subset=["date", "paper_id"], keep="last")
-        .sort_values(by="date", ascending=False)
-        .reset_index(drop=True)
-    )
-
-    # Backfill author_info from existing dataset
-    if info_lookup and "author_info" in merged.columns:
-        null_mask = merged["author_info"].isna() | merged["author_info"].apply(
-            lambda x: not isinstance(x, list) or len(x) == 0
-        )
-        merged.loc[null_mask, "author_info"] = merged.loc[null_mask, "paper_id"].map(
-            info_lookup
-        )
-
-    return merged
+        if "author_info" not in new_df.columns:
+            new_df["author_info"] = None
+        missing = ~has_author_info(new_df["author_info"])
+        if missing.any():
+            candidates = existing_ids.isin(new_df.loc[missing, "paper_id"]).to_numpy()
+            candidate_info = existing_df["author_info"][candidates]
+            with_info = has_author_info(candidate_info).to_numpy()
+            info_lookup = pd.Series(
+                candidate_info.to_numpy()[with_info],
+                index=existing_ids[candidates].to_numpy()[with_info],
+            )
+            info_lookup = info_lookup[~info_lookup.index.duplicated(keep="last")]
+            new_df.loc[missing, "author_info"] = new_df.loc[missing, "paper_id"].map(info_lookup)
+
+    columns = list(existing_df.columns) + [c for c in new_df.columns if c not in existing_df.columns]
+    new_df = new_df.sort_values(by="date", ascending=False, kind="stable")
+    if kept_df["date"].is_monotonic_decreasing and (
+        kept_df.empty or new_df["date"].iloc[-1] >= kept_df["date"].iloc[0]
+    ):
+        # Common case: the scrape only covers dates at or after the existing dataset's newest
+        return pd.concat([new_df, kept_df], ignore_index=True)[columns]
+    merged = pd.concat([kept_df, new_df], ignore_index=True)[columns]
+    return merged.sort_values(by="date", ascending=False, kind="stable").reset_index(drop=True)
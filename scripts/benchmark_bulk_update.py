@@ -0,0 +1,80 @@
+"""Benchmark for applying extracted author_info to a dataset by paper_id.
+
+Applies a map of M paper_id -> author_info results to a synthetic dataset of N rows
+with bulk_update_by_paper_id and with the previous per-paper
+`df.index[df["paper_id"] == paper_id]` scan + `df.at` loop, and checks both produce
+the same column.
+
+Usage:
+    poetry run python scripts/benchmark_bulk_update.py
+    poetry run python scripts/benchmark_bulk_update.py --rows 50000 --results 2000 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from hf_daily_papers_analytics.utils import bulk_update_by_paper_id
+
+
+def update_baseline(df: pd.DataFrame, author_info_map: dict) -> int:
+    """The previous update_df_with_author_info, kept here as the benchmark baseline."""
+    new_updates = 0
+    for paper_id, author_info in author_info_map.items():
+        if not author_info:
+            continue
+        idxs = df.index[df["paper_id"] == paper_id]
+        for idx in idxs:
+            df.at[idx, "author_info"] = author_info
+        if len(idxs) > 0:
+            new_updates += 1
+    return new_updates
+
+
+def make_inputs(num_rows: int, num_results: int, seed: int = 0) -> tuple[pd.DataFrame, dict]:
+    rng = np.random.default_rng(seed)
+    paper_ids = [f"{2300 + i // 100_000}.{i % 100_000:05d}" for i in range(num_rows)]
+    df = pd.DataFrame({
+        "paper_id": paper_ids,
+        "author_info": pd.Series([None] * num_rows, dtype=object),
+    })
+    chosen = rng.choice(num_rows, size=min(num_results, num_rows), replace=False)
+    author_info_map = {
+        paper_ids[i]: [{"name": f"Author {i}", "affiliation": "Example University", "email": ""}]
+        for i in chosen
+    }
+    return df, author_info_map
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--results", type=int, nargs="+", default=[2_000, 20_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'results':>8} {'baseline s':>11} {'bulk s':>8} {'speedup':>8}")
+    for num_results in args.results:
+        df, author_info_map = make_inputs(args.rows, num_results)
+        expected_df = df.copy()
+
+        start = time.perf_counter()
+        expected_updates = update_baseline(expected_df, author_info_map)
+        baseline_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        updates, not_found = bulk_update_by_paper_id(df, author_info_map, "author_info")
+        bulk_s = time.perf_counter() - start
+
+        assert (updates, not_found) == (expected_updates, 0)
+        assert df["author_info"].tolist() == expected_df["author_info"].tolist()
+        print(f"{args.rows:>8,} {num_results:>8,} {baseline_s:>11.3f} {bulk_s:>8.3f} {baseline_s / bulk_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark for visualizations/analyze.py::explode_authors.
+
+Compares the columnar explode_authors against the previous df.iterrows()
+implementation on the local dataset (or a copy of it tiled to a larger size), and
+checks that both produce the same author table.
+
+Usage:
+    poetry run python scripts/benchmark_explode_authors.py
+    poetry run python scripts/benchmark_explode_authors.py --data data/hf_daily_papers.parquet --scale 10
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "visualizations")))
+
+import analyze
+
+
+def explode_authors_baseline(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous row-by-row explode_authors, kept here as the benchmark baseline."""
+    rows = []
+    for _, paper in df.iterrows():
+        info = paper["author_info"]
+        if not isinstance(info, list):
+            continue
+        for i, author in enumerate(info):
+            rows.append({
+                "date": paper["date"],
+                "paper_id": paper["paper_id"],
+                "upvotes": paper["upvotes"],
+                "author_name": author.get("name", ""),
+                "affiliation": author.get("affiliation", ""),
+                "email": author.get("email", ""),
+                "is_first_author": i == 0,
+                "is_last_author": i == len(info) - 1,
+                "is_chinese_name": analyze.is_chinese_name(author.get("name", "")),
+                "is_chinese_affiliation": analyze.is_chinese_affiliation(author.get("affiliation", "")),
+            })
+    return pd.DataFrame(rows)
+
+
+def _timed(fn, *args) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=str, default=str(analyze.DATA_PATH))
+    parser.add_argument("--scale", type=int, default=1, help="Tile the dataset this many times.")
+    args = parser.parse_args()
+
+    df = analyze.load_data(args.data, columns=["date", "paper_id", "upvotes", "author_info"])
+    df = pd.concat([df] * args.scale, ignore_index=True)
+
+    baseline_s, expected = _timed(explode_authors_baseline, df)
+    columnar_s, author_df = _timed(analyze.explode_authors, df)
+    pd.testing.assert_frame_equal(author_df, expected)
+
+    print(f"{len(df):,} papers -> {len(author_df):,} author rows")
+    print(f"  iterrows: {baseline_s:.3f}s")
+    print(f"  columnar: {columnar_s:.3f}s ({baseline_s / columnar_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
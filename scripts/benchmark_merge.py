@@ -0,0 +1,112 @@
+"""Benchmark for merge_datasets on synthetic datasets of growing size.
+
+Each run merges a fresh two-week scrape into an existing dataset of N papers and
+compares the current merge against the previous concat + drop_duplicates + apply
+implementation, checking that both produce the same rows.
+
+Usage:
+    poetry run python scripts/benchmark_merge.py
+    poetry run python scripts/benchmark_merge.py --sizes 10000 100000 1000000 --new_days 14
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from hf_daily_papers_analytics.utils import merge_datasets
+
+PAPERS_PER_DAY = 30
+
+
+def merge_datasets_baseline(existing_df: pd.DataFrame, new_df: pd.DataFrame) -> pd.DataFrame:
+    """The previous merge_datasets, kept here as the benchmark baseline."""
+    if "author_info" in existing_df.columns:
+        has_info = existing_df.dropna(subset=["author_info"])
+        has_info = has_info[has_info["author_info"].apply(
+            lambda x: isinstance(x, list) and len(x) > 0
+        )]
+        info_lookup = dict(
+            zip(has_info["paper_id"].astype(str), has_info["author_info"])
+        )
+    else:
+        info_lookup = {}
+
+    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
+    combined_df["date"] = combined_df["date"].astype(str).str[:10]
+    combined_df["paper_id"] = combined_df["paper_id"].astype(str)
+    merged = (
+        combined_df.drop_duplicates(subset=["date", "paper_id"], keep="last")
+        .sort_values(by="date", ascending=False)
+        .reset_index(drop=True)
+    )
+
+    if info_lookup and "author_info" in merged.columns:
+        null_mask = merged["author_info"].isna() | merged["author_info"].apply(
+            lambda x: not isinstance(x, list) or len(x) == 0
+        )
+        merged.loc[null_mask, "author_info"] = merged.loc[null_mask, "paper_id"].map(info_lookup)
+
+    return merged
+
+
+def make_datasets(num_papers: int, new_days: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Returns (existing, new): N papers over consecutive days, and a re-scrape of the last new_days."""
+    rng = np.random.default_rng(0)
+    num_days = -(-num_papers // PAPERS_PER_DAY)
+    end = datetime.date(2025, 3, 31)
+    days = [(end - datetime.timedelta(days=i)).isoformat() for i in range(num_days)]
+    dates = np.repeat(days, PAPERS_PER_DAY)[:num_papers]
+    paper_ids = np.array([f"{i // 100000:04d}.{i % 100000:05d}" for i in range(num_papers)])
+    info = [{"name": "Author", "affiliation": "University", "email": ""}]
+    author_info = [info if has_info else None for has_info in rng.random(num_papers) < 0.8]
+    existing = pd.DataFrame({
+        "date": dates,
+        "paper_id": paper_ids,
+        "title": "A paper title",
+        "upvotes": rng.integers(0, 100, num_papers),
+        "author_info": author_info,
+    })
+
+    new = existing[existing["date"].isin(days[:new_days])].copy()
+    new["upvotes"] += 1
+    new["author_info"] = None
+    return existing, new
+
+
+def _timed(fn, *args) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+    # The baseline leaves NaN where untouched rows had None; both mean "no author_info"
+    df = df.sort_values(["date", "paper_id"]).reset_index(drop=True)
+    df["author_info"] = df["author_info"].astype(object).where(df["author_info"].notna(), None)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--new_days", type=int, default=14)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'new rows':>9} {'baseline s':>11} {'merge s':>9} {'speedup':>8}")
+    for size in args.sizes:
+        existing, new = make_datasets(size, args.new_days)
+        baseline_s, expected = _timed(merge_datasets_baseline, existing, new)
+        merge_s, merged = _timed(merge_datasets, existing, new)
+        pd.testing.assert_frame_equal(_canonical(merged), _canonical(expected))
+        print(f"{size:>10,} {len(new):>9,} {baseline_s:>11.3f} {merge_s:>9.3f} {baseline_s / merge_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Micro-benchmark for decoding daily_papers API payloads.
+
+Builds a synthetic payload shaped like the HF daily_papers response and reports the
+decode + flatten cost per 1,000 papers for each available decoder.
+
+Usage:
+    poetry run python scripts/benchmark_parse.py
+    poetry run python scripts/benchmark_parse.py --papers_per_day 50 --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from hf_daily_papers_analytics import hf_papers_scraper
+from hf_daily_papers_analytics.hf_papers_scraper import decode_daily_papers
+
+
+def make_payload(num_papers: int) -> bytes:
+    """Returns a JSON body resembling one day of the daily_papers API."""
+    entries = []
+    for i in range(num_papers):
+        paper_id = f"2503.{i:05d}"
+        entries.append({
+            "paper": {
+                "id": paper_id,
+                "authors": [
+                    {"_id": f"a{i}{j}", "name": f"Author {j} Name{i}", "hidden": False}
+                    for j in range(8)
+                ],
+                "publishedAt": "2025-03-09T12:00:00.000Z",
+                "submittedOnDailyAt": "2025-03-10T01:23:45.000Z",
+                "title": f"A Study of Scaling Laws for Paper Number {i}",
+                "summary": "We study large language models. " * 40,
+                "upvotes": i % 97,
+                "discussionId": f"d{i}",
+                "ai_summary": "The paper shows models scale predictably. " * 3,
+                "ai_keywords": [f"keyword{k}" for k in range(10)],
+                "githubRepo": f"https://github.com/org/repo{i}" if i % 3 == 0 else None,
+                "githubStars": i * 3 if i % 3 == 0 else None,
+                "submittedOnDailyBy": {
+                    "_id": f"u{i}",
+                    "avatarUrl": "https://cdn-avatars.huggingface.co/x.png",
+                    "fullname": "Submitter",
+                    "user": f"user{i}",
+                    "type": "user",
+                },
+            },
+            "publishedAt": "2025-03-09T12:00:00.000Z",
+            "title": f"A Study of Scaling Laws for Paper Number {i}",
+            "thumbnail": f"https://cdn-thumbnails.huggingface.co/social-thumbnails/papers/{paper_id}.png",
+            "numComments": i % 5,
+            "submittedBy": {"user": f"user{i}"},
+            "isAuthorParticipating": False,
+        })
+    return json.dumps(entries).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers_per_day", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    body = make_payload(args.papers_per_day)
+    decoders = ["json"]
+    if hf_papers_scraper.orjson is not None:
+        decoders.append("orjson")
+    if hf_papers_scraper.msgspec is not None:
+        decoders.append("msgspec")
+
+    expected = decode_daily_papers(body, "2025-03-10", decoder="json")
+    print(f"Payload: {args.papers_per_day} papers, {len(body):,} bytes\n")
+    print(f"{'decoder':<10} {'ms / 1k papers':>15} {'speedup':>8}")
+
+    baseline = None
+    for decoder in decoders:
+        assert decode_daily_papers(body, "2025-03-10", decoder=decoder) == expected
+        seconds = min(timeit.repeat(
+            lambda: decode_daily_papers(body, "2025-03-10", decoder=decoder),
+            number=args.repeat,
+            repeat=5,
+        ))
+        ms_per_1k = seconds / (args.repeat * args.papers_per_day) * 1_000 * 1_000
+        baseline = baseline or ms_per_1k
+        print(f"{decoder:<10} {ms_per_1k:>15.2f} {baseline / ms_per_1k:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
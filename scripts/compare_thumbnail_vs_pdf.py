@@ -14,11 +14,13 @@ import json
 import time
 
 import aiohttp
-import pandas as pd
 from dotenv import load_dotenv
 from openai import OpenAI
 from pypdf import PdfReader, PdfWriter
 
+from hf_daily_papers_analytics.sessions import create_session
+from hf_daily_papers_analytics.storage import read_papers
+
 load_dotenv()
 
 DATA_PATH = "data/hf_daily_papers.jsonl"
@@ -79,14 +81,14 @@ async def download(url: str, session: aiohttp.ClientSession) -> bytes:
 
 
 async def main():
-    df = pd.read_json(DATA_PATH, lines=True)
+    df = read_papers(DATA_PATH)
     mask = df["author_info"].apply(lambda x: isinstance(x, list) and len(x) > 0)
     sample = df[mask].sample(10, random_state=42)
 
     client = OpenAI()
     headers = {"User-Agent": "Mozilla/5.0 (compatible; JustinsArxivBot/1.0)"}
 
-    async with aiohttp.ClientSession(headers=headers) as session:
+    async with create_session(1, headers=headers, total_timeout=None) as session:
         for idx, (_, row) in enumerate(sample.iterrows()):
             paper_id = row["paper_id"]
             thumbnail_url = row["thumbnail"]
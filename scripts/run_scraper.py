@@ -9,6 +9,25 @@ python scripts/run_scraper.py \
     --start_date 2024-01-01 \
     --end_date 2024-12-31 \
     --output_file extractions/hf_papers_2024.jsonl
+
+# Incremental: only fetch dates that are new, failed, or still settling
+python scripts/run_scraper.py \
+    --start_date 2023-05-04 \
+    --end_date 2025-03-10 \
+    --state_file .cache/scrape_state.json \
+    --output_file extractions/hf_papers_recent.jsonl
+
+# Stream a long range to disk as dates complete; re-run with --resume after a crash
+python scripts/run_scraper.py \
+    --start_date 2023-05-04 \
+    --end_date 2025-03-10 \
+    --output_file extractions/hf_papers_all.jsonl \
+    --stream --resume
+
+# Re-fetch only the dates recorded in a failed-date ledger from a previous run
+python scripts/run_scraper.py \
+    --retry_ledger .cache/failed_dates.json \
+    --output_file extractions/hf_papers_retried.jsonl
 """
 
 import argparse
@@ -19,7 +38,11 @@ import sys
 # Add the parent directory (project root) to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from hf_daily_papers_analytics.hf_papers_scraper import run_scraper
+from hf_daily_papers_analytics.hf_papers_scraper import (
+    DEFAULT_SETTLE_DAYS,
+    load_failed_dates,
+    run_scraper,
+)
 
 
 if __name__ == "__main__":
@@ -35,9 +58,61 @@ if __name__ == "__main__":
     parser.add_argument(
         "--cooldown", type=int, default=2, help="Cooldown time in seconds"
     )
+    parser.add_argument(
+        "--state_file",
+        type=str,
+        default=None,
+        help="Per-date scrape state file; enables incremental mode",
+    )
+    parser.add_argument(
+        "--settle_days",
+        type=int,
+        default=DEFAULT_SETTLE_DAYS,
+        help="Days after posting during which a date is still re-fetched",
+    )
+    parser.add_argument(
+        "--full_refresh",
+        action="store_true",
+        help="Fetch every date in the range even if the state says it is settled",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        default=None,
+        help="On-disk HTTP cache directory; enables ETag/If-Modified-Since requests",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Append each date's papers to the .jsonl output as soon as it is fetched",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="With --stream, continue a partially written output file",
+    )
+    parser.add_argument(
+        "--ledger_file",
+        type=str,
+        default=None,
+        help="Write dates that failed every retry (with their error class) to this file",
+    )
+    parser.add_argument(
+        "--retry_ledger",
+        type=str,
+        default=None,
+        help="Only fetch the dates listed in this failed-date ledger, at low concurrency",
+    )
 
     args = parser.parse_args()
 
+    dates = None
+    max_concurrent = 20
+    if args.retry_ledger:
+        dates = [failed["date"] for failed in load_failed_dates(args.retry_ledger)]
+        max_concurrent = 5
+        print(f"Retrying {len(dates)} failed dates from {args.retry_ledger}")
+
     asyncio.run(
         run_scraper(
             args.start_date,
@@ -45,5 +120,15 @@ if __name__ == "__main__":
             args.output_file,
             retries=args.retries,
             cooldown=args.cooldown,
+            max_concurrent=max_concurrent,
+            state_file=args.state_file,
+            settle_days=args.settle_days,
+            full_refresh=args.full_refresh,
+            cache_dir=args.cache_dir,
+            stream=args.stream or args.resume,
+            resume=args.resume,
+            return_df=not (args.stream or args.resume),
+            dates=dates,
+            ledger_file=args.ledger_file or args.retry_ledger,
         )
     )
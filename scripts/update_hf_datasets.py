@@ -1,16 +1,29 @@
 """Script to fetch daily papers from Hugging Face API and update the dataset on Hugging Face Hub.
 
-Performs a full scrape of all papers, merges with the existing dataset (preserving
-previously extracted author_info), fills author_info for recent papers via thumbnail
-extraction, and optionally uploads to HF Hub.
+Incrementally scrapes papers (only dates that are new, previously failed, or still
+settling), merges with the existing dataset (preserving previously extracted
+author_info), fills author_info for recent papers via thumbnail extraction, and
+optionally uploads to HF Hub.
 
 Usage:
-    # Full scrape + author info + upload (what the daily action runs):
+    # Incremental scrape + author info + upload (what the daily action runs):
     python scripts/update_hf_datasets.py --upload
 
+    # Re-scrape the full history instead of only unsettled dates:
+    python scripts/update_hf_datasets.py --full_rescrape --upload
+
     # Local test (no upload, no author info):
     python scripts/update_hf_datasets.py --skip_author_info
 
+    # Upload only the monthly shards that changed since the last run:
+    python scripts/update_hf_datasets.py --upload --upload_mode sharded
+
+    # Offline sharded sync against a local directory standing in for the Hub:
+    python scripts/update_hf_datasets.py --skip_author_info --upload --hub_dir /tmp/hub
+
+    # Also refresh the precomputed feature tables used by visualizations/analyze.py:
+    python scripts/update_hf_datasets.py --output data/hf_daily_papers.parquet --feature_store data/features
+
     # Custom lookback for author info:
     python scripts/update_hf_datasets.py --author_info_days 14 --upload
 """
@@ -20,17 +33,28 @@ import asyncio
 import os
 from datetime import datetime, timedelta
 
-import aiohttp
 import dotenv
 import pandas as pd
 from datasets import Dataset, DatasetDict, load_dataset
+from datasets.exceptions import DatasetNotFoundError
 from tqdm.asyncio import tqdm
 
 from hf_daily_papers_analytics.hf_papers_scraper import (
+    DEFAULT_LEDGER_FILE,
+    DEFAULT_SETTLE_DAYS,
+    DEFAULT_STATE_FILE,
+    commit_scrape_state,
     extract_author_info_from_thumbnail,
     run_scraper,
 )
-from hf_daily_papers_analytics.utils import merge_datasets
+from hf_daily_papers_analytics.extraction_cache import DEFAULT_EXTRACTION_CACHE_DIR, ExtractionCache
+from hf_daily_papers_analytics.extraction_client import ExtractionClient
+from hf_daily_papers_analytics.feature_store import update_feature_store
+from hf_daily_papers_analytics.http_cache import DEFAULT_CACHE_DIR
+from hf_daily_papers_analytics.hub_sync import HfHubRepo, LocalHubRepo, sync_shards
+from hf_daily_papers_analytics.sessions import create_session
+from hf_daily_papers_analytics.storage import write_papers
+from hf_daily_papers_analytics.utils import bulk_update_by_paper_id, has_author_info, merge_datasets
 
 dotenv.load_dotenv()
 
@@ -53,7 +77,9 @@ def _is_retryable_error(e: Exception) -> bool:
 
 
 def download_hf_dataset(dataset_name):
-    dataset = load_dataset(dataset_name)
+    # Sharded uploads change the data without regenerating the split sizes an older
+    # push_to_hub recorded in the dataset card, so don't verify against them
+    dataset = load_dataset(dataset_name, verification_mode="no_checks")
     df = pd.DataFrame(dataset["train"])
     return df
 
@@ -63,7 +89,20 @@ def upload_to_hf(dataset, dataset_name, token):
     dataset_dict.push_to_hub(dataset_name, token=token)
 
 
-async def fetch_author_info_thumbnail(paper_id, thumbnail_url, session, semaphore):
+def upload_changed_shards(dataset, repo):
+    """Uploads only the monthly shards whose content changed since the last sync."""
+    summary = sync_shards(dataset, repo, message=f"Update daily papers ({len(dataset)} papers)")
+    print(f"  Uploaded {len(summary['uploaded'])} shards ({summary['bytes'] / 1e6:.1f} MB), "
+          f"{summary['unchanged']} unchanged, {len(summary['deleted'])} deleted")
+    for path in summary["uploaded"]:
+        print(f"    + {path}")
+    for path in summary["deleted"]:
+        print(f"    - {path}")
+    if summary["card_updated"]:
+        print("    Dropped stale dataset_info from README.md")
+
+
+async def fetch_author_info_thumbnail(paper_id, thumbnail_url, session, semaphore, cache=None, client=None):
     """Fetches author information using the HF thumbnail image with exponential backoff."""
     async with semaphore:
         backoff = INITIAL_BACKOFF
@@ -76,7 +115,7 @@ async def fetch_author_info_thumbnail(paper_id, thumbnail_url, session, semaphor
                         )
                     image_bytes = await resp.read()
 
-                author_info = await extract_author_info_from_thumbnail(image_bytes)
+                author_info = await extract_author_info_from_thumbnail(image_bytes, cache, client)
                 return paper_id, [
                     {
                         "name": a.name,
@@ -105,20 +144,19 @@ def _count_with_author_info(df):
     """Returns the number of rows that have non-empty author_info."""
     if "author_info" not in df.columns:
         return 0
-    return df["author_info"].apply(
-        lambda x: isinstance(x, list) and len(x) > 0
-    ).sum()
+    return int(has_author_info(df["author_info"]).sum())
+
 
+async def fill_author_info(df, days, cache=None):
+    """Fills author_info for recent papers that are missing it. Returns (df, num_filled).
 
-async def fill_author_info(df, days):
-    """Fills author_info for recent papers that are missing it. Returns (df, num_filled)."""
+    With an ExtractionCache, thumbnails extracted by an earlier run are not re-sent.
+    """
     cutoff = (datetime.today() - timedelta(days=days)).strftime("%Y-%m-%d")
 
     # Find recent papers with missing author_info
     recent = df[df["date"] >= cutoff].copy()
-    missing_mask = recent["author_info"].isna() | recent["author_info"].apply(
-        lambda x: not isinstance(x, list) or len(x) == 0
-    )
+    missing_mask = ~has_author_info(recent["author_info"])
     needs_info = recent[missing_mask]
 
     # Filter to papers with valid thumbnail URLs
@@ -137,25 +175,19 @@ async def fill_author_info(df, days):
 
     semaphore = asyncio.Semaphore(THUMBNAIL_CONCURRENCY)
     items = list(zip(to_process["paper_id"], to_process["thumbnail"]))
-    num_filled = 0
 
-    async with aiohttp.ClientSession() as session:
+    client = ExtractionClient(THUMBNAIL_CONCURRENCY)
+    async with create_session(THUMBNAIL_CONCURRENCY) as session, client:
         tasks = [
-            fetch_author_info_thumbnail(pid, url, session, semaphore)
+            fetch_author_info_thumbnail(pid, url, session, semaphore, cache, client)
             for pid, url in items
         ]
         results = await tqdm.gather(*tasks, desc="  Extracting")
 
-        for paper_id, author_info in results:
-            if author_info:
-                idxs = df.index[df["paper_id"] == paper_id]
-                for idx in idxs:
-                    df.at[idx, "author_info"] = author_info
-                num_filled += 1
+    author_info_map = {paper_id: author_info for paper_id, author_info in results if author_info}
+    num_filled, _ = bulk_update_by_paper_id(df, author_info_map, "author_info")
 
-    filled = df[df["date"] >= cutoff]["author_info"].apply(
-        lambda x: isinstance(x, list) and len(x) > 0
-    ).sum()
+    filled = has_author_info(df[df["date"] >= cutoff]["author_info"]).sum()
     total_recent = len(df[df["date"] >= cutoff])
     print(f"Author info coverage for last {days} days: {filled}/{total_recent}")
 
@@ -163,36 +195,71 @@ async def fill_author_info(df, days):
 
 
 async def main(args):
-    hf_token = os.environ["HUGGINGFACE_HUB_TOKEN"]
+    # The local --hub_dir stand-in needs no Hub credentials
+    hf_token = None if args.hub_dir else os.environ["HUGGINGFACE_HUB_TOKEN"]
 
     end_date = datetime.today().strftime("%Y-%m-%d")
     start_date = FIRST_DATE
 
+    scrape_mode = "Full" if args.full_rescrape else "Incremental"
+
     print("=" * 60)
-    print("HF Daily Papers — Full Scrape + Author Info Pipeline")
+    print(f"HF Daily Papers — {scrape_mode} Scrape + Author Info Pipeline")
     print("=" * 60)
 
-    # Step 1: Full scrape from HF API
-    print(f"\n[Step 1/4] Fetching all papers from {start_date} to {end_date}...")
-    new_df = await run_scraper(start_date, end_date, output_file=None)
+    # Step 1: Scrape from HF API (incremental unless --full_rescrape)
+    print(f"\n[Step 1/4] Fetching papers from {start_date} to {end_date} "
+          f"({scrape_mode.lower()})...")
+    new_df, failed_dates = await run_scraper(
+        start_date,
+        end_date,
+        output_file=None,
+        state_file=args.state_file,
+        settle_days=args.settle_days,
+        full_refresh=args.full_rescrape,
+        cache_dir=args.http_cache_dir,
+        ledger_file=args.ledger_file,
+        save_state=False,
+    )
     new_dates = sorted(new_df["date"].unique()) if not new_df.empty else []
     print(f"  Scraped {len(new_df)} papers across {len(new_dates)} dates")
     if new_dates:
         print(f"  Date range: {new_dates[0]} to {new_dates[-1]}")
 
     # Step 2: Download existing dataset and merge (preserving author_info)
-    print(f"\n[Step 2/4] Downloading existing dataset from Hugging Face...")
-    try:
-        existing_df = download_hf_dataset(DATASET_NAME)
-        existing_size = len(existing_df)
-        existing_with_info = _count_with_author_info(existing_df)
+    print(f"\n[Step 2/4] Downloading existing dataset from "
+          f"{args.hub_dir or 'Hugging Face'}...")
+    # Only a dataset that doesn't exist yet is built from a fresh scrape. Any other
+    # error loading it propagates and aborts the run: uploading a fresh scrape over
+    # the existing dataset would drop all author_info older than --author_info_days.
+    if args.hub_dir:
+        existing_df = LocalHubRepo(args.hub_dir).load_papers()
+    else:
+        try:
+            existing_df = download_hf_dataset(DATASET_NAME)
+        except DatasetNotFoundError:
+            existing_df = pd.DataFrame()
+    existing_size = len(existing_df)
+    existing_with_info = _count_with_author_info(existing_df)
+    if existing_size:
         print(f"  Existing dataset: {existing_size} papers, "
               f"{existing_with_info} with author_info")
-    except Exception as e:
-        print(f"  Could not fetch existing dataset ({e}), using fresh scrape only.")
-        existing_df = pd.DataFrame()
-        existing_size = 0
-        existing_with_info = 0
+    else:
+        print("  No existing dataset found, using fresh scrape only.")
+        if not args.full_rescrape:
+            # An incremental scrape only covers unsettled dates; without the
+            # existing dataset to merge into, we need the full history.
+            print("  Falling back to a full re-scrape...")
+            new_df, failed_dates = await run_scraper(
+                start_date,
+                end_date,
+                output_file=None,
+                state_file=args.state_file,
+                full_refresh=True,
+                cache_dir=args.http_cache_dir,
+                ledger_file=args.ledger_file,
+                save_state=False,
+            )
 
     print(f"\n[Step 3/4] Merging datasets (preserving existing author_info)...")
     merged_df = merge_datasets(existing_df, new_df)
@@ -207,9 +274,12 @@ async def main(args):
     if not args.skip_author_info:
         print(f"\n[Step 4/4] Filling author info for recent papers "
               f"(last {args.author_info_days} days)...")
+        cache = ExtractionCache(args.extraction_cache_dir) if args.extraction_cache_dir else None
         merged_df, num_newly_filled = await fill_author_info(
-            merged_df, args.author_info_days
+            merged_df, args.author_info_days, cache
         )
+        if cache is not None:
+            print(f"  Extraction cache: {cache.hits} hits, {cache.misses} misses")
     else:
         print(f"\n[Step 4/4] Skipping author info extraction (--skip_author_info)")
 
@@ -220,6 +290,8 @@ async def main(args):
     print("=" * 60)
     print(f"  Existing dataset size:  {existing_size} papers")
     print(f"  Fresh scrape size:      {len(new_df)} papers")
+    print(f"  Failed dates:           {len(failed_dates)}"
+          + (f" (see {args.ledger_file})" if failed_dates else ""))
     print(f"  Final dataset size:     {len(merged_df)} papers "
           f"({'+' if new_papers >= 0 else ''}{new_papers} net new)")
     print(f"  Author info before:     {existing_with_info}")
@@ -231,12 +303,28 @@ async def main(args):
     # Save / Upload
     if args.output:
         print(f"\nSaving to {args.output}...")
-        merged_df.to_json(args.output, orient="records", lines=True)
+        write_papers(merged_df, args.output)
         print(f"Saved {len(merged_df)} papers to {args.output}")
     if args.upload:
-        print("\nUploading to Hugging Face Hub...")
-        upload_to_hf(merged_df, DATASET_NAME, hf_token)
+        if args.hub_dir:
+            print(f"\nSyncing changed shards to {args.hub_dir}...")
+            upload_changed_shards(merged_df, LocalHubRepo(args.hub_dir))
+        elif args.upload_mode == "sharded":
+            print("\nUploading changed shards to Hugging Face Hub...")
+            upload_changed_shards(merged_df, HfHubRepo(DATASET_NAME, hf_token))
+        else:
+            print("\nUploading to Hugging Face Hub...")
+            upload_to_hf(merged_df, DATASET_NAME, hf_token)
         print("Dataset successfully updated!")
+    if args.output or args.upload:
+        # Only now are the scraped dates safely stored; a failed save/upload above
+        # leaves the state as it was, so the next run fetches them again.
+        commit_scrape_state(args.state_file)
+    if args.feature_store:
+        print(f"\nUpdating feature store in {args.feature_store}...")
+        summary = update_feature_store(merged_df, args.feature_store)
+        print(f"  Recomputed {summary['changed']} papers, dropped {summary['removed']}, "
+              f"re-aggregated {summary['authors_updated']} authors")
     if not args.output and not args.upload:
         print("\nDry run — not saving. Use --output or --upload.")
 
@@ -252,6 +340,19 @@ if __name__ == "__main__":
         action="store_true",
         help="Upload merged dataset to HF Hub.",
     )
+    parser.add_argument(
+        "--upload_mode",
+        choices=["full", "sharded"],
+        default="full",
+        help="full re-pushes the whole dataset; sharded uploads only the monthly "
+        "Parquet shards that changed since the last run (default: full).",
+    )
+    parser.add_argument(
+        "--hub_dir",
+        type=str,
+        help="Local directory standing in for the Hub repo: the existing dataset is "
+        "read from it and --upload syncs changed shards into it.",
+    )
     parser.add_argument(
         "--author_info_days",
         type=int,
@@ -266,7 +367,50 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output",
         type=str,
-        help="Save merged dataset to a local JSONL file.",
+        help="Save merged dataset locally (.jsonl, .json or month-partitioned .parquet).",
+    )
+    parser.add_argument(
+        "--feature_store",
+        type=str,
+        help="Directory of precomputed paper/author feature tables to bring up to date "
+        "with the merged dataset (only new or changed papers are recomputed).",
+    )
+    parser.add_argument(
+        "--full_rescrape",
+        action="store_true",
+        help="Re-scrape every date since FIRST_DATE instead of only unsettled dates.",
+    )
+    parser.add_argument(
+        "--state_file",
+        type=str,
+        default=DEFAULT_STATE_FILE,
+        help=f"Per-date scrape state for incremental runs (default: {DEFAULT_STATE_FILE}).",
+    )
+    parser.add_argument(
+        "--settle_days",
+        type=int,
+        default=DEFAULT_SETTLE_DAYS,
+        help="Dates are re-fetched until they have been scraped this many days after "
+        f"they were posted (default: {DEFAULT_SETTLE_DAYS}).",
+    )
+    parser.add_argument(
+        "--http_cache_dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"On-disk cache for conditional API requests (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--extraction_cache_dir",
+        type=str,
+        default=DEFAULT_EXTRACTION_CACHE_DIR,
+        help="Cache of author info extractions keyed by thumbnail content; pass an "
+        f"empty string to disable (default: {DEFAULT_EXTRACTION_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--ledger_file",
+        type=str,
+        default=DEFAULT_LEDGER_FILE,
+        help=f"Where to record dates that failed every retry (default: {DEFAULT_LEDGER_FILE}).",
     )
 
     args = parser.parse_args()
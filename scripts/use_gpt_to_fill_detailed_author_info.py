@@ -1,6 +1,10 @@
 """Fills in detailed author info (name, affiliation, email) by sending each paper's
 thumbnail (default) or PDF first page to GPT-5.4 for extraction.
 
+Downloads and extractions run as a pipeline; each result is appended to a side log
+as it arrives and merged into the dataset periodically, so an interrupted run loses
+at most a few results and resumes from the log.
+
 Usage:
     # Thumbnail mode (default — faster, no arxiv rate limits):
     poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input data/hf_daily_papers.jsonl
@@ -8,25 +12,52 @@ Usage:
     # PDF mode (higher quality, slower due to arxiv rate limits):
     poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input data/hf_daily_papers.jsonl --source pdf
 
-    # From the HuggingFace dataset (pushes to hub after each batch):
+    # PDF mode, also writing per-PDF download/split CPU/memory stats:
+    poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input data/hf_daily_papers.jsonl --source pdf --pdf_stats /tmp/pdf_stats.jsonl
+
+    # Batch API mode (thumbnail only; submits, polls until done and ingests the results):
+    poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input data/hf_daily_papers.jsonl --batch
+
+    # Batch mode against the offline LocalBatchClient stand-in (placeholder authors):
+    poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input /tmp/papers.jsonl --batch --local_batch_dir /tmp/fake_openai
+
+    # Offline, against the fake chat completions server (placeholder authors):
+    python -m hf_daily_papers_analytics.fake_openai_server --port 8001 &
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=test poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --input /tmp/papers.jsonl
+
+    # From the HuggingFace dataset (pushes to hub at each periodic merge):
     poetry run python scripts/use_gpt_to_fill_detailed_author_info.py --hf_dataset justinxzhao/hf_daily_papers
 """
 
 import argparse
 import asyncio
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-import aiohttp
 import pandas as pd
 from datasets import Dataset, load_dataset
 from dotenv import load_dotenv
+from openai import OpenAI
 from tqdm.asyncio import tqdm
 
+from hf_daily_papers_analytics.batch_extraction import (
+    DEFAULT_BATCH_DIR,
+    DEFAULT_POLL_INTERVAL,
+    LocalBatchClient,
+    run_batch_extraction,
+)
+from hf_daily_papers_analytics.extraction_cache import DEFAULT_EXTRACTION_CACHE_DIR, ExtractionCache
+from hf_daily_papers_analytics.extraction_client import ExtractionClient
 from hf_daily_papers_analytics.hf_papers_scraper import (
     extract_author_info_from_pdf,
     extract_author_info_from_thumbnail,
-    get_pdf_bytes,
 )
+from hf_daily_papers_analytics.jsonl_writer import DurableJsonlLog
+from hf_daily_papers_analytics.pdf_preprocessing import preprocess_pdf, summarize_pdf_stats
+from hf_daily_papers_analytics.sessions import TOTAL_TIMEOUT, create_session
+from hf_daily_papers_analytics.storage import read_papers, write_papers
+from hf_daily_papers_analytics.utils import bulk_update_by_paper_id, has_author_info
 
 load_dotenv()
 
@@ -34,11 +65,15 @@ load_dotenv()
 # See: https://info.arxiv.org/help/api/tou.html
 ARXIV_DELAY_SECONDS = 3
 
-BATCH_SIZE = 10
+# Results are fsync'd to the side log every SYNC_EVERY papers and merged into the
+# dataset (rewriting it) every MERGE_EVERY papers
+SYNC_EVERY = 10
+MERGE_EVERY = 500
 
 # Concurrency limits by source type
 PDF_CONCURRENCY = 3  # Limited by arxiv rate limits
 THUMBNAIL_CONCURRENCY = 20  # Only limited by OpenAI rate limits
+EXTRACTION_CONCURRENCY = 20  # Concurrent LLM calls, whichever the source
 
 # Exponential backoff settings for retryable errors (rate limits, 5xx, timeouts)
 MAX_RETRIES = 5
@@ -56,103 +91,68 @@ def _is_retryable_error(e: Exception) -> bool:
     )
 
 
-async def fetch_author_info_thumbnail(paper_id, thumbnail_url, session, semaphore):
-    """Fetches author information using the HF thumbnail image."""
-    async with semaphore:
-        backoff = INITIAL_BACKOFF
-        for attempt in range(MAX_RETRIES):
-            try:
-                async with session.get(thumbnail_url) as resp:
-                    if resp.status != 200:
-                        raise ValueError(
-                            f"Failed to fetch thumbnail from {thumbnail_url}, "
-                            f"status code: {resp.status}"
-                        )
-                    image_bytes = await resp.read()
-
-                author_info = await extract_author_info_from_thumbnail(image_bytes)
-                return paper_id, [
-                    {
-                        "name": author.name,
-                        "affiliation": author.affiliation,
-                        "email": author.email,
-                    }
-                    for author in author_info
-                ]
-            except Exception as e:
-                retryable = _is_retryable_error(e)
-                print(
-                    f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {paper_id} "
-                    f"(thumbnail): {e}"
-                )
-                if attempt < MAX_RETRIES - 1:
-                    wait = min(backoff, MAX_BACKOFF)
-                    if retryable:
-                        print(f"  Retryable error — backing off {wait:.1f}s")
-                    await asyncio.sleep(wait)
-                    backoff *= BACKOFF_FACTOR
-                else:
-                    print(f"All retries failed for {paper_id} (thumbnail).")
-                    return paper_id, []
-
-
-async def fetch_author_info_pdf(paper_id, pdf_link, session, semaphore):
-    """Fetches author information using the arxiv PDF first page."""
-    async with semaphore:
-        backoff = INITIAL_BACKOFF
-        for attempt in range(MAX_RETRIES):
-            try:
-                await asyncio.sleep(ARXIV_DELAY_SECONDS)
-
-                pdf_bytes = await get_pdf_bytes(pdf_link, session)
-                author_info = await extract_author_info_from_pdf(pdf_bytes)
-
-                return paper_id, [
-                    {
-                        "name": author.name,
-                        "affiliation": author.affiliation,
-                        "email": author.email,
-                    }
-                    for author in author_info
-                ]
-            except Exception as e:
-                retryable = _is_retryable_error(e)
-                print(
-                    f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {paper_id} "
-                    f"(pdf): {e}"
-                )
-                if attempt < MAX_RETRIES - 1:
-                    wait = min(backoff, MAX_BACKOFF)
-                    if retryable:
-                        print(f"  Retryable error — backing off {wait:.1f}s")
-                    await asyncio.sleep(wait)
-                    backoff *= BACKOFF_FACTOR
-                else:
-                    print(f"All retries failed for {paper_id} (pdf).")
-                    return paper_id, []
+async def with_retries(make_call, description):
+    """Awaits make_call() with exponential backoff. Returns None once all retries fail."""
+    backoff = INITIAL_BACKOFF
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await make_call()
+        except Exception as e:
+            retryable = _is_retryable_error(e)
+            print(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {description}: {e}")
+            if attempt < MAX_RETRIES - 1:
+                wait = min(backoff, MAX_BACKOFF)
+                if retryable:
+                    print(f"  Retryable error — backing off {wait:.1f}s")
+                await asyncio.sleep(wait)
+                backoff *= BACKOFF_FACTOR
+            else:
+                print(f"All retries failed for {description}.")
+                return None
+
+
+async def download_thumbnail(thumbnail_url, session):
+    """Downloads a thumbnail image from the HF CDN."""
+    async with session.get(thumbnail_url) as resp:
+        if resp.status != 200:
+            raise ValueError(
+                f"Failed to fetch thumbnail from {thumbnail_url}, "
+                f"status code: {resp.status}"
+            )
+        return await resp.read()
+
+
+async def download_pdf(pdf_link, session, executor=None):
+    """Streams an arxiv PDF and splits off its first page in executor.
+
+    Pauses first to respect arxiv's rate limit. Returns the one-page PDF and its
+    preprocessing stats (bytes read, split CPU time, worker memory).
+    """
+    await asyncio.sleep(ARXIV_DELAY_SECONDS)
+    return await preprocess_pdf(pdf_link, session, executor)
+
+
+async def extract_author_info_from_first_page(first_page_bytes, cache=None, client=None):
+    return await extract_author_info_from_pdf(first_page_bytes, cache, client, is_first_page=True)
 
 
 def update_df_with_author_info(df, author_info_map):
     """Applies newly extracted author_info to the DataFrame without touching existing values.
 
+    Empty extractions are skipped, as are papers that already have author_info.
     Returns number of papers updated.
     """
-    new_updates = 0
-    for paper_id, author_info in author_info_map.items():
-        if not author_info:
-            continue
-        idxs = df.index[df["paper_id"] == paper_id]
-        for idx in idxs:
-            df.at[idx, "author_info"] = author_info
-        if len(idxs) > 0:
-            new_updates += 1
-    return new_updates
+    author_info_map = {paper_id: info for paper_id, info in author_info_map.items() if info}
+    updated, not_found = bulk_update_by_paper_id(df, author_info_map, "author_info", skip_filled=True)
+    if not_found:
+        print(f"Warning: {not_found} extracted papers are not in the dataset.")
+    return updated
 
 
 def save_checkpoint(df, output_path=None, hf_dataset_name=None):
     """Saves progress either to a local file or pushes to HuggingFace Hub."""
     if output_path:
-        df.to_json(output_path, orient="records", lines=True)
+        write_papers(df, output_path)
         print(f"Saved to {output_path}")
     elif hf_dataset_name:
         hf_dataset = Dataset.from_pandas(df)
@@ -163,68 +163,186 @@ def save_checkpoint(df, output_path=None, hf_dataset_name=None):
         print(f"Pushed to {hf_dataset_name}")
 
 
-async def process_batch(batch_items, session, source, semaphore):
-    """Processes a batch of papers and returns the results."""
-    if source == "thumbnail":
-        tasks = [
-            fetch_author_info_thumbnail(paper_id, url, session, semaphore)
-            for paper_id, url in batch_items
-        ]
-    else:
-        tasks = [
-            fetch_author_info_pdf(paper_id, url, session, semaphore)
-            for paper_id, url in batch_items
-        ]
-    results = await tqdm.gather(*tasks, desc="Processing batch")
-    return {paper_id: author_info for paper_id, author_info in results}
-
-
-async def run(paper_url_map, df, source, output_path=None, hf_dataset_name=None):
-    """Processes papers, saving checkpoints after each batch.
-
-    Thumbnail mode processes all papers at once (concurrency managed by semaphore).
-    PDF mode uses batches of BATCH_SIZE to checkpoint between arxiv rate-limited fetches.
+async def run(
+    paper_url_map,
+    df,
+    source,
+    side_log_path,
+    output_path=None,
+    hf_dataset_name=None,
+    cache=None,
+    merge_every=MERGE_EVERY,
+    pdf_stats_path=None,
+    resumed=0,
+):
+    """Extracts author info with a download -> extraction -> sink pipeline.
+
+    Download workers (PDF_CONCURRENCY for arxiv, THUMBNAIL_CONCURRENCY for the CDN)
+    feed a bounded queue of images/PDF first pages to EXTRACTION_CONCURRENCY extraction
+    workers, so downloads and LLM calls overlap and at most a few queue slots of
+    bytes are held in memory. A single sink appends each result to the side log
+    (fsync'd every SYNC_EVERY results, so a crash loses at most that many) and
+    merges into the dataset every merge_every results and at the end, saving in a
+    thread so the pipeline isn't stalled while the dataset is written or pushed. The
+    side log is removed once everything is merged and saved.
+
+    resumed is the number of papers already applied to df from the side log; they
+    are saved at the end even if this run extracts nothing new.
+
+    In PDF mode the download stage streams each PDF and splits off its first page in
+    a process pool; per-PDF stats are summarized at the end and, with
+    pdf_stats_path, written there as JSONL.
     """
     items = list(paper_url_map.items())
-    total_updated = 0
-
-    concurrency = THUMBNAIL_CONCURRENCY if source == "thumbnail" else PDF_CONCURRENCY
-    semaphore = asyncio.Semaphore(concurrency)
+    download_concurrency = THUMBNAIL_CONCURRENCY if source == "thumbnail" else PDF_CONCURRENCY
+    extract = extract_author_info_from_thumbnail if source == "thumbnail" else extract_author_info_from_first_page
+    executor = None
+    pdf_stats = []
 
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; JustinsArxivBot/1.0)"}
-    async with aiohttp.ClientSession(headers=headers) as session:
+    async def download(url, session):
         if source == "thumbnail":
-            # Process all at once — no need to batch since thumbnails are fast
-            print(f"\nProcessing {len(items)} papers (thumbnail mode)...")
-            author_info_map = await process_batch(items, session, source, semaphore)
-            total_updated = update_df_with_author_info(df, author_info_map)
-            save_checkpoint(
-                df, output_path=output_path, hf_dataset_name=hf_dataset_name
-            )
-        else:
-            # Batch for PDF mode — checkpoint between slow arxiv fetches
-            for i in range(0, len(items), BATCH_SIZE):
-                batch = items[i : i + BATCH_SIZE]
-                batch_num = i // BATCH_SIZE + 1
-                total_batches = (len(items) + BATCH_SIZE - 1) // BATCH_SIZE
-                print(
-                    f"\n--- Batch {batch_num}/{total_batches} "
-                    f"({len(batch)} papers) ---"
-                )
-
-                author_info_map = await process_batch(batch, session, source, semaphore)
-                updated = update_df_with_author_info(df, author_info_map)
-                total_updated += updated
-                print(
-                    f"Updated {updated} papers in this batch "
-                    f"({total_updated} total)."
-                )
-
-                save_checkpoint(
-                    df, output_path=output_path, hf_dataset_name=hf_dataset_name
-                )
+            return await download_thumbnail(url, session)
+        first_page_bytes, stats = await download_pdf(url, session, executor)
+        pdf_stats.append(stats)
+        return first_page_bytes
+
+    download_queue = asyncio.Queue(maxsize=2 * download_concurrency)
+    extraction_queue = asyncio.Queue(maxsize=2 * EXTRACTION_CONCURRENCY)
+    result_queue = asyncio.Queue(maxsize=2 * EXTRACTION_CONCURRENCY)
+    pending = {}
+    total_updated = 0
+    unsaved = resumed  # Resumed results are only in memory until the first save
+
+    async def merge():
+        nonlocal total_updated, unsaved
+        updated = update_df_with_author_info(df, pending)
+        total_updated += updated
+        pending.clear()
+        print(f"\nMerged {updated} papers ({total_updated} total).")
+        # Saving takes seconds to minutes (Parquet encode, Hub push); in a thread the
+        # downloads and extractions keep running meanwhile. Merges assign new columns
+        # rather than writing into df's, so a shallow copy is a stable snapshot.
+        snapshot = df.copy(deep=False)
+        await asyncio.to_thread(
+            save_checkpoint, snapshot, output_path=output_path, hf_dataset_name=hf_dataset_name
+        )
+        unsaved = 0
 
+    async def download_worker(session):
+        while True:
+            paper_id, url = await download_queue.get()
+            try:
+                content = await with_retries(lambda: download(url, session), f"{paper_id} ({source} download)")
+                await extraction_queue.put((paper_id, content))
+            finally:
+                download_queue.task_done()
+
+    async def extraction_worker(client):
+        while True:
+            paper_id, content = await extraction_queue.get()
+            try:
+                author_info = None
+                if content is not None:
+                    authors = await with_retries(
+                        lambda: extract(content, cache, client), f"{paper_id} ({source} extraction)"
+                    )
+                    if authors:
+                        author_info = [author.model_dump() for author in authors]
+                await result_queue.put((paper_id, author_info))
+            finally:
+                extraction_queue.task_done()
+
+    async def sink(side_log, progress):
+        while True:
+            paper_id, author_info = await result_queue.get()
+            try:
+                if author_info:
+                    side_log.append({"paper_id": paper_id, "author_info": author_info})
+                    pending[paper_id] = author_info
+                    if len(pending) >= merge_every:
+                        side_log.sync()
+                        await merge()
+                progress.update(1)
+            finally:
+                result_queue.task_done()
+
+    print(f"\nProcessing {len(items)} papers ({source} mode)...")
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; JustinsArxivBot/1.0)"}
+    client = ExtractionClient(EXTRACTION_CONCURRENCY)
+    # A large PDF may legitimately take longer than the default total timeout
+    total_timeout = TOTAL_TIMEOUT if source == "thumbnail" else None
+    async with create_session(download_concurrency, headers=headers, total_timeout=total_timeout) as session, client:
+        with DurableJsonlLog(side_log_path, sync_every=SYNC_EVERY) as side_log, tqdm(
+            total=len(items), desc="Extracting"
+        ) as progress:
+            async def feed_and_drain():
+                for item in items:
+                    await download_queue.put(item)
+                for queue in (download_queue, extraction_queue, result_queue):
+                    await queue.join()
+
+            workers = []
+            try:
+                if source == "pdf":
+                    executor = ProcessPoolExecutor(PDF_CONCURRENCY)
+                workers += [asyncio.create_task(download_worker(session)) for _ in range(download_concurrency)]
+                workers += [asyncio.create_task(extraction_worker(client)) for _ in range(EXTRACTION_CONCURRENCY)]
+                sink_task = asyncio.create_task(sink(side_log, progress))
+                workers.append(sink_task)
+
+                # A failed merge/save ends the sink; stop instead of waiting on its queue
+                drained = asyncio.create_task(feed_and_drain())
+                workers.append(drained)
+                await asyncio.wait([drained, sink_task], return_when=asyncio.FIRST_COMPLETED)
+                if sink_task.done():
+                    sink_task.result()
+                await drained
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                if executor is not None:
+                    executor.shutdown(cancel_futures=True)
+
+    if pending or unsaved:
+        await merge()
+    # Only reached once every logged result is saved; otherwise the log is replayed next run
+    os.remove(side_log_path)
     print(f"\nDone. Updated {total_updated} papers total.")
+    if cache is not None:
+        print(f"Extraction cache: {cache.hits} hits, {cache.misses} misses")
+    if source == "pdf":
+        print(f"PDF preprocessing: {summarize_pdf_stats(pdf_stats)}")
+        if pdf_stats_path:
+            with open(pdf_stats_path, "w") as f:
+                f.writelines(json.dumps(stats) + "\n" for stats in pdf_stats)
+            print(f"Per-PDF stats written to {pdf_stats_path}")
+
+
+def resume_from_side_log(df, side_log_path):
+    """Applies results logged by an interrupted run. Returns the number of papers updated."""
+    author_info_map = {
+        record["paper_id"]: record["author_info"]
+        for record in DurableJsonlLog.read_records(side_log_path)
+    }
+    if not author_info_map:
+        return 0
+    updated = update_df_with_author_info(df, author_info_map)
+    print(f"Resumed {updated} papers from {side_log_path}")
+    return updated
+
+
+def run_batch(paper_url_map, df, client, batch_dir, poll_interval, output_path=None, hf_dataset_name=None):
+    """Extracts author info for all papers through the Batch API, then saves once."""
+
+    def ingest(author_info_map):
+        updated = update_df_with_author_info(df, author_info_map)
+        print(f"Updated {updated} papers.")
+        save_checkpoint(df, output_path=output_path, hf_dataset_name=hf_dataset_name)
+
+    run_batch_extraction(
+        client, paper_url_map, batch_dir, poll_interval=poll_interval, on_results=ingest
+    )
 
 
 def get_papers_needing_author_info(df, source):
@@ -236,9 +354,7 @@ def get_papers_needing_author_info(df, source):
     if "author_info" not in df.columns:
         mask = pd.Series(True, index=df.index)
     else:
-        mask = df["author_info"].isna() | df["author_info"].apply(
-            lambda x: isinstance(x, list) and len(x) == 0
-        )
+        mask = ~has_author_info(df["author_info"])
 
     paper_ids = df.loc[mask, "paper_id"]
 
@@ -270,7 +386,7 @@ def main():
     data_source.add_argument(
         "--input",
         type=str,
-        help="Path to a local JSONL file (reads from and saves back to this file).",
+        help="Path to a local .jsonl/.json/.parquet dataset (reads from and saves back to it).",
     )
     data_source.add_argument(
         "--hf_dataset",
@@ -284,6 +400,57 @@ def main():
         default="thumbnail",
         help="Extraction source: 'thumbnail' (default, faster) or 'pdf' (higher quality).",
     )
+    parser.add_argument(
+        "--extraction_cache_dir",
+        type=str,
+        default=DEFAULT_EXTRACTION_CACHE_DIR,
+        help="Cache of extractions keyed by image/PDF content, so re-runs don't pay for "
+        f"work already done; pass an empty string to disable (default: {DEFAULT_EXTRACTION_CACHE_DIR}).",
+    )
+    parser.add_argument(
+        "--side_log",
+        type=str,
+        help="Append-only log of extracted results, merged into the dataset periodically "
+        "and replayed if a run is interrupted (default: <input>.author_info.jsonl, or "
+        ".cache/author_info_<dataset>.jsonl for --hf_dataset).",
+    )
+    parser.add_argument(
+        "--merge_every",
+        type=int,
+        default=MERGE_EVERY,
+        help=f"Merge logged results into the dataset and save it every this many papers "
+        f"(default: {MERGE_EVERY}).",
+    )
+    parser.add_argument(
+        "--pdf_stats",
+        type=str,
+        help="PDF mode: write per-PDF preprocessing stats (bytes read, split CPU time, "
+        "worker memory) to this JSONL file.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Use the OpenAI Batch API instead of one request per paper (thumbnail only).",
+    )
+    parser.add_argument(
+        "--batch_dir",
+        type=str,
+        default=DEFAULT_BATCH_DIR,
+        help="Where batch request files and submitted batch ids are kept; a run "
+        f"interrupted while polling resumes from here (default: {DEFAULT_BATCH_DIR}).",
+    )
+    parser.add_argument(
+        "--poll_interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help=f"Seconds between batch status checks (default: {DEFAULT_POLL_INTERVAL:.0f}).",
+    )
+    parser.add_argument(
+        "--local_batch_dir",
+        type=str,
+        help="Run batches against an offline LocalBatchClient in this directory instead "
+        "of the OpenAI API. For testing: it answers with placeholder authors.",
+    )
     parser.add_argument(
         "--yes",
         "-y",
@@ -291,30 +458,50 @@ def main():
         help="Skip confirmation prompt.",
     )
     args = parser.parse_args()
+    if args.batch and args.source != "thumbnail":
+        parser.error("--batch only supports --source thumbnail")
 
     # Load data
     if args.input:
-        df = pd.read_json(args.input, lines=True)
+        df = read_papers(args.input)
         output_path = args.input
         hf_dataset_name = None
     else:
-        dataset = load_dataset(args.hf_dataset)
+        dataset = load_dataset(args.hf_dataset, verification_mode="no_checks")
         df = pd.DataFrame(dataset["train"])
         output_path = None
         hf_dataset_name = args.hf_dataset
 
+    # An all-null author_info column loads as float64, which can't hold lists
+    if "author_info" not in df.columns or df["author_info"].isna().all():
+        df["author_info"] = pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    side_log_path = args.side_log or (
+        f"{args.input}.author_info.jsonl"
+        if args.input
+        else os.path.join(".cache", f"author_info_{args.hf_dataset.replace('/', '_')}.jsonl")
+    )
+    resumed = 0 if args.batch else resume_from_side_log(df, side_log_path)
+
     paper_url_map = get_papers_needing_author_info(df, args.source)
 
     num_papers = len(paper_url_map)
     print(f"Source: {args.source}")
     print(f"Number of papers to process: {num_papers}")
-    if args.source == "thumbnail":
-        print(f"Concurrency: {THUMBNAIL_CONCURRENCY} (thumbnail mode, all at once)")
+    if args.batch:
+        print(f"Batch API mode (batch files and state in {args.batch_dir})")
     else:
-        print(f"Concurrency: {PDF_CONCURRENCY} (PDF mode, arxiv rate limited)")
-        print(f"Will checkpoint every {BATCH_SIZE} papers.")
+        if args.source == "thumbnail":
+            print(f"Download concurrency: {THUMBNAIL_CONCURRENCY} (thumbnail mode)")
+        else:
+            print(f"Download concurrency: {PDF_CONCURRENCY} (PDF mode, arxiv rate limited)")
+        print(f"Extraction concurrency: {EXTRACTION_CONCURRENCY}")
+        print(f"Results are logged to {side_log_path} and merged every {args.merge_every} papers.")
 
     if num_papers == 0:
+        if resumed:
+            save_checkpoint(df, output_path=output_path, hf_dataset_name=hf_dataset_name)
+            os.remove(side_log_path)
         print("No papers left to process. Exiting.")
         return
 
@@ -326,13 +513,31 @@ def main():
             print("Operation cancelled by the user.")
             return
 
+    if args.batch:
+        client = LocalBatchClient(args.local_batch_dir) if args.local_batch_dir else OpenAI()
+        run_batch(
+            paper_url_map,
+            df,
+            client,
+            args.batch_dir,
+            args.poll_interval,
+            output_path=output_path,
+            hf_dataset_name=hf_dataset_name,
+        )
+        return
+
     asyncio.run(
         run(
             paper_url_map,
             df,
             args.source,
+            side_log_path,
             output_path=output_path,
             hf_dataset_name=hf_dataset_name,
+            cache=ExtractionCache(args.extraction_cache_dir) if args.extraction_cache_dir else None,
+            merge_every=args.merge_every,
+            pdf_stats_path=args.pdf_stats,
+            resumed=resumed,
         )
     )
 
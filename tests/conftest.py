@@ -0,0 +1,18 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ANALYZE_PATH = Path(__file__).parent.parent / "visualizations" / "analyze.py"
+
+
+@pytest.fixture(scope="module")
+def analyze():
+    """visualizations/analyze.py, which is a script rather than part of the package."""
+    spec = importlib.util.spec_from_file_location("analyze", ANALYZE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["analyze"] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules["analyze"]
@@ -0,0 +1,40 @@
+import pytest
+
+from hf_daily_papers_analytics import storage
+
+
+def fingerprints(analyze) -> dict[str, str]:
+    return {group: analyze.code_fingerprint(fn) for group, (fn, _, _) in analyze.PLOT_GROUPS.items()}
+
+
+def test_fingerprints_are_stable(analyze):
+    assert fingerprints(analyze) == fingerprints(analyze)
+
+
+def test_keyword_edit_invalidates_affiliation_groups(analyze, monkeypatch):
+    before = fingerprints(analyze)
+    monkeypatch.setattr(
+        analyze,
+        "CHINESE_AFFILIATION_CLASSIFIER",
+        analyze.KeywordClassifier([*analyze.CHINESE_AFFILIATION_KEYWORDS, "new institute"]),
+    )
+    after = fingerprints(analyze)
+
+    changed = {group for group in before if before[group] != after[group]}
+    assert {"e", "h"} <= changed
+    assert "a" not in changed
+
+
+def test_helper_constants_resolve_in_their_own_module(analyze, monkeypatch):
+    before = analyze.code_fingerprint(storage.write_papers)
+    monkeypatch.setattr(storage, "PARTITION_COLUMN", "year_month")
+    assert analyze.code_fingerprint(storage.write_papers) != before
+
+
+def test_select_groups_validates_artifacts(analyze):
+    assert analyze.select_groups("e1, E25,b") == ["b", "e"]
+    assert analyze.select_groups(None) == sorted(analyze.PLOT_GROUPS)
+    assert analyze.artifact_numbers("b") == [1, 2, 3, 4, 5, 6]
+    for selector in ["ezz", "e27", "b7", "e0", "z1", "e1x", ""]:
+        with pytest.raises(ValueError, match="Unknown artifact"):
+            analyze.select_groups(f"a1,{selector}")
@@ -0,0 +1,137 @@
+"""The vectorized analyze.py helpers against the row-by-row code they replaced."""
+
+from collections import Counter
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+ADA = {"name": "Ada Lovelace", "affiliation": "Tsinghua University", "email": "ada@x"}
+WEI = {"name": "Wei Zhang", "affiliation": "  Google DeepMind ", "email": ""}
+LI = {"name": "Li", "affiliation": "Peking University", "email": "li@x"}
+BOB = {"name": "Bob Smith", "affiliation": "", "email": ""}
+
+
+@pytest.fixture
+def papers() -> pd.DataFrame:
+    """Papers out of date order, with missing/empty author_info and a duplicated author."""
+    return pd.DataFrame({
+        "date": pd.to_datetime([
+            "2025-03-02", "2025-03-01", "2025-03-02", "2025-03-03", "2025-03-01", "2025-03-03",
+        ]),
+        "paper_id": ["p0", "p1", "p2", "p3", "p4", "p5"],
+        "upvotes": [3, 1, 4, 1, 5, 9],
+        "author_info": [
+            [ADA, WEI],
+            None,
+            [WEI, ADA, LI, WEI],
+            [],
+            [{"name": "Bob Smith"}, LI],
+            [BOB, {**ADA, "affiliation": "tsinghua university"}, WEI],
+        ],
+    })
+
+
+def old_explode_authors(analyze, df: pd.DataFrame) -> pd.DataFrame:
+    rows = []
+    for _, paper in df.iterrows():
+        info = paper["author_info"]
+        if not isinstance(info, list):
+            continue
+        for i, author in enumerate(info):
+            rows.append({
+                "date": paper["date"],
+                "paper_id": paper["paper_id"],
+                "upvotes": paper["upvotes"],
+                "author_name": author.get("name", ""),
+                "affiliation": author.get("affiliation", ""),
+                "email": author.get("email", ""),
+                "is_first_author": i == 0,
+                "is_last_author": i == len(info) - 1,
+                "is_chinese_name": analyze.is_chinese_name(author.get("name", "")),
+                "is_chinese_affiliation": analyze.is_chinese_affiliation(author.get("affiliation", "")),
+            })
+    return pd.DataFrame(rows)
+
+
+def test_explode_authors_matches_iterrows(analyze, papers):
+    expected = old_explode_authors(analyze, papers)
+    author_df = analyze.explode_authors(papers)[analyze.AUTHOR_COLUMNS]
+    pd.testing.assert_frame_equal(author_df.reset_index(drop=True), expected, check_dtype=False)
+
+
+AFFILIATIONS = [
+    "Tsinghua University", "TSINGHUA", "Google DeepMind", "", "CAS Key Lab", "Chinese Academy of Sciences",
+    "Xi'an Jiaotong", "UC Berkeley", "Alibaba Group (US)", "Peking University", "jd.com", "JDxcom",
+]
+
+
+def test_keyword_classifier_matches_any_substring(analyze):
+    def old_is_chinese_affiliation(affiliation):
+        if not affiliation:
+            return False
+        aff_lower = affiliation.lower()
+        return any(kw in aff_lower for kw in analyze.CHINESE_AFFILIATION_KEYWORDS)
+
+    expected = [old_is_chinese_affiliation(aff) for aff in AFFILIATIONS]
+    classifier = analyze.KeywordClassifier(analyze.CHINESE_AFFILIATION_KEYWORDS)
+
+    assert [classifier(aff) for aff in AFFILIATIONS] == expected
+    # Repeated and missing values through the vectorized path
+    texts = pd.Series(AFFILIATIONS + AFFILIATIONS[::-1] + [None])
+    assert classifier.mask(texts).tolist() == expected + expected[::-1] + [False]
+    assert [classifier(aff) for aff in AFFILIATIONS] == expected  # From the memo
+
+
+def test_classify_papers_matches_per_paper_classification(analyze, papers):
+    info = papers["author_info"]
+    expected = pd.DataFrame({
+        "origin_by_name": info.apply(analyze.classify_paper_origin),
+        "origin_by_aff": info.apply(analyze.classify_paper_origin, by_affiliation=True),
+        "first_author_origin": info.apply(analyze.classify_first_last, position="first"),
+        "last_author_origin": info.apply(analyze.classify_first_last, position="last"),
+        "first_author_aff_origin": info.apply(analyze.classify_first_last, position="first", by_affiliation=True),
+        "last_author_aff_origin": info.apply(analyze.classify_first_last, position="last", by_affiliation=True),
+    })
+
+    pd.testing.assert_frame_equal(analyze.classify_papers(papers), expected)
+
+
+def test_classification_table_flags_each_row(analyze):
+    names = pd.Series(["Wei Zhang", "Ada Lovelace", None, "Wei Zhang"])
+    affiliations = pd.Series(["Google", None, "Fudan University", "Google"])
+    table = analyze.ClassificationTable(names, affiliations)
+
+    assert table.is_chinese_name().tolist() == [True, False, False, True]
+    assert table.is_chinese_affiliation().tolist() == [False, False, True, False]
+
+
+def old_cumulative_growth(df: pd.DataFrame) -> pd.DataFrame:
+    """plot_group_b's running counts after each paper, as they were computed per row."""
+    seen_authors, seen_affs, author_pairs, inst_pairs = set(), set(), Counter(), Counter()
+    rows = []
+    for _, row in df.sort_values("date").iterrows():
+        info = row["author_info"] if isinstance(row["author_info"], list) else []
+        seen_authors.update(a.get("name", "") for a in info)
+        seen_affs.update(a.get("affiliation", "").strip().lower() for a in info if a.get("affiliation", "").strip())
+        if len(info) >= 2:
+            author_pairs.update(combinations(sorted(a.get("name", "") for a in info), 2))
+            affs = sorted({a.get("affiliation", "").strip().lower() for a in info if a.get("affiliation", "").strip()})
+            inst_pairs.update(combinations(affs, 2))
+        rows.append({
+            "date": row["date"],
+            "authors": len(seen_authors),
+            "affiliations": len(seen_affs),
+            "author_pairs": len(author_pairs),
+            "repeat_author_pairs": sum(count > 1 for count in author_pairs.values()),
+            "institution_pairs": len(inst_pairs),
+            "repeat_institution_pairs": sum(count > 1 for count in inst_pairs.values()),
+        })
+    # The plots only use the value at the end of each date
+    return pd.DataFrame(rows).groupby("date").last()
+
+
+def test_cumulative_growth_matches_per_row_counts(analyze, papers):
+    expected = old_cumulative_growth(papers)
+    growth = analyze.cumulative_growth(papers)
+    pd.testing.assert_frame_equal(growth, expected[analyze.CUMULATIVE_METRICS], check_dtype=False)
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from hf_daily_papers_analytics.feature_store import paper_features
+
+ADA = {"name": "Ada Lovelace", "affiliation": "Tsinghua University", "email": ""}
+WEI = {"name": "Wei Zhang", "affiliation": "Google", "email": ""}
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    papers = pd.DataFrame({
+        "date": pd.to_datetime(["2025-03-02", "2025-03-01", "2025-03-02"]),
+        "paper_id": ["p0", "p1", "p2"],
+        "title": ["A title", "Another one", "T"],
+        "summary": ["Words words", "", "More words here"],
+        "authors": [["Ada", "Wei"], ["Wei"], []],
+        "upvotes": [3, 1, 4],
+        "author_info": [[ADA, WEI], None, [WEI, ADA, WEI]],
+    })
+    return pd.concat([papers, paper_features(papers)], axis=1)
+
+
+def test_snapshot_reads_only_the_groups_columns(analyze, df, tmp_path):
+    analyze.write_snapshot({"df": df}, str(tmp_path))
+
+    group_a = analyze.read_snapshot("df", str(tmp_path), analyze.frame_columns("a", "df"))
+    assert list(group_a.columns) == ["date", "upvotes"]
+
+    group_f = analyze.read_snapshot("df", str(tmp_path), analyze.frame_columns("f", "df"))
+    assert {"num_authors", "title_word_count", "abstract_word_count", "num_institutions"} <= set(group_f.columns)
+    assert "paper_id" not in group_f.columns
+
+
+def test_arrow_backed_snapshot_gives_the_same_results(analyze, df, tmp_path):
+    analyze.write_snapshot({"df": df}, str(tmp_path))
+    snapshot = analyze.read_snapshot("df", str(tmp_path))
+
+    assert isinstance(snapshot["author_info"].dtype, pd.ArrowDtype)
+    pd.testing.assert_frame_equal(analyze.classify_papers(snapshot), analyze.classify_papers(df))
+    pd.testing.assert_frame_equal(analyze.cumulative_growth(snapshot), analyze.cumulative_growth(df))
@@ -0,0 +1,111 @@
+import json
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+
+from hf_daily_papers_analytics import batch_extraction
+from hf_daily_papers_analytics.batch_extraction import (
+    LocalBatchClient,
+    build_batch_requests,
+    collect_batch_results,
+    load_batch_state,
+    placeholder_response,
+    run_batch_extraction,
+    write_batch_files,
+)
+
+PAPER_URLS = {f"2503.{i:05d}": f"https://cdn/2503.{i:05d}.png" for i in range(5)}
+
+
+def authors_of(paper_id: str) -> list[dict]:
+    return [{"name": f"Author of {paper_id}", "affiliation": "", "email": ""}]
+
+
+def test_submit_and_collect(tmp_path):
+    def respond(request):
+        if request["custom_id"] == "2503.00003":
+            raise RuntimeError("model unavailable")
+        return placeholder_response(request)
+
+    client = LocalBatchClient(str(tmp_path / "openai"), respond=respond, polls_to_complete=2)
+    ingested = []
+
+    results = run_batch_extraction(
+        client, PAPER_URLS, str(tmp_path / "batches"), poll_interval=0, on_results=ingested.append
+    )
+
+    expected = {paper_id: authors_of(paper_id) for paper_id in PAPER_URLS if paper_id != "2503.00003"}
+    assert results == expected
+    assert ingested == [expected]
+    assert load_batch_state(str(tmp_path / "batches")) == {"batch_ids": [], "pending_files": []}
+
+
+def test_requests_reference_thumbnails_and_split_by_limits(tmp_path):
+    requests = build_batch_requests(PAPER_URLS)
+    assert requests[0]["custom_id"] == "2503.00000"
+    image = requests[0]["body"]["messages"][0]["content"][1]
+    assert image["image_url"]["url"] == "https://cdn/2503.00000.png"
+
+    paths = write_batch_files(requests, str(tmp_path), max_requests=2)
+    with open(paths[-1]) as f:
+        last = [json.loads(line) for line in f]
+    assert len(paths) == 3
+    assert [r["custom_id"] for r in last] == ["2503.00004"]
+
+
+def test_failed_submission_resumes_without_resubmitting(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_extraction, "write_batch_files", partial(write_batch_files, max_requests=2))
+    batch_dir = str(tmp_path / "batches")
+    client = LocalBatchClient(str(tmp_path / "openai"))
+    create_batch = client.batches.create
+    created = []
+    interruptions = [ConnectionError("upload interrupted")]
+
+    def flaky_create(**kwargs):
+        if len(created) == 1 and interruptions:
+            raise interruptions.pop()
+        batch = create_batch(**kwargs)
+        created.append(batch.id)
+        return batch
+
+    client.batches.create = flaky_create
+    with pytest.raises(ConnectionError):
+        run_batch_extraction(client, PAPER_URLS, batch_dir, poll_interval=0)
+
+    # The first batch was recorded before the second upload failed
+    state = load_batch_state(batch_dir)
+    assert state["batch_ids"] == created
+    assert len(state["pending_files"]) == 2
+
+    results = run_batch_extraction(client, PAPER_URLS, batch_dir, poll_interval=0)
+
+    assert len(created) == 3
+    assert results == {paper_id: authors_of(paper_id) for paper_id in PAPER_URLS}
+
+
+def test_failures_are_counted_once_per_paper(tmp_path):
+    client = LocalBatchClient(str(tmp_path / "openai"))
+
+    def jsonl(records):
+        return "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+
+    ok = {
+        "custom_id": "ok",
+        "response": {"status_code": 200, "body": {"choices": [{"message": {"content": placeholder_response({"custom_id": "ok"})}}]}},
+        "error": None,
+    }
+    rejected = {"custom_id": "rejected", "response": {"status_code": 400, "body": {}}, "error": None}
+    expired = {"custom_id": "expired", "response": None, "error": {"code": "batch_expired", "message": ""}}
+    batch = SimpleNamespace(
+        id="batch_1",
+        status="expired",
+        output_file_id=client._write_file(jsonl([ok, rejected])),
+        error_file_id=client._write_file(jsonl([rejected, expired])),
+        request_counts=SimpleNamespace(total=3, completed=1, failed=2),
+    )
+
+    results, num_failed = collect_batch_results(client, [batch])
+
+    assert results == {"ok": authors_of("ok")}
+    assert num_failed == 2
@@ -0,0 +1,75 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from hf_daily_papers_analytics.coauthor_graph import CoauthorGraph
+
+# Papers in date order, with a duplicate name on p3
+PAPERS = {
+    "p0": ["ann", "bob", "cat"],
+    "p1": ["bob", "cat"],
+    "p2": ["dan"],
+    "p3": ["ann", "ann", "bob", "eve"],
+    "p4": ["cat", "bob", "ann"],
+}
+
+
+def memberships(papers: dict) -> tuple[list, list]:
+    rows = [(paper, name) for paper, names in papers.items() for name in names]
+    return [paper for paper, _ in rows], [name for _, name in rows]
+
+
+def reference_milestones(papers: dict, dedupe: bool) -> dict:
+    """pair -> (first paper, second paper or None), from combinations over each paper."""
+    milestones = {}
+    for paper, names in papers.items():
+        names = sorted(set(names)) if dedupe else sorted(names)
+        for pair in combinations(names, 2):
+            first, second = milestones.get(pair, (paper, None))
+            if pair in milestones and second is None:
+                second = paper
+            milestones[pair] = (first, second)
+    return milestones
+
+
+@pytest.mark.parametrize("dedupe", [True, False])
+@pytest.mark.parametrize("block_pairs", [1, 4, 1_000_000])
+def test_pair_milestones_match_combinations(dedupe, block_pairs):
+    graph = CoauthorGraph(*memberships(PAPERS), dedupe=dedupe)
+    firsts, seconds = graph.pair_milestones(block_pairs=block_pairs)
+
+    papers = np.asarray(graph.papers)
+    expected = reference_milestones(PAPERS, dedupe)
+    assert len(firsts) == len(expected)
+    assert Counter(papers[firsts]) == Counter(first for first, _ in expected.values())
+    assert Counter(papers[seconds[seconds >= 0]]) == Counter(
+        second for _, second in expected.values() if second is not None
+    )
+
+
+def test_pair_counts_and_top_pairs():
+    graph = CoauthorGraph(*memberships(PAPERS))
+    expected = Counter(
+        pair for names in PAPERS.values() for pair in combinations(sorted(set(names)), 2)
+    )
+
+    counts = graph.pair_counts()
+    members = np.asarray(graph.members)
+    observed = {
+        (members[row.member_1], members[row.member_2]): row.num_papers
+        for row in counts.itertuples()
+    }
+    assert observed == dict(expected)
+    assert graph.num_repeat_pairs() == sum(count >= 2 for count in expected.values())
+
+    top = graph.top_pairs(k=2)
+    assert top.values.tolist() == [["ann", "bob", 3], ["bob", "cat", 3]]
+
+
+def test_graph_without_pairs():
+    graph = CoauthorGraph(["p0", "p1"], ["ann", "bob"])
+    firsts, seconds = graph.pair_milestones()
+    assert len(firsts) == len(seconds) == 0
+    assert graph.pair_counts().empty
@@ -0,0 +1,108 @@
+import pandas as pd
+import pytest
+
+from hf_daily_papers_analytics.feature_store import (
+    FEATURE_TABLES,
+    author_paper_table,
+    load_features,
+    paper_features,
+    per_author_table,
+    update_feature_store,
+)
+from hf_daily_papers_analytics.storage import write_papers
+
+ADA = {"name": "Ada Lovelace", "affiliation": "Tsinghua University", "email": "ada@x"}
+WEI = {"name": "Wei Zhang", "affiliation": "Google", "email": ""}
+LI = {"name": "Li", "affiliation": "Peking University", "email": "li@x"}
+
+
+def papers(ids: list[str]) -> pd.DataFrame:
+    """Papers 2503.000<i> for each i in ids, newest first."""
+    authors = {"1": [ADA, WEI], "2": None, "3": [WEI, LI], "4": [{"name": "Bob"}, ADA]}
+    return pd.DataFrame({
+        "date": [f"2025-03-0{i}" for i in ids],
+        "paper_id": [f"2503.000{i}" for i in ids],
+        "title": [f"Paper {i}" for i in ids],
+        "summary": ["Some words here" for _ in ids],
+        "authors": [[a["name"] for a in authors[i] or []] for i in ids],
+        "upvotes": [int(i) * 2 for i in ids],
+        "author_info": [authors[i] for i in ids],
+    })
+
+
+def read_store(store_dir) -> dict[str, pd.DataFrame]:
+    return {table: load_features(str(store_dir), table) for table in FEATURE_TABLES}
+
+
+def test_incremental_update_equals_full_rebuild(tmp_path):
+    store = tmp_path / "incremental"
+    assert update_feature_store(papers(["3", "2", "1"]), str(store))["changed"] == 3
+
+    # Paper 1 gains an author, 2 is gone and 4 is new; 3 is untouched
+    current = papers(["4", "3", "1"])
+    current.at[2, "author_info"] = [ADA, WEI, LI]
+    summary = update_feature_store(current, str(store))
+    assert summary == {"changed": 2, "removed": 1, "authors_updated": 4}
+    assert update_feature_store(current, str(store))["changed"] == 0
+
+    update_feature_store(current, str(tmp_path / "full"))
+    rebuilt = read_store(tmp_path / "full")
+    for table, incremental in read_store(store).items():
+        pd.testing.assert_frame_equal(incremental, rebuilt[table], check_dtype=False)
+
+
+def test_store_matches_the_in_memory_features(tmp_path):
+    df = papers(["4", "3", "2", "1"])
+    update_feature_store(df, str(tmp_path))
+
+    stored = load_features(str(tmp_path), "papers_features").drop(columns=["date", "paper_id", "row_hash"])
+    pd.testing.assert_frame_equal(stored, paper_features(df), check_dtype=False)
+    per_author = per_author_table(author_paper_table(df))
+    pd.testing.assert_frame_equal(load_features(str(tmp_path), "per_author"), per_author, check_dtype=False)
+
+    assert list(load_features(str(tmp_path), "per_author", columns=["author_name"]).columns) == ["author_name"]
+    with pytest.raises(ValueError, match="Unknown feature table"):
+        load_features(str(tmp_path), "papers")
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "parquet"])
+def test_load_data_refuses_a_stale_store(analyze, tmp_path, fmt):
+    path = tmp_path / f"papers.{fmt}"
+    store = str(tmp_path / "features")
+    df = papers(["3", "2", "1"])
+    write_papers(df, str(path))
+    update_feature_store(df, store)
+
+    loaded = analyze.load_data(path, columns=["date", "paper_id", "upvotes"], feature_store=store)
+    assert list(loaded.columns[:3]) == ["date", "paper_id", "upvotes"]
+    assert "title" not in loaded.columns
+    assert loaded["num_authors"].tolist() == [2, 0, 2]
+
+    # The dataset changed after the store was last updated
+    df.at[0, "title"] = "A longer title now"
+    write_papers(df, str(path))
+    with pytest.raises(ValueError, match="out of date for 1 papers"):
+        analyze.load_data(path, columns=["date", "paper_id", "upvotes"], feature_store=store)
+
+    update_feature_store(df, store)
+    loaded = analyze.load_data(path, feature_store=store)
+    assert loaded["title_word_count"].tolist() == [4, 2, 2]
+
+
+def test_group_h_uses_the_stored_per_author_table(analyze, tmp_path, monkeypatch):
+    path = tmp_path / "papers.parquet"
+    store = str(tmp_path / "features")
+    write_papers(papers(["4", "3", "2", "1"]), str(path))
+    update_feature_store(papers(["4", "3", "2", "1"]), store)
+    df = analyze.load_data(path, feature_store=store)
+    author_df = analyze.explode_authors(df, feature_store=store)
+
+    def h2_table(out_dir, per_author=None) -> str:
+        out_dir.mkdir()
+        monkeypatch.setattr(analyze, "OUT_DIR", out_dir)
+        analyze.plot_group_h(df, author_df, per_author)
+        return (out_dir / "h2_exhaustive_author_table.csv").read_text()
+
+    computed = h2_table(tmp_path / "computed")
+    monkeypatch.setattr(analyze, "per_author_table", lambda _: pytest.fail("per_author was recomputed"))
+    assert h2_table(tmp_path / "stored", load_features(store, "per_author")) == computed
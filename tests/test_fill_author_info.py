@@ -0,0 +1,97 @@
+import importlib.util
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from hf_daily_papers_analytics.storage import read_papers, write_papers
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "use_gpt_to_fill_detailed_author_info.py"
+
+ADA = [{"name": "Ada", "affiliation": "Tsinghua", "email": ""}]
+
+
+@pytest.fixture
+def fill(monkeypatch):
+    spec = importlib.util.spec_from_file_location("fill_author_info", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["fill_author_info"] = module
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "MAX_RETRIES", 1)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    yield module
+    del sys.modules["fill_author_info"]
+
+
+@pytest.fixture
+def interrupted_run(tmp_path) -> tuple[str, str]:
+    """A dataset of two papers and the side log of a run that extracted the first one."""
+    input_path = str(tmp_path / "papers.jsonl")
+    write_papers(
+        pd.DataFrame({
+            "date": ["2025-03-03", "2025-03-03"],
+            "paper_id": ["2503.00001", "2503.00002"],
+            # Nothing listens on port 1, so every new download fails
+            "thumbnail": ["http://127.0.0.1:1/a.png", "http://127.0.0.1:1/b.png"],
+            "author_info": [None, None],
+        }),
+        input_path,
+    )
+    side_log_path = str(tmp_path / "side_log.jsonl")
+    with open(side_log_path, "w") as f:
+        f.write(json.dumps({"paper_id": "2503.00001", "author_info": ADA}) + "\n")
+    return input_path, side_log_path
+
+
+def run_main(fill, monkeypatch, input_path, side_log_path):
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["fill", "--input", input_path, "--side_log", side_log_path, "--extraction_cache_dir", "", "--yes"],
+    )
+    fill.main()
+
+
+def test_resumed_results_are_saved_when_nothing_new_is_extracted(fill, monkeypatch, interrupted_run):
+    input_path, side_log_path = interrupted_run
+
+    run_main(fill, monkeypatch, input_path, side_log_path)
+
+    saved = read_papers(input_path).set_index("paper_id")["author_info"]
+    assert saved["2503.00001"] == ADA
+    assert not saved["2503.00002"]
+    assert not os.path.exists(side_log_path)
+
+
+def test_side_log_is_kept_when_save_fails(fill, monkeypatch, interrupted_run):
+    input_path, side_log_path = interrupted_run
+
+    def failing_save(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fill, "save_checkpoint", failing_save)
+    with pytest.raises(OSError):
+        run_main(fill, monkeypatch, input_path, side_log_path)
+
+    records = fill.DurableJsonlLog.read_records(side_log_path)
+    assert records == [{"paper_id": "2503.00001", "author_info": ADA}]
+
+
+def test_checkpoints_are_saved_off_the_event_loop(fill, monkeypatch, interrupted_run):
+    input_path, side_log_path = interrupted_run
+    save = fill.save_checkpoint
+    threads = []
+
+    def recording_save(df, **kwargs):
+        threads.append(threading.current_thread())
+        save(df, **kwargs)
+
+    monkeypatch.setattr(fill, "save_checkpoint", recording_save)
+    run_main(fill, monkeypatch, input_path, side_log_path)
+
+    assert threads and threading.main_thread() not in threads
+    assert read_papers(input_path).set_index("paper_id")["author_info"]["2503.00001"] == ADA
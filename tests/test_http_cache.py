@@ -0,0 +1,133 @@
+import json
+import os
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from hf_daily_papers_analytics import hf_papers_scraper
+from hf_daily_papers_analytics.hf_papers_scraper import fetch_papers_for_date
+from hf_daily_papers_analytics.http_cache import HttpCache, conditional_headers, url_key
+from hf_daily_papers_analytics.sessions import create_session
+
+DATE = "2025-03-03"
+
+
+def api_entry(paper_id: str, upvotes: int = 1) -> dict:
+    return {
+        "paper": {
+            "id": paper_id,
+            "title": f"Paper {paper_id}",
+            "authors": [{"name": "Ada"}, {"name": "Grace"}],
+            "upvotes": upvotes,
+        },
+        "numComments": 0,
+        "thumbnail": f"https://cdn/{paper_id}.png",
+    }
+
+
+class FakeDailyPapersApi:
+    """Serves one daily_papers payload with an ETag and answers revalidations with 304."""
+
+    def __init__(self, entries: list[dict], etag: str = '"v1"'):
+        self.entries = entries
+        self.etag = etag
+        self.statuses = []
+        self.request_headers = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.request_headers.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == self.etag:
+            self.statuses.append(304)
+            return web.Response(status=304, headers={"ETag": self.etag})
+        self.statuses.append(200)
+        return web.Response(
+            body=json.dumps(self.entries).encode("utf-8"),
+            content_type="application/json",
+            headers={"ETag": self.etag},
+        )
+
+
+async def fetch_twice(api: FakeDailyPapersApi, cache: HttpCache, monkeypatch, between=None):
+    app = web.Application()
+    app.router.add_get("/api/daily_papers", api.handle)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(hf_papers_scraper, "HF_API_BASE", str(server.make_url("/api")))
+        async with create_session(1) as session:
+            first = await fetch_papers_for_date(DATE, session, cache=cache)
+            if between:
+                between()
+            second = await fetch_papers_for_date(DATE, session, cache=cache)
+    return first, second
+
+
+@pytest.mark.asyncio
+async def test_not_modified_serves_cached_papers(tmp_path, monkeypatch):
+    api = FakeDailyPapersApi([api_entry("2503.00001"), api_entry("2503.00002")])
+    cache = HttpCache(str(tmp_path / "http"))
+
+    first, second = await fetch_twice(api, cache, monkeypatch)
+
+    assert api.statuses == [200, 304]
+    assert "If-None-Match" not in api.request_headers[0]
+    assert api.request_headers[1]["If-None-Match"] == '"v1"'
+    assert second == first
+    assert [paper["paper_id"] for paper in second] == ["2503.00001", "2503.00002"]
+
+
+@pytest.mark.asyncio
+async def test_changed_etag_refetches_and_replaces_entry(tmp_path, monkeypatch):
+    api = FakeDailyPapersApi([api_entry("2503.00001", upvotes=1)])
+    cache = HttpCache(str(tmp_path / "http"))
+
+    def update_payload():
+        api.entries = [api_entry("2503.00001", upvotes=7)]
+        api.etag = '"v2"'
+
+    first, second = await fetch_twice(api, cache, monkeypatch, between=update_payload)
+
+    assert api.statuses == [200, 200]
+    assert first[0]["upvotes"] == 1
+    assert second[0]["upvotes"] == 7
+    url = f"{hf_papers_scraper.HF_API_BASE}/daily_papers?date={DATE}"
+    assert conditional_headers(cache.get(url, hf_papers_scraper.PARSER_VERSION)) == {"If-None-Match": '"v2"'}
+
+
+@pytest.mark.asyncio
+async def test_parser_version_bump_bypasses_cached_payload(tmp_path, monkeypatch):
+    api = FakeDailyPapersApi([api_entry("2503.00001")])
+    cache = HttpCache(str(tmp_path / "http"))
+
+    def bump_parser():
+        monkeypatch.setattr(hf_papers_scraper, "PARSER_VERSION", "test-bump")
+
+    first, second = await fetch_twice(api, cache, monkeypatch, between=bump_parser)
+
+    # The old entry must not be revalidated and served, or the new parser would never run
+    assert api.statuses == [200, 200]
+    assert "If-None-Match" not in api.request_headers[1]
+    assert second == first
+
+
+def test_responses_without_validators_are_not_cached(tmp_path):
+    cache = HttpCache(str(tmp_path / "http"))
+    cache.put("https://example.com/a", [{"paper_id": "1"}], etag=None, last_modified=None)
+    assert cache.get("https://example.com/a") is None
+    assert conditional_headers(None) == {}
+
+
+def test_evicts_least_recently_used_over_max_bytes(tmp_path):
+    cache = HttpCache(str(tmp_path / "http"), max_bytes=10_000)
+    payload = ["x" * 3000]
+    now = time.time()
+    for i in range(3):
+        cache.put(f"https://example.com/{i}", payload, etag=f'"{i}"', last_modified=None)
+        stored_at = now - 300 + 100 * i
+        os.utime(cache._path(url_key(f"https://example.com/{i}")), (stored_at, stored_at))
+    cache.get("https://example.com/0")  # Most recently used now
+    cache.put("https://example.com/3", payload, etag='"3"', last_modified=None)
+
+    assert cache.get("https://example.com/0") is not None
+    assert cache.get("https://example.com/1") is None
+    assert cache.get("https://example.com/3") is not None
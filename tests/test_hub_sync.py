@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from datasets import load_dataset
+
+from hf_daily_papers_analytics.hub_sync import (
+    MANIFEST_PATH,
+    README_PATH,
+    LocalHubRepo,
+    shard_path,
+    strip_dataset_info,
+    sync_shards,
+)
+
+# What push_to_hub leaves in the dataset card: features and split sizes that
+# load_dataset verifies the data against
+PUSHED_CARD = """---
+dataset_info:
+  features:
+  - name: date
+    dtype: string
+  - name: paper_id
+    dtype: string
+  - name: upvotes
+    dtype: int64
+  splits:
+  - name: train
+    num_bytes: 120
+    num_examples: 3
+  download_size: 2000
+  dataset_size: 120
+configs:
+- config_name: default
+  data_files:
+  - split: train
+    path: data/train-*
+---
+# HF daily papers
+"""
+
+
+def papers(dates: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": dates,
+        "paper_id": [f"{date[2:4]}{date[5:7]}.{i:05d}" for i, date in enumerate(dates)],
+        "upvotes": list(range(len(dates))),
+    })
+
+
+@pytest.fixture
+def pushed_repo(tmp_path) -> LocalHubRepo:
+    """A repo as left by push_to_hub: its card and one train-XXXXX-of-XXXXX shard."""
+    root = tmp_path / "hub"
+    (root / "data").mkdir(parents=True)
+    (root / README_PATH).write_text(PUSHED_CARD)
+    papers(["2025-02-27", "2025-03-01", "2025-03-02"]).to_parquet(
+        root / "data" / "train-00000-of-00001.parquet", index=False
+    )
+    return LocalHubRepo(str(root))
+
+
+def test_sync_keeps_the_repo_loadable(pushed_repo, tmp_path):
+    first = sync_shards(papers(["2025-02-27", "2025-03-01", "2025-03-02"]), pushed_repo)
+    assert first["card_updated"]
+    assert first["deleted"] == ["data/train-00000-of-00001.parquet"]
+
+    # The daily run adds papers; the card must not still claim 3 examples
+    second = sync_shards(
+        papers(["2025-02-27", "2025-03-01", "2025-03-02", "2025-03-03", "2025-03-04"]),
+        pushed_repo,
+    )
+    assert not second["card_updated"]
+    assert second["uploaded"] == [shard_path("2025-03")]
+    assert second["unchanged"] == 1
+
+    dataset = load_dataset(pushed_repo.root, cache_dir=str(tmp_path / "hf_cache"))
+    assert dataset["train"].num_rows == 5
+    assert len(pushed_repo.load_papers()) == 5
+
+    card = (pushed_repo.read_file(README_PATH) or b"").decode("utf-8")
+    assert "dataset_info" not in card
+    assert "data/train-*" in card
+    assert "# HF daily papers" in card
+
+
+def test_sync_after_a_full_push_restores_the_shards(tmp_path):
+    repo = LocalHubRepo(str(tmp_path / "hub"))
+    df = papers(["2025-02-27", "2025-03-01", "2025-03-02"])
+    sync_shards(df, repo)
+
+    # A later `--upload_mode full` push replaces data/ and the card, but not the manifest
+    shutil.rmtree(os.path.join(repo.root, "data"))
+    os.makedirs(os.path.join(repo.root, "data"))
+    df.to_parquet(os.path.join(repo.root, "data", "train-00000-of-00001.parquet"), index=False)
+    with open(os.path.join(repo.root, README_PATH), "w") as f:
+        f.write(PUSHED_CARD)
+
+    summary = sync_shards(df, repo)
+
+    assert summary["uploaded"] == [shard_path("2025-02"), shard_path("2025-03")]
+    assert summary["deleted"] == ["data/train-00000-of-00001.parquet"]
+    assert len(repo.load_papers()) == 3
+    dataset = load_dataset(repo.root, cache_dir=str(tmp_path / "hf_cache"))
+    assert dataset["train"].num_rows == 3
+
+
+def test_unchanged_data_is_not_committed(tmp_path):
+    repo = LocalHubRepo(str(tmp_path / "hub"))
+    df = papers(["2025-01-31", "2025-02-01"])
+    sync_shards(df, repo)
+    manifest_mtime = os.path.getmtime(os.path.join(repo.root, MANIFEST_PATH))
+
+    summary = sync_shards(df.iloc[::-1], repo)  # Row order doesn't change a shard
+
+    assert summary["uploaded"] == [] and summary["deleted"] == []
+    assert summary["unchanged"] == 2
+    assert os.path.getmtime(os.path.join(repo.root, MANIFEST_PATH)) == manifest_mtime
+    manifest = json.loads(repo.read_file(MANIFEST_PATH))
+    assert sorted(manifest["shards"]) == [shard_path("2025-01"), shard_path("2025-02")]
+
+
+def test_strip_dataset_info_leaves_other_cards_alone():
+    assert strip_dataset_info("# No metadata\n") is None
+    assert strip_dataset_info("---\nlicense: mit\n---\n# Card\n") is None
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from hf_daily_papers_analytics.jsonl_writer import CheckpointedJsonlWriter
+from test_scraper_state import SETTLED_DATES, FakeDailyPapersApi, scrape
+
+
+def records(key: str, n: int = 2) -> list[dict]:
+    return [{"date": key, "i": i} for i in range(n)]
+
+
+def read_jsonl(path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_truncates_to_the_last_checkpoint(tmp_path):
+    path = str(tmp_path / "papers.jsonl")
+    writer = CheckpointedJsonlWriter(path, checkpoint_every=2)
+    writer.write("d1", records("d1"))
+    writer.write("d2", [])  # A date without papers still counts as done
+    writer.write("d3", records("d3"))
+    # Crash: d3 was written but not checkpointed, and a record was torn mid-line
+    writer._file.write(b'{"date": "d4", "i"')
+    writer._file.flush()
+
+    resumed = CheckpointedJsonlWriter(path, resume=True, checkpoint_every=2)
+    assert resumed.completed == {"d1", "d2"}
+    resumed.write("d3", records("d3"))
+    resumed.close()
+
+    assert read_jsonl(path) == records("d1") + records("d3")
+
+
+def test_without_resume_the_file_starts_over(tmp_path):
+    path = str(tmp_path / "papers.jsonl")
+    with CheckpointedJsonlWriter(path) as writer:
+        writer.write("d1", records("d1"))
+
+    with CheckpointedJsonlWriter(path) as writer:
+        assert writer.completed == set()
+        writer.write("d2", records("d2"))
+
+    assert read_jsonl(path) == records("d2")
+
+
+@pytest.mark.asyncio
+async def test_streamed_scrape_resumes_without_refetching(tmp_path, monkeypatch):
+    path = str(tmp_path / "papers.jsonl")
+    api = FakeDailyPapersApi()
+    await scrape(api, monkeypatch, SETTLED_DATES[:1], output_file=path, stream=True)
+
+    api.requested.clear()
+    df, _ = await scrape(api, monkeypatch, SETTLED_DATES, output_file=path, stream=True, resume=True)
+
+    assert api.requested == SETTLED_DATES[1:]
+    assert sorted(df["paper_id"]) == [f"{date}-{i}" for date in SETTLED_DATES for i in range(2)]
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pypdf import PdfReader
+
+from hf_daily_papers_analytics.pdf_preprocessing import preprocess_pdf, summarize_pdf_stats
+from hf_daily_papers_analytics.sessions import create_session
+
+
+def linearized_pdf(first_page_end: int, length: int | None = None) -> bytes:
+    """A two-page PDF that claims to be linearized, with its real xref at the end.
+
+    Its first-page prefix never parses on its own, like a linearized file whose
+    trailer points past /E.
+    """
+
+    def build(length: int) -> bytes:
+        objects = [
+            b"<< /Linearized 1 /L %07d /E %d >>" % (length, first_page_end),
+            b"<< /Type /XRef >>",  # Stands in for the first-page cross-reference stream
+            b"<< /Type /Catalog /Pages 4 0 R >>",
+            b"<< /Type /Pages /Kids [5 0 R 6 0 R] /Count 2 >>",
+            b"<< /Type /Page /Parent 4 0 R /MediaBox [0 0 200 200] >>",
+            b"<< /Type /Page /Parent 4 0 R /MediaBox [0 0 300 300] >>",
+        ]
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+            if number == 2:
+                out += b"%" + b"x" * 4000 + b"\n"
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+        out += b"trailer\n<< /Size %d /Root 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+        return bytes(out)
+
+    return build(length if length is not None else len(build(0)))
+
+
+async def preprocess_served(pdf: bytes) -> tuple[bytes, dict, int]:
+    """Serves pdf and preprocesses it, returning the first page, stats and request count."""
+    requests = []
+
+    async def handle(request: web.Request) -> web.Response:
+        requests.append(request)
+        return web.Response(body=pdf, content_type="application/pdf")
+
+    app = web.Application()
+    app.router.add_get("/paper.pdf", handle)
+    async with TestServer(app) as server, create_session(1) as session:
+        first_page, stats = await preprocess_pdf(str(server.make_url("/paper.pdf")), session, chunk_size=256)
+    return first_page, stats, len(requests)
+
+
+def page_sizes(pdf: bytes) -> list[float]:
+    return [float(page.mediabox.width) for page in PdfReader(io.BytesIO(pdf)).pages]
+
+
+@pytest.mark.asyncio
+async def test_unparseable_prefix_continues_the_same_response():
+    pdf = linearized_pdf(first_page_end=1500)
+
+    first_page, stats, num_requests = await preprocess_served(pdf)
+
+    assert num_requests == 1
+    assert page_sizes(first_page) == [200]
+    assert stats["linearized"] and stats["prefix_fallback"]
+    assert not stats["truncated"]
+    assert stats["bytes_read"] == len(pdf)
+    assert "1 read in full after the prefix didn't parse" in summarize_pdf_stats([stats])
+
+
+@pytest.mark.asyncio
+async def test_length_mismatch_reads_the_whole_pdf():
+    # /L doesn't match the served length, so /E can't be trusted
+    pdf = linearized_pdf(first_page_end=1500, length=1)
+
+    first_page, stats, num_requests = await preprocess_served(pdf)
+
+    assert num_requests == 1
+    assert page_sizes(first_page) == [200]
+    assert stats["linearized"]
+    assert not stats["truncated"] and not stats["prefix_fallback"]
+    assert stats["bytes_read"] == len(pdf)
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from hf_daily_papers_analytics import hf_papers_scraper
+from hf_daily_papers_analytics.hf_papers_scraper import DateFetchError, fetch_papers_for_date
+from hf_daily_papers_analytics.rate_limiter import AdaptiveLimiter, parse_retry_after
+from hf_daily_papers_analytics.sessions import create_session
+
+
+def test_failures_back_off_multiplicatively_once_per_interval():
+    limiter = AdaptiveLimiter(max_limit=16, decrease_interval=60.0)
+    limiter.record_failure()
+    limiter.record_failure()  # Same congestion burst: no second cut
+    assert limiter.limit == 8
+    assert limiter.num_throttled == 2
+
+    limiter = AdaptiveLimiter(max_limit=16, min_limit=3, decrease_interval=0.0)
+    for _ in range(5):
+        limiter.record_failure()
+    assert limiter.limit == 3
+
+
+def test_successes_recover_additively_up_to_max():
+    limiter = AdaptiveLimiter(max_limit=8, decrease_interval=0.0)
+    limiter.record_failure()
+    limiter.record_failure()
+    assert limiter.limit == 2
+
+    # Each success adds 1/limit: about +1 per round of `limit` successes
+    limiter.record_success()
+    limiter.record_success()
+    assert limiter.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+    for _ in range(100):
+        limiter.record_success()
+    assert limiter.limit == 8
+
+
+@pytest.mark.asyncio
+async def test_limits_requests_in_flight():
+    limiter = AdaptiveLimiter(max_limit=4, initial=2)
+    in_flight = peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limiter:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(10)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_new_requests():
+    limiter = AdaptiveLimiter(max_limit=4)
+    limiter.record_failure(retry_after=0.2)
+    start = time.monotonic()
+    async with limiter:
+        pass
+    assert time.monotonic() - start >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_releases_its_slot():
+    limiter = AdaptiveLimiter(max_limit=1)
+    limiter.record_failure(retry_after=60.0)  # Also cuts the limit to min_limit=1
+
+    async def request():
+        async with limiter:
+            pass
+
+    waiting = asyncio.create_task(request())
+    await asyncio.sleep(0.05)  # Holds the only slot, sleeping out the pause
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    limiter._paused_until = 0.0
+    await asyncio.wait_for(request(), timeout=1.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+async def fetch_with_status(status: int, body: bytes, monkeypatch) -> AdaptiveLimiter:
+    async def handle(request):
+        return web.Response(status=status, body=body)
+
+    app = web.Application()
+    app.router.add_get("/api/daily_papers", handle)
+    limiter = AdaptiveLimiter(max_limit=8)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(hf_papers_scraper, "HF_API_BASE", str(server.make_url("/api")))
+        async with create_session(1) as session:
+            with pytest.raises(DateFetchError):
+                await fetch_papers_for_date("2025-03-03", session, retries=1, limiter=limiter)
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_only_throttling_errors_shrink_the_limit(monkeypatch):
+    limiter = await fetch_with_status(503, b"", monkeypatch)
+    assert limiter.limit == 4
+
+    limiter = await fetch_with_status(404, b"", monkeypatch)
+    assert limiter.limit == 8
+    assert limiter.num_throttled == 0
+
+    limiter = await fetch_with_status(200, b"<html>not json</html>", monkeypatch)
+    assert limiter.limit == 8
+    assert limiter.num_throttled == 0
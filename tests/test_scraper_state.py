@@ -0,0 +1,128 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from hf_daily_papers_analytics import hf_papers_scraper
+from hf_daily_papers_analytics.hf_papers_scraper import (
+    commit_scrape_state,
+    load_scrape_state,
+    pending_state_file,
+    run_scraper,
+    select_dates_to_fetch,
+)
+
+SETTLED_DATES = ["2025-01-01", "2025-01-02"]
+RECENT_DATE = datetime.now().strftime("%Y-%m-%d")
+
+
+class FakeDailyPapersApi:
+    """Serves two papers per date, and a 404 for dates in `missing`."""
+
+    def __init__(self, missing: set[str] = frozenset()):
+        self.missing = set(missing)
+        self.requested = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        date = request.query["date"]
+        self.requested.append(date)
+        if date in self.missing:
+            return web.Response(status=404)
+        entries = [
+            {"paper": {"id": f"{date}-{i}", "title": "", "authors": [], "upvotes": i}}
+            for i in range(2)
+        ]
+        return web.json_response(entries)
+
+
+async def scrape(api: FakeDailyPapersApi, monkeypatch, dates: list[str], output_file=None, **kwargs):
+    app = web.Application()
+    app.router.add_get("/api/daily_papers", api.handle)
+    async with TestServer(app) as server:
+        monkeypatch.setattr(hf_papers_scraper, "HF_API_BASE", str(server.make_url("/api")))
+        return await run_scraper(
+            None, None, output_file, dates=dates, retries=1, requeue_failed=False, **kwargs
+        )
+
+
+def test_settle_window():
+    posted = "2025-03-01"
+    fetched = lambda days: (datetime(2025, 3, 1) + timedelta(days=days)).isoformat()
+    state = {
+        "2025-03-01": {"status": "ok", "fetched_at": fetched(14)},
+        "2025-03-02": {"status": "ok", "fetched_at": fetched(3)},
+        "2025-03-03": {"status": "failed", "fetched_at": fetched(30)},
+    }
+    dates = [posted, "2025-03-02", "2025-03-03", "2025-03-04"]
+    assert select_dates_to_fetch(dates, state, settle_days=14) == ["2025-03-02", "2025-03-03", "2025-03-04"]
+    assert select_dates_to_fetch(dates, state, settle_days=0) == ["2025-03-03", "2025-03-04"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_only_fetches_unsettled_dates(tmp_path, monkeypatch):
+    state_file = str(tmp_path / "state.json")
+    api = FakeDailyPapersApi(missing={"2025-01-02"})
+    dates = [*SETTLED_DATES, RECENT_DATE]
+
+    df, failed = await scrape(api, monkeypatch, dates, state_file=state_file)
+
+    assert len(df) == 4
+    assert [f["date"] for f in failed] == ["2025-01-02"]
+    state = load_scrape_state(state_file)
+    assert state["2025-01-01"]["status"] == "ok" and state["2025-01-01"]["num_papers"] == 2
+    assert (state["2025-01-02"]["status"], state["2025-01-02"]["error_class"]) == ("failed", "http_404")
+
+    # The settled date is skipped; the failed and still settling ones are retried
+    api.requested.clear()
+    api.missing.clear()
+    await scrape(api, monkeypatch, dates, state_file=state_file)
+    assert sorted(api.requested) == ["2025-01-02", RECENT_DATE]
+
+    api.requested.clear()
+    await scrape(api, monkeypatch, dates, state_file=state_file, full_refresh=True)
+    assert sorted(api.requested) == sorted(dates)
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_state_is_refetched(tmp_path, monkeypatch):
+    state_file = str(tmp_path / "state.json")
+    api = FakeDailyPapersApi()
+
+    await scrape(api, monkeypatch, SETTLED_DATES, state_file=state_file, save_state=False)
+
+    # Until the caller has saved/uploaded the papers, the state is only pending
+    assert not os.path.exists(state_file)
+    with open(pending_state_file(state_file)) as f:
+        assert sorted(json.load(f)) == SETTLED_DATES
+
+    api.requested.clear()
+    await scrape(api, monkeypatch, SETTLED_DATES, state_file=state_file, save_state=False)
+    assert sorted(api.requested) == SETTLED_DATES
+
+    commit_scrape_state(state_file)
+    assert not os.path.exists(pending_state_file(state_file))
+    api.requested.clear()
+    await scrape(api, monkeypatch, SETTLED_DATES, state_file=state_file)
+    assert api.requested == []
+
+
+@pytest.mark.asyncio
+async def test_state_is_not_saved_when_writing_the_output_fails(tmp_path, monkeypatch):
+    state_file = str(tmp_path / "state.json")
+
+    def failing_write(df, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(hf_papers_scraper, "write_papers", failing_write)
+    with pytest.raises(OSError):
+        await scrape(
+            FakeDailyPapersApi(),
+            monkeypatch,
+            SETTLED_DATES,
+            output_file=str(tmp_path / "papers.jsonl"),
+            state_file=state_file,
+        )
+    assert not os.path.exists(state_file)
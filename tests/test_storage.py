@@ -0,0 +1,83 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from hf_daily_papers_analytics.storage import dataset_format, read_papers, write_papers
+
+
+def papers_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": ["2025-03-04", "2025-03-03", "2025-02-28"],
+        "paper_id": ["2503.00002", "2503.00001", "2502.09999"],
+        "title": ["B", "A", "Z"],
+        "authors": [["Ada", "Grace"], [], ["Alan"]],
+        "upvotes": [3, 0, 12],
+        "githubStars": [None, 42, None],
+        "ai_keywords": [["llm"], None, []],
+        "author_info": [
+            [{"name": "Ada", "affiliation": "Tsinghua", "email": ""}],
+            None,
+            [],
+        ],
+    })
+
+
+def test_parquet_round_trip_keeps_nulls_and_lists(tmp_path):
+    path = str(tmp_path / "papers.parquet")
+    df = papers_frame()
+    write_papers(df, path)
+
+    # One hive partition per month
+    assert sorted(os.listdir(path)) == ["month=2025-02", "month=2025-03"]
+
+    result = read_papers(path).sort_values("paper_id", ascending=False).reset_index(drop=True)
+    assert list(result.columns) == list(df.columns)
+    assert result["paper_id"].tolist() == df["paper_id"].tolist()
+    assert result["upvotes"].tolist() == [3, 0, 12]
+    assert pd.isna(result.loc[0, "githubStars"]) and result.loc[1, "githubStars"] == 42
+    assert pd.isna(result.loc[2, "githubStars"])
+    assert result["authors"].tolist() == [["Ada", "Grace"], [], ["Alan"]]
+    assert all(isinstance(v, list) for v in result["authors"])
+    assert result["ai_keywords"].tolist() == [["llm"], None, []]
+    assert result["author_info"].tolist() == df["author_info"].tolist()
+
+
+def test_reads_only_requested_columns(tmp_path):
+    for name in ("papers.parquet", "papers.jsonl"):
+        path = str(tmp_path / name)
+        write_papers(papers_frame(), path)
+        result = read_papers(path, columns=["paper_id", "upvotes"])
+        assert list(result.columns) == ["paper_id", "upvotes"]
+        assert sorted(result["paper_id"]) == ["2502.09999", "2503.00001", "2503.00002"]
+
+
+def test_rewrite_replaces_previous_dataset(tmp_path):
+    path = str(tmp_path / "papers.parquet")
+    write_papers(papers_frame(), path)
+    write_papers(papers_frame().iloc[:1], path)
+    assert read_papers(path)["paper_id"].tolist() == ["2503.00002"]
+    assert sorted(os.listdir(tmp_path)) == ["papers.parquet"]
+
+
+def test_recovers_from_interrupted_swap(tmp_path):
+    path = str(tmp_path / "papers.parquet")
+    write_papers(papers_frame(), path)
+
+    # A write that died after moving the current dataset aside, before swapping in the new one
+    os.replace(path, f"{path}.old")
+    assert len(read_papers(path)) == 3
+    assert not os.path.exists(f"{path}.old")
+
+    # ... or after the swap, before cleaning up
+    shutil.copytree(path, f"{path}.old")
+    write_papers(papers_frame().iloc[:1], path)
+    assert not os.path.exists(f"{path}.old")
+    assert len(read_papers(path)) == 1
+
+
+def test_rejects_unknown_extensions():
+    assert dataset_format("data/papers.parquet/") == "parquet"
+    with pytest.raises(ValueError):
+        dataset_format("papers.csv")
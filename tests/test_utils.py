@@ -0,0 +1,123 @@
+import pandas as pd
+import pyarrow as pa
+
+from hf_daily_papers_analytics.storage import AUTHOR_INFO_TYPE
+from hf_daily_papers_analytics.utils import bulk_update_by_paper_id, has_author_info, merge_datasets
+
+ADA = [{"name": "Ada", "affiliation": "Tsinghua", "email": ""}]
+GRACE = [{"name": "Grace", "affiliation": "Navy", "email": ""}]
+
+
+def papers(rows: list[tuple]) -> pd.DataFrame:
+    """Builds a papers frame from (date, paper_id, upvotes, author_info) tuples."""
+    return pd.DataFrame(rows, columns=["date", "paper_id", "upvotes", "author_info"])
+
+
+def test_has_author_info_object_and_arrow_columns():
+    values = [ADA, [], None, GRACE]
+    expected = [True, False, False, True]
+    assert has_author_info(pd.Series(values, dtype=object)).tolist() == expected
+
+    arrow = pd.Series(pd.arrays.ArrowExtensionArray(pa.array(values, type=AUTHOR_INFO_TYPE)))
+    assert has_author_info(arrow).tolist() == expected
+
+    assert not has_author_info(pd.Series([float("nan")] * 2)).any()
+
+
+def test_merge_prefers_new_rows_and_backfills_author_info():
+    existing = papers([
+        ("2025-03-03", "2503.00002", 5, ADA),
+        ("2025-03-02", "2503.00001", 9, GRACE),
+        ("2025-03-01", "2503.00000", 1, None),
+    ])
+    new = papers([
+        ("2025-03-04", "2503.00003", 0, None),
+        ("2025-03-03", "2503.00002", 8, None),
+    ])
+
+    merged = merge_datasets(existing, new)
+
+    assert merged["paper_id"].tolist() == ["2503.00003", "2503.00002", "2503.00001", "2503.00000"]
+    assert merged["date"].tolist() == ["2025-03-04", "2025-03-03", "2025-03-02", "2025-03-01"]
+    # Fresh metadata wins, previously extracted author_info is kept
+    assert merged.loc[1, "upvotes"] == 8
+    assert merged.loc[1, "author_info"] == ADA
+    assert merged.loc[2, "author_info"] == GRACE
+    assert pd.isna(merged.loc[0, "author_info"])
+
+
+def test_merge_keeps_new_author_info_and_last_duplicate():
+    existing = papers([("2025-03-03", "2503.00002", 5, ADA)])
+    new = papers([
+        ("2025-03-03", "2503.00002", 6, None),
+        ("2025-03-03", "2503.00002", 7, GRACE),
+    ])
+
+    merged = merge_datasets(existing, new)
+
+    assert len(merged) == 1
+    assert merged.loc[0, "upvotes"] == 7
+    assert merged.loc[0, "author_info"] == GRACE
+
+
+def test_merge_normalizes_key_dtypes_and_sorts_out_of_order_scrapes():
+    existing = papers([
+        ("2025-03-05", "2503.00005", 1, None),
+        ("2025-03-01", 2503.00001, 1, ADA),
+    ])
+    new = papers([("2025-03-01", "2503.00001", 4, None)])
+    new["date"] = pd.to_datetime(new["date"])
+
+    merged = merge_datasets(existing, new)
+
+    assert merged["paper_id"].tolist() == ["2503.00005", "2503.00001"]
+    assert merged["date"].tolist() == ["2025-03-05", "2025-03-01"]
+    assert merged.loc[1, "upvotes"] == 4
+    assert merged.loc[1, "author_info"] == ADA
+
+
+def test_merge_with_an_empty_side():
+    existing = papers([("2025-03-03", "2503.00002", 5, ADA)])
+    assert merge_datasets(pd.DataFrame(), existing) is existing
+    assert merge_datasets(existing, pd.DataFrame()) is existing
+
+
+def test_bulk_update_sets_lists_and_counts_missing_papers():
+    df = papers([
+        ("2025-03-03", "2503.00002", 5, None),
+        ("2025-03-02", "2503.00001", 9, GRACE),
+    ])
+
+    assert bulk_update_by_paper_id(df, {"2503.00002": ADA, "2503.09999": GRACE}) == (1, 1)
+
+    assert df["author_info"].tolist() == [ADA, GRACE]
+    assert bulk_update_by_paper_id(df, {}) == (0, 0)
+
+
+def test_bulk_update_can_keep_existing_lists():
+    df = papers([
+        ("2025-03-03", "2503.00002", 5, []),
+        ("2025-03-02", "2503.00001", 9, GRACE),
+        ("2025-03-01", "2503.00000", 2, None),
+    ])
+    values = {"2503.00002": ADA, "2503.00001": ADA, "2503.09999": ADA}
+
+    assert bulk_update_by_paper_id(df, values, skip_filled=True) == (1, 1)
+    assert df["author_info"].tolist() == [ADA, GRACE, None]
+
+    assert bulk_update_by_paper_id(df, values) == (2, 1)
+    assert df["author_info"].tolist() == [ADA, ADA, None]
+
+
+def test_bulk_update_with_duplicate_paper_ids():
+    df = papers([
+        ("2025-03-03", "2503.00002", 5, None),
+        ("2025-03-04", "2503.00002", 6, None),
+        ("2025-03-02", 2503.00001, 9, None),
+    ])
+    # A float and a string key for the same paper: the last one wins
+    values = {2503.00002: GRACE, "2503.00002": ADA, "2503.00001": GRACE}
+
+    assert bulk_update_by_paper_id(df, values) == (2, 0)
+
+    assert df["author_info"].tolist() == [ADA, ADA, GRACE]
@@ -2,19 +2,44 @@
 
 Usage:
     poetry run python visualizations/analyze.py
+    poetry run python visualizations/analyze.py --data data/hf_daily_papers.parquet
+    poetry run python visualizations/analyze.py --jobs 0  # one process per core
+    poetry run python visualizations/analyze.py --only e1,e25 --force
+    poetry run python visualizations/analyze.py --feature_store data/features
 """
 
+import argparse
+import hashlib
+import inspect
+import json
 import os
+import re
+import sys
+import tempfile
+import time
 from collections import Counter
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import seaborn as sns
 
+from hf_daily_papers_analytics.coauthor_graph import CoauthorGraph
+from hf_daily_papers_analytics.feature_store import (
+    SOURCE_COLUMNS,
+    author_paper_table,
+    load_features,
+    paper_features,
+    per_author_table,
+    row_hashes,
+)
+from hf_daily_papers_analytics.storage import AUTHOR_INFO_TYPE, read_papers
+from hf_daily_papers_analytics.utils import build_key_index, has_author_info
+
 OUT_DIR = Path(__file__).parent
 DATA_PATH = Path(__file__).parent.parent / "data" / "hf_daily_papers.jsonl"
 
@@ -64,62 +89,197 @@ def is_chinese_name(name: str) -> bool:
     return surname in CHINESE_SURNAMES
 
 
+class KeywordClassifier:
+    """Case-insensitive "contains any keyword" test, compiled once and memoized.
+
+    The keywords are joined into a single alternation regex. Scalar calls cache their
+    result per distinct string; `mask` classifies a whole Series by factorizing it and
+    matching only the distinct values (with pandas' vectorized `str.contains`), since
+    the same affiliation strings repeat across thousands of author rows.
+    """
+
+    def __init__(self, keywords: list[str]):
+        self.keywords = list(keywords)
+        self.pattern = "|".join(re.escape(kw) for kw in keywords)
+        self._regex = re.compile(self.pattern)
+        self._cache: dict[str, bool] = {}
+
+    def __call__(self, text: str) -> bool:
+        if not text:
+            return False
+        result = self._cache.get(text)
+        if result is None:
+            result = self._cache[text] = self._regex.search(text.lower()) is not None
+        return result
+
+    def __repr__(self) -> str:
+        # Stable across runs, so the artifact cache sees keyword edits
+        return f"KeywordClassifier({self.keywords!r})"
+
+    def mask(self, texts: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(texts)
+        unique_flags = (
+            pd.Series(uniques).str.lower().str.contains(self.pattern, regex=True, na=False).to_numpy()
+        )
+        self._cache.update(zip(uniques, unique_flags.tolist()))
+        flags = np.zeros(len(codes), dtype=bool)
+        flags[codes >= 0] = unique_flags[codes[codes >= 0]]
+        return pd.Series(flags, index=texts.index)
+
+
+CHINESE_AFFILIATION_CLASSIFIER = KeywordClassifier(CHINESE_AFFILIATION_KEYWORDS)
+
+
 def is_chinese_affiliation(affiliation: str) -> bool:
     """Heuristic: check if affiliation contains Chinese institution keywords."""
-    if not affiliation:
-        return False
-    aff_lower = affiliation.lower()
-    return any(kw in aff_lower for kw in CHINESE_AFFILIATION_KEYWORDS)
+    return CHINESE_AFFILIATION_CLASSIFIER(affiliation)
 
 
 # ── Data loading & preprocessing ──────────────────────────────────────────────
 
 
-def load_data() -> pd.DataFrame:
-    df = pd.read_json(DATA_PATH, lines=True)
+def load_data(path: Path = DATA_PATH, columns: list[str] | None = None,
+              feature_store: str | None = None) -> pd.DataFrame:
+    """Loads the dataset (.jsonl, .json or .parquet), optionally only some columns.
+
+    Derived columns are only added when the columns they're computed from were loaded,
+    e.g. columns=["date", "upvotes"] is enough for plot_group_a. With a feature_store
+    directory (see hf_daily_papers_analytics.feature_store), every derived column is
+    read from its papers_features table instead of being recomputed. The store must
+    be up to date: its row hashes are checked against every paper's current source
+    columns (read just for the check), and a store missing papers or holding features
+    of an older version of them raises ValueError.
+    """
+    if feature_store is None:
+        df = read_papers(str(path), columns=columns)
+        df["date"] = pd.to_datetime(df["date"])
+        return pd.concat([df, paper_features(df)], axis=1)
+
+    read_columns = None if columns is None else sorted(set(columns) | set(SOURCE_COLUMNS))
+    df = read_papers(str(path), columns=read_columns)
+    features = load_features(feature_store, "papers_features").set_index(["date", "paper_id"])
+    keys = build_key_index(df["date"].astype(str).str[:10], df["paper_id"].astype(str))
+    stale = features["row_hash"].reindex(keys).to_numpy() != row_hashes(df)
+    if stale.any():
+        raise ValueError(
+            f"Feature store {feature_store} is missing or out of date for {stale.sum():,} papers "
+            f"of {path}; rebuild it with update_hf_datasets.py --feature_store."
+        )
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
     df["date"] = pd.to_datetime(df["date"])
-    df["num_authors"] = df["authors"].apply(len)
-    df["title_word_count"] = df["title"].str.split().apply(len)
-    df["abstract_word_count"] = df["summary"].str.split().apply(len)
+    features = features.drop(columns="row_hash").reindex(keys).reset_index(drop=True)
+    features.index = df.index
+    return pd.concat([df, features], axis=1)
 
-    # Extract author_info fields
-    df["has_author_info"] = df["author_info"].apply(
-        lambda x: isinstance(x, list) and len(x) > 0
-    )
 
-    # Number of unique institutions per paper
-    def count_institutions(info):
-        if not isinstance(info, list):
-            return 0
-        affs = {a.get("affiliation", "").strip() for a in info if a.get("affiliation", "").strip()}
-        return len(affs)
+AUTHOR_COLUMNS = [
+    "date", "paper_id", "upvotes", "author_name", "affiliation", "email",
+    "is_first_author", "is_last_author", "is_chinese_name", "is_chinese_affiliation",
+]
 
-    df["num_institutions"] = df["author_info"].apply(count_institutions)
+PAPER_ORIGIN_COLUMNS = [
+    "origin_by_name", "origin_by_aff",
+    "first_author_origin", "last_author_origin",
+    "first_author_aff_origin", "last_author_aff_origin",
+]
 
-    return df
 
+def chinese_name_mask(names: pd.Series) -> pd.Series:
+    """Vectorized is_chinese_name over a Series of names."""
+    surnames = names.str.extract(r"(\S+)\s*$", expand=False)
+    return surnames.isin(CHINESE_SURNAMES)
 
-def explode_authors(df: pd.DataFrame) -> pd.DataFrame:
-    """Create a row per author per paper using author_info."""
-    rows = []
-    for _, paper in df.iterrows():
-        info = paper["author_info"]
-        if not isinstance(info, list):
-            continue
-        for i, author in enumerate(info):
-            rows.append({
-                "date": paper["date"],
-                "paper_id": paper["paper_id"],
-                "upvotes": paper["upvotes"],
-                "author_name": author.get("name", ""),
-                "affiliation": author.get("affiliation", ""),
-                "email": author.get("email", ""),
-                "is_first_author": i == 0,
-                "is_last_author": i == len(info) - 1,
-                "is_chinese_name": is_chinese_name(author.get("name", "")),
-                "is_chinese_affiliation": is_chinese_affiliation(author.get("affiliation", "")),
-            })
-    return pd.DataFrame(rows)
+
+class ClassificationTable:
+    """Chinese name/affiliation flags for each distinct name and affiliation.
+
+    Names and affiliations are interned as pandas Categoricals, so every distinct
+    string is classified once and each author row is then a lookup by integer code.
+    """
+
+    def __init__(self, names: pd.Series, affiliations: pd.Series):
+        self.names = pd.Categorical(names)
+        self.affiliations = pd.Categorical(affiliations)
+        # A trailing False makes code -1 (missing) index to "not Chinese"
+        self.name_flags = np.append(
+            chinese_name_mask(pd.Series(self.names.categories)).to_numpy(), False
+        )
+        self.affiliation_flags = np.append(
+            CHINESE_AFFILIATION_CLASSIFIER.mask(pd.Series(self.affiliations.categories)).to_numpy(), False
+        )
+
+    def is_chinese_name(self) -> np.ndarray:
+        return self.name_flags[self.names.codes]
+
+    def is_chinese_affiliation(self) -> np.ndarray:
+        return self.affiliation_flags[self.affiliations.codes]
+
+
+def _flatten_author_info(author_info: pd.Series) -> tuple[np.ndarray, np.ndarray, list[dict]]:
+    """Returns (mask of rows with authors, authors per such row, the flattened author dicts).
+
+    author_info may be an object column of lists or an Arrow-backed list column (as
+    read from a snapshot by a worker process).
+    """
+    with_info = has_author_info(author_info).to_numpy()
+    lists = author_info[with_info]
+    if isinstance(lists.dtype, pd.ArrowDtype):
+        return with_info, lists.list.len().to_numpy().astype(int), lists.list.flatten().tolist()
+    num_authors = lists.str.len().to_numpy().astype(int)
+    return with_info, num_authors, lists.explode().tolist()
+
+
+def explode_authors(df: pd.DataFrame, feature_store: str | None = None) -> pd.DataFrame:
+    """Create a row per author per paper using author_info.
+
+    With a feature_store directory the rows are read from its author_paper table, and
+    only the Chinese name/affiliation flags are computed.
+    """
+    if feature_store is None:
+        author_df = author_paper_table(df)
+    else:
+        author_df = load_features(feature_store, "author_paper")
+        author_df["date"] = pd.to_datetime(author_df["date"])
+    if author_df.empty:
+        return pd.DataFrame(columns=AUTHOR_COLUMNS)
+
+    table = ClassificationTable(author_df["author_name"], author_df["affiliation"])
+    author_df["is_chinese_name"] = table.is_chinese_name()
+    author_df["is_chinese_affiliation"] = table.is_chinese_affiliation()
+    return author_df
+
+
+def classify_papers(df: pd.DataFrame) -> pd.DataFrame:
+    """classify_paper_origin and classify_first_last for every paper, by name and affiliation.
+
+    Returns a frame aligned with df holding PAPER_ORIGIN_COLUMNS. Per-author flags come
+    from a ClassificationTable and are reduced per paper with bincount over author
+    offsets, instead of re-classifying each author_info list in Python.
+    """
+    origins = pd.DataFrame("unknown", index=df.index, columns=PAPER_ORIGIN_COLUMNS)
+    with_info, num_authors, authors = _flatten_author_info(df["author_info"])
+    if not authors:
+        return origins
+
+    table = ClassificationTable(
+        pd.Series([a.get("name", "") for a in authors]),
+        pd.Series([a.get("affiliation", "") for a in authors]),
+    )
+    paper = np.repeat(np.arange(len(num_authors)), num_authors)
+    first = np.cumsum(num_authors) - num_authors
+    last = first + num_authors - 1
+    for flags, all_col, first_col, last_col in [
+        (table.is_chinese_name(), "origin_by_name", "first_author_origin", "last_author_origin"),
+        (table.is_chinese_affiliation(), "origin_by_aff", "first_author_aff_origin", "last_author_aff_origin"),
+    ]:
+        num_chinese = np.bincount(paper, weights=flags, minlength=len(num_authors))
+        origins.loc[with_info, all_col] = np.where(
+            num_chinese == num_authors, "chinese", np.where(num_chinese == 0, "non_chinese", "mixed")
+        )
+        origins.loc[with_info, first_col] = np.where(flags[first], "chinese", "non_chinese")
+        origins.loc[with_info, last_col] = np.where(flags[last], "chinese", "non_chinese")
+    return origins
 
 
 # ── Plotting helpers ──────────────────────────────────────────────────────────
@@ -286,95 +446,81 @@ def plot_group_a(df: pd.DataFrame):
 # ── Group B: Cumulative Growth ────────────────────────────────────────────────
 
 
+CUMULATIVE_METRICS = [
+    "authors", "affiliations", "author_pairs", "repeat_author_pairs",
+    "institution_pairs", "repeat_institution_pairs",
+]
+
+
+def _cumulative_by_date(first_rows: np.ndarray, row_dates: pd.Series, dates: pd.Index) -> np.ndarray:
+    """Running count, at the end of each date, of items first seen at the given rows."""
+    per_date = row_dates.iloc[first_rows].value_counts()
+    return per_date.reindex(dates, fill_value=0).cumsum().to_numpy()
+
+
+def cumulative_growth(df: pd.DataFrame) -> pd.DataFrame:
+    """Cumulative unique authors, affiliations and collaborations at the end of each date.
+
+    Each author, affiliation and pair is counted from the date it first appears, and a
+    pair becomes a repeat collaboration on the date of its second paper. Pairs come from
+    a CoauthorGraph over the papers in date order. Returns one row per date, indexed by
+    date, with CUMULATIVE_METRICS columns.
+    """
+    df_sorted = df.sort_values("date", kind="stable").reset_index(drop=True)
+    row_dates = df_sorted["date"]
+    dates = pd.Index(row_dates.unique(), name="date")
+    growth = pd.DataFrame(0, index=dates, columns=CUMULATIVE_METRICS)
+    with_info, num_authors, authors = _flatten_author_info(df_sorted["author_info"])
+    if not authors:
+        return growth
+
+    author_rows = np.repeat(np.flatnonzero(with_info), num_authors)
+    names = pd.Series([a.get("name", "") for a in authors])
+    affs = pd.Series([a.get("affiliation", "") for a in authors]).str.strip().str.lower()
+    listed = (affs != "").to_numpy()
+    aff_rows = author_rows[listed]
+    affs = affs[listed]
+
+    growth["authors"] = _cumulative_by_date(
+        pd.Series(author_rows).groupby(names.to_numpy()).min().to_numpy(), row_dates, dates
+    )
+    growth["affiliations"] = _cumulative_by_date(
+        pd.Series(aff_rows).groupby(affs.to_numpy()).min().to_numpy(), row_dates, dates
+    )
+    for graph, unique_col, repeat_col in [
+        # Author pairs keep duplicate names, as combinations over each name list did
+        (CoauthorGraph(author_rows, names, dedupe=False), "author_pairs", "repeat_author_pairs"),
+        (CoauthorGraph(aff_rows, affs), "institution_pairs", "repeat_institution_pairs"),
+    ]:
+        first_papers, second_papers = graph.pair_milestones()
+        paper_rows = np.asarray(graph.papers)
+        growth[unique_col] = _cumulative_by_date(paper_rows[first_papers], row_dates, dates)
+        growth[repeat_col] = _cumulative_by_date(
+            paper_rows[second_papers[second_papers >= 0]], row_dates, dates
+        )
+    return growth
+
+
 def plot_group_b(df: pd.DataFrame):
     print("Group B: Cumulative Growth")
-    df_sorted = df.sort_values("date")
-
-    # b1: cumulative unique authors
-    seen_authors = set()
-    cum_authors = []
-    dates = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list):
-            for a in row["author_info"]:
-                seen_authors.add(a.get("name", ""))
-        cum_authors.append(len(seen_authors))
-        dates.append(row["date"])
-    plot_cumulative(pd.Series(dates), cum_authors, "Cumulative Unique Authors",
-                    "# Unique Authors", str(OUT_DIR / "b1_cumulative_authors.png"))
-
-    # b2: cumulative unique affiliations
-    seen_affs = set()
-    cum_affs = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list):
-            for a in row["author_info"]:
-                aff = a.get("affiliation", "").strip()
-                if aff:
-                    seen_affs.add(aff.lower())
-        cum_affs.append(len(seen_affs))
-    plot_cumulative(pd.Series(dates), cum_affs, "Cumulative Unique Affiliations",
-                    "# Unique Affiliations", str(OUT_DIR / "b2_cumulative_affiliations.png"))
-
-    # b3: cumulative unique collaborations (author pairs)
-    seen_pairs = set()
-    cum_pairs = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list) and len(row["author_info"]) >= 2:
-            names = [a.get("name", "") for a in row["author_info"]]
-            for pair in combinations(sorted(names), 2):
-                seen_pairs.add(pair)
-        cum_pairs.append(len(seen_pairs))
-    plot_cumulative(pd.Series(dates), cum_pairs, "Cumulative Unique Collaborations (Author Pairs)",
-                    "# Unique Pairs", str(OUT_DIR / "b3_cumulative_collaborations.png"))
-
-    # b4: cumulative repeat collaborations
-    pair_counts: Counter = Counter()
-    cum_repeats = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list) and len(row["author_info"]) >= 2:
-            names = [a.get("name", "") for a in row["author_info"]]
-            for pair in combinations(sorted(names), 2):
-                pair_counts[pair] += 1
-        repeat_count = sum(1 for c in pair_counts.values() if c > 1)
-        cum_repeats.append(repeat_count)
-    plot_cumulative(pd.Series(dates), cum_repeats, "Cumulative Repeat Collaborations",
-                    "# Pairs with 2+ Papers", str(OUT_DIR / "b4_cumulative_repeat_collabs.png"))
-
-    # b5: cumulative unique institution collaborations
-    seen_inst_pairs = set()
-    cum_inst_pairs = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list) and len(row["author_info"]) >= 2:
-            affs = sorted(set(
-                a.get("affiliation", "").strip().lower()
-                for a in row["author_info"]
-                if a.get("affiliation", "").strip()
-            ))
-            if len(affs) >= 2:
-                for pair in combinations(affs, 2):
-                    seen_inst_pairs.add(pair)
-        cum_inst_pairs.append(len(seen_inst_pairs))
-    plot_cumulative(pd.Series(dates), cum_inst_pairs, "Cumulative Unique Institution Collaborations",
-                    "# Unique Institution Pairs", str(OUT_DIR / "b5_cumulative_institution_collaborations.png"))
-
-    # b6: cumulative repeat institution collaborations
-    inst_pair_counts: Counter = Counter()
-    cum_inst_repeats = []
-    for _, row in df_sorted.iterrows():
-        if isinstance(row["author_info"], list) and len(row["author_info"]) >= 2:
-            affs = sorted(set(
-                a.get("affiliation", "").strip().lower()
-                for a in row["author_info"]
-                if a.get("affiliation", "").strip()
-            ))
-            if len(affs) >= 2:
-                for pair in combinations(affs, 2):
-                    inst_pair_counts[pair] += 1
-        repeat_count = sum(1 for c in inst_pair_counts.values() if c > 1)
-        cum_inst_repeats.append(repeat_count)
-    plot_cumulative(pd.Series(dates), cum_inst_repeats, "Cumulative Repeat Institution Collaborations",
-                    "# Institution Pairs with 2+ Papers", str(OUT_DIR / "b6_cumulative_institution_repeat_collabs.png"))
+    growth = cumulative_growth(df)
+    dates = pd.Series(growth.index)
+
+    for metric, title, ylabel, fname in [
+        ("authors", "Cumulative Unique Authors",
+         "# Unique Authors", "b1_cumulative_authors.png"),
+        ("affiliations", "Cumulative Unique Affiliations",
+         "# Unique Affiliations", "b2_cumulative_affiliations.png"),
+        ("author_pairs", "Cumulative Unique Collaborations (Author Pairs)",
+         "# Unique Pairs", "b3_cumulative_collaborations.png"),
+        ("repeat_author_pairs", "Cumulative Repeat Collaborations",
+         "# Pairs with 2+ Papers", "b4_cumulative_repeat_collabs.png"),
+        ("institution_pairs", "Cumulative Unique Institution Collaborations",
+         "# Unique Institution Pairs", "b5_cumulative_institution_collaborations.png"),
+        ("repeat_institution_pairs", "Cumulative Repeat Institution Collaborations",
+         "# Institution Pairs with 2+ Papers", "b6_cumulative_institution_repeat_collabs.png"),
+    ]:
+        plot_cumulative(dates, growth[metric].tolist(), title, ylabel, str(OUT_DIR / fname))
 
 
 # ── Group C: Author Activity Distributions ────────────────────────────────────
@@ -653,29 +799,16 @@ def plot_group_d(author_df: pd.DataFrame):
     print(f"  Saved d5_papers_per_affiliation.csv")
 
     # d6: top 100 author collaborations
-    author_pair_counts: Counter = Counter()
-    for _, row in author_df.groupby("paper_id"):
-        names = sorted(row["author_name"].unique())
-        if len(names) >= 2:
-            for pair in combinations(names, 2):
-                author_pair_counts[pair] += 1
-    top_author_collabs = pd.DataFrame(
-        [(a, b, c) for (a, b), c in author_pair_counts.most_common(100)],
-        columns=["author_1", "author_2", "num_papers"],
+    top_author_collabs = CoauthorGraph(author_df["paper_id"], author_df["author_name"]).top_pairs(
+        100, columns=("author_1", "author_2", "num_papers")
     )
     top_author_collabs.to_csv(OUT_DIR / "d6_top_author_collaborations.csv", index=False)
     print(f"  Saved d6_top_author_collaborations.csv")
 
     # d7: top 100 institution collaborations
-    inst_pair_counts: Counter = Counter()
-    for paper_id, grp in aff_df.groupby("paper_id"):
-        affs = sorted(set(grp["affiliation"].str.strip().str.lower()))
-        if len(affs) >= 2:
-            for pair in combinations(affs, 2):
-                inst_pair_counts[pair] += 1
-    top_inst_collabs = pd.DataFrame(
-        [(a, b, c) for (a, b), c in inst_pair_counts.most_common(100)],
-        columns=["institution_1", "institution_2", "num_papers"],
+    institutions = aff_df["affiliation"].str.strip().str.lower()
+    top_inst_collabs = CoauthorGraph(aff_df["paper_id"], institutions).top_pairs(
+        100, columns=("institution_1", "institution_2", "num_papers")
     )
     top_inst_collabs.to_csv(OUT_DIR / "d7_top_institution_collaborations.csv", index=False)
     print(f"  Saved d7_top_institution_collaborations.csv")
@@ -761,12 +894,7 @@ def plot_group_e(df: pd.DataFrame, author_df: pd.DataFrame):
 
     # Classify papers
     df = df.copy()
-    df["origin_by_name"] = df["author_info"].apply(lambda x: classify_paper_origin(x, by_affiliation=False))
-    df["origin_by_aff"] = df["author_info"].apply(lambda x: classify_paper_origin(x, by_affiliation=True))
-    df["first_author_origin"] = df["author_info"].apply(lambda x: classify_first_last(x, "first"))
-    df["last_author_origin"] = df["author_info"].apply(lambda x: classify_first_last(x, "last"))
-    df["first_author_aff_origin"] = df["author_info"].apply(lambda x: classify_first_last(x, "first", by_affiliation=True))
-    df["last_author_aff_origin"] = df["author_info"].apply(lambda x: classify_first_last(x, "last", by_affiliation=True))
+    df[PAPER_ORIGIN_COLUMNS] = classify_papers(df)
 
     configs = [
         ("origin_by_name", "chinese", "Chinese Authors (by name)", "e1_chinese_authors_over_time.png"),
@@ -844,19 +972,25 @@ def plot_group_e(df: pd.DataFrame, author_df: pd.DataFrame):
         results = {"any": Counter(), "first": Counter(), "last": Counter()}
         for role, role_filter in [("any", None), ("first", "is_first_author"), ("last", "is_last_author")]:
             role_subset = subset[subset[role_filter]] if role_filter else subset
-            for author_name, grp in role_subset.groupby("author_name"):
-                affs = [a.strip() for a in grp["affiliation"] if a.strip()]
-                if not affs:
-                    results[role]["No affiliation"] += 1
-                    continue
-                has_cn = any(is_chinese_affiliation(a) for a in affs)
-                has_ncn = any(not is_chinese_affiliation(a) for a in affs)
-                if has_cn and has_ncn:
-                    results[role]["Both"] += 1
-                elif has_cn:
-                    results[role]["Chinese affil. only"] += 1
-                else:
-                    results[role]["Non-Chinese affil. only"] += 1
+            affs = role_subset["affiliation"].str.strip()
+            listed = affs != ""
+            is_cn = CHINESE_AFFILIATION_CLASSIFIER.mask(affs[listed])
+            per_author = pd.DataFrame({
+                "author_name": role_subset.loc[listed, "author_name"],
+                "has_cn": is_cn,
+                "has_ncn": ~is_cn,
+            }).groupby("author_name").any()
+            num_unlisted = role_subset["author_name"].nunique() - len(per_author)
+            if num_unlisted:
+                results[role]["No affiliation"] += num_unlisted
+            both = per_author["has_cn"] & per_author["has_ncn"]
+            for label, count in [
+                ("Both", both.sum()),
+                ("Chinese affil. only", (per_author["has_cn"] & ~both).sum()),
+                ("Non-Chinese affil. only", (~per_author["has_cn"]).sum()),
+            ]:
+                if count:
+                    results[role][label] += int(count)
         return results
 
     def plot_affiliation_breakdown(breakdown, name_label, fname):
@@ -1113,21 +1247,21 @@ def plot_group_g(author_df: pd.DataFrame):
 # ── Group H: Author Summary & Exhaustive Table ───────────────────────────────
 
 
-def plot_group_h(df: pd.DataFrame, author_df: pd.DataFrame):
+def plot_group_h(df: pd.DataFrame, author_df: pd.DataFrame, per_author: pd.DataFrame | None = None):
+    """per_author is the feature store's per_author table, or None to aggregate author_df."""
     print("Group H: Author Summary & Exhaustive Table")
 
     total_authors = author_df["author_name"].nunique()
 
     # Build per-author aggregates
-    per_author = author_df.groupby("author_name").agg(
-        num_papers=("paper_id", "nunique"),
-        total_upvotes=("upvotes", "sum"),
-        was_first_author=("is_first_author", "any"),
-        was_last_author=("is_last_author", "any"),
+    if per_author is None:
+        per_author = per_author_table(author_df)
+    chinese = author_df.groupby("author_name").agg(
         is_chinese_name=("is_chinese_name", "first"),
         has_chinese_affiliation=("is_chinese_affiliation", "any"),
         has_non_chinese_affiliation=("is_chinese_affiliation", lambda x: (~x).any()),
     ).reset_index()
+    per_author = per_author.merge(chinese, on="author_name", how="left")
 
     per_author["upvote_density"] = per_author["total_upvotes"] / per_author["num_papers"]
 
@@ -1136,20 +1270,6 @@ def plot_group_h(df: pd.DataFrame, author_df: pd.DataFrame):
     solo_author_names = author_df[author_df["paper_id"].isin(solo_papers)]["author_name"].unique()
     per_author["was_solo_author"] = per_author["author_name"].isin(solo_author_names)
 
-    # Num unique affiliations
-    affs = author_df.groupby("author_name")["affiliation"].apply(
-        lambda x: len(set(a.strip().lower() for a in x if a.strip()))
-    ).reset_index()
-    affs.columns = ["author_name", "num_unique_affiliations"]
-    per_author = per_author.merge(affs, on="author_name", how="left")
-
-    # List of unique affiliations per author
-    aff_lists = author_df.groupby("author_name")["affiliation"].apply(
-        lambda x: "; ".join(sorted(set(a.strip() for a in x if a.strip())))
-    ).reset_index()
-    aff_lists.columns = ["author_name", "affiliations"]
-    per_author = per_author.merge(aff_lists, on="author_name", how="left")
-
     # Derived booleans
     per_author["is_single_paper"] = per_author["num_papers"] == 1
     per_author["is_multi_paper"] = per_author["num_papers"] > 1
@@ -1217,40 +1337,361 @@ def plot_group_h(df: pd.DataFrame, author_df: pd.DataFrame):
         num_papers=("paper_id", "nunique"),
         num_authors=("author_name", "nunique"),
     ).reset_index()
-    aff_stats["is_chinese_affiliation"] = aff_stats["affiliation"].apply(is_chinese_affiliation)
+    aff_stats["is_chinese_affiliation"] = CHINESE_AFFILIATION_CLASSIFIER.mask(aff_stats["affiliation"])
     aff_stats = aff_stats.sort_values("num_papers", ascending=False)
     aff_stats.to_csv(OUT_DIR / "h4_exhaustive_affiliations_table.csv", index=False)
     print(f"  Saved h4_exhaustive_affiliations_table.csv ({len(aff_stats):,} unique affiliations)")
 
 
+# ── Plot group registry & execution ───────────────────────────────────────────
+
+# Dataset columns explode_authors reads to build author_df
+AUTHOR_SOURCE_COLUMNS = ("date", "paper_id", "upvotes", "author_info")
+
+# Group -> (plot function, frames it takes, dataset columns its outputs depend on).
+# Listed roughly slowest first so a process pool starts the long groups first.
+PLOT_GROUPS = {
+    "e": (plot_group_e, ("df", "author_df"), ("date", "paper_id", "upvotes", "authors", "author_info")),
+    "c": (plot_group_c, ("df", "author_df"), ("date", "paper_id", "upvotes", "authors", "author_info")),
+    "b": (plot_group_b, ("df",), ("date", "author_info")),
+    "a": (plot_group_a, ("df",), ("date", "upvotes")),
+    "f": (plot_group_f, ("df",), ("upvotes", "authors", "title", "summary", "author_info")),
+    "h": (plot_group_h, ("df", "author_df", "per_author"), ("date", "paper_id", "upvotes", "authors", "author_info")),
+    "d": (plot_group_d, ("author_df",), AUTHOR_SOURCE_COLUMNS),
+    "g": (plot_group_g, ("author_df",), AUTHOR_SOURCE_COLUMNS),
+}
+
+CACHE_MANIFEST = ".analyze_cache.json"
+
+
+def frame_columns(group: str, frame_name: str) -> list[str] | None:
+    """Columns of frame_name that group reads, or None for all of them.
+
+    For df these are the group's dataset columns plus the paper_features derived from
+    them (e.g. authors -> num_authors); author_df is read whole.
+    """
+    if frame_name != "df":
+        return None
+    columns = list(PLOT_GROUPS[group][2])
+    return columns + list(paper_features(pd.DataFrame(columns=columns)).columns)
+
+
+def _frame_table(frame: pd.DataFrame) -> pa.Table:
+    """Converts a frame to Arrow, with author_info typed as AUTHOR_INFO_TYPE."""
+    columns = {}
+    for name in frame.columns:
+        if name == "author_info":
+            columns[name] = pa.array(frame[name], type=AUTHOR_INFO_TYPE, from_pandas=True)
+        else:
+            columns[name] = pa.Table.from_pandas(frame[[name]], preserve_index=False).column(0)
+    return pa.table(columns)
+
+
+def write_snapshot(frames: dict[str, pd.DataFrame], snapshot_dir: str) -> None:
+    """Writes each frame as an uncompressed Arrow IPC file that workers can memory-map."""
+    for name, frame in frames.items():
+        table = _frame_table(frame)
+        with pa.ipc.new_file(os.path.join(snapshot_dir, f"{name}.arrow"), table.schema) as writer:
+            writer.write_table(table)
+
+
+def _nested_as_arrow(arrow_type: pa.DataType) -> pd.ArrowDtype | None:
+    """to_pandas types_mapper that leaves list/struct columns in Arrow."""
+    if pa.types.is_list(arrow_type) or pa.types.is_struct(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def read_snapshot(name: str, snapshot_dir: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Reads some columns of a snapshot frame through a read-only memory map.
+
+    List columns (authors, author_info) stay Arrow-backed, referencing the mapped file
+    instead of becoming a Python list of dicts per row; plot code reaches them only
+    through has_author_info and _flatten_author_info, which handle both. Frames aren't
+    kept between groups, so a worker holds the columns of the group it is running.
+    """
+    with pa.memory_map(os.path.join(snapshot_dir, f"{name}.arrow")) as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([column for column in table.column_names if column in columns])
+        return table.to_pandas(types_mapper=_nested_as_arrow)
+
+
+def _run_group_in_worker(group: str, snapshot_dir: str, out_dir: Path) -> str:
+    global OUT_DIR
+    OUT_DIR = out_dir
+    plt.switch_backend("Agg")
+    plot_fn, frame_names, _ = PLOT_GROUPS[group]
+    plot_fn(*(
+        read_snapshot(name, snapshot_dir, frame_columns(group, name))
+        if os.path.exists(os.path.join(snapshot_dir, f"{name}.arrow")) else None
+        for name in frame_names
+    ))
+    return group
+
+
+def run_groups_parallel(frames: dict[str, pd.DataFrame | None], groups: list[str], jobs: int,
+                        on_group_done=None):
+    """Runs plot groups in a process pool, sharing df/author_df via an Arrow snapshot.
+
+    Frames are written once to memory-mappable Arrow files instead of being pickled
+    to each worker, and each worker converts only the columns its current group reads
+    (see frame_columns), so e.g. group a never holds the abstracts or author lists
+    it doesn't use. Frames that are None aren't written and reach the plot functions
+    as None. Parallelism is per plot group.
+    """
+    with tempfile.TemporaryDirectory(prefix="analyze-snapshot-") as snapshot_dir:
+        write_snapshot({name: frame for name, frame in frames.items() if frame is not None}, snapshot_dir)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(_run_group_in_worker, group, snapshot_dir, OUT_DIR)
+                for group in PLOT_GROUPS
+                if group in groups
+            ]
+            for future in as_completed(futures):
+                group = future.result()
+                print(f"Finished group {group.upper()}")
+                if on_group_done:
+                    on_group_done(group)
+
+
+# ── Artifact cache ────────────────────────────────────────────────────────────
+
+
+def _stable_repr(value) -> str | None:
+    """repr that is identical across runs, or None for values without one."""
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(repr(v) for v in value))
+    text = repr(value)
+    return None if " at 0x" in text else text
+
+
+def code_fingerprint(fn) -> str:
+    """Hashes fn's source plus every project function, class and constant it references.
+
+    References are followed recursively by name, so editing a shared helper such as
+    plot_cumulative invalidates the groups that use it, and only those. Names are
+    looked up in the namespace of the module that defines the referencing code, so
+    a project helper's own constants count too.
+    """
+    parts = []
+    seen = set()
+    pending = [fn]
+    while pending:
+        obj = pending.pop()
+        source = inspect.getsource(obj)
+        parts.append(source)
+        namespace = getattr(obj, "__globals__", None) or vars(sys.modules[obj.__module__])
+        for name in set(re.findall(r"[A-Za-z_]\w*", source)):
+            if (obj.__module__, name) in seen:
+                continue
+            seen.add((obj.__module__, name))
+            value = namespace.get(name)
+            if value is None or value is obj:
+                continue
+            if inspect.isfunction(value) or inspect.isclass(value):
+                if value.__module__ == __name__ or value.__module__.startswith("hf_daily_papers_analytics"):
+                    pending.append(value)
+            elif not inspect.ismodule(value) and (text := _stable_repr(value)) is not None:
+                parts.append(f"{obj.__module__}.{name} = {text}")
+    return hashlib.sha256("\n".join(sorted(parts)).encode("utf-8")).hexdigest()
+
+
+def group_fingerprints(df: pd.DataFrame, groups: list[str]) -> dict[str, str]:
+    """Fingerprints each group by the content of its input columns and its code.
+
+    The granularity is the group, not the artifact: every artifact aggregates over
+    the whole history, so a run that appends papers changes all of them anyway, and
+    the cache only pays off when the data is unchanged (re-runs, code edits to other
+    groups, --only). Finer fingerprints would not turn nightly appends into hits.
+    """
+    column_digests = {}
+    fingerprints = {}
+    for group in groups:
+        plot_fn, _, columns = PLOT_GROUPS[group]
+        digest = hashlib.sha256(code_fingerprint(plot_fn).encode("utf-8"))
+        for column in columns:
+            if column not in column_digests:
+                sink = pa.BufferOutputStream()
+                table = _frame_table(df[[column]])
+                with pa.ipc.new_stream(sink, table.schema) as writer:
+                    writer.write_table(table)
+                column_digests[column] = hashlib.sha256(sink.getvalue()).hexdigest()
+            digest.update(f"{column}:{column_digests[column]}".encode("utf-8"))
+        fingerprints[group] = digest.hexdigest()
+    return fingerprints
+
+
+def group_artifacts(group: str, since: float = 0.0) -> list[str]:
+    """Output files of a group in OUT_DIR (e.g. e1_*.png, e_paper_origin_summary.csv)."""
+    pattern = re.compile(rf"^{group}(\d+|_)\w*\.(png|csv)$")
+    return sorted(
+        path.name for path in OUT_DIR.iterdir()
+        if pattern.match(path.name) and path.stat().st_mtime >= since
+    )
+
+
+def load_cache_manifest() -> dict:
+    path = OUT_DIR / CACHE_MANIFEST
+    if not path.exists():
+        return {"artifacts": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cache_manifest(manifest: dict) -> None:
+    path = OUT_DIR / CACHE_MANIFEST
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_group_fresh(manifest: dict, group: str, fingerprint: str) -> bool:
+    """True if the group's recorded artifacts all exist and were built from this fingerprint."""
+    recorded = {
+        name: entry for name, entry in manifest["artifacts"].items() if entry["group"] == group
+    }
+    return bool(recorded) and all(
+        entry["fingerprint"] == fingerprint and (OUT_DIR / name).exists()
+        for name, entry in recorded.items()
+    )
+
+
+def record_group(manifest: dict, group: str, fingerprint: str, since: float) -> None:
+    """Records the artifacts a group just wrote under its fingerprint."""
+    manifest["artifacts"] = {
+        name: entry for name, entry in manifest["artifacts"].items() if entry["group"] != group
+    }
+    for name in group_artifacts(group, since):
+        manifest["artifacts"][name] = {"group": group, "fingerprint": fingerprint}
+    save_cache_manifest(manifest)
+
+
+def artifact_numbers(group: str) -> list[int]:
+    """Numbers of a group's artifacts (e.g. 1-26 for e1..e26), from the file names in its code."""
+    source = inspect.getsource(PLOT_GROUPS[group][0])
+    return sorted({int(number) for number in re.findall(rf"[\"']{group}(\d+)_", source)})
+
+
+def select_groups(only: str | None) -> list[str]:
+    """Maps an --only selector like "e1,e25,b" to the plot groups producing those artifacts.
+
+    Each item is a group letter or a group letter and one of its artifact numbers;
+    anything else raises ValueError.
+    """
+    if not only:
+        return sorted(PLOT_GROUPS)
+    groups = set()
+    for artifact in only.split(","):
+        match = re.fullmatch(r"([a-z])([1-9]\d*)?", artifact.strip().lower())
+        if match is None or match.group(1) not in PLOT_GROUPS:
+            raise ValueError(
+                f"Unknown artifact {artifact!r}: expected a group ({', '.join(sorted(PLOT_GROUPS))}) "
+                "or an artifact like a1 or e25."
+            )
+        group, number = match.groups()
+        numbers = artifact_numbers(group)
+        if number is not None and int(number) not in numbers:
+            raise ValueError(f"Unknown artifact {artifact!r}: group {group} has {group}1 to {group}{max(numbers)}.")
+        groups.add(group)
+    return sorted(groups)
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 
 def main():
-    print(f"Loading data from {DATA_PATH}...")
-    df = load_data()
+    global OUT_DIR
+    parser = argparse.ArgumentParser(description="Generate HF Daily Papers visualizations.")
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=DATA_PATH,
+        help=f"Dataset to analyze: .jsonl, .json or .parquet (default: {DATA_PATH}).",
+    )
+    parser.add_argument(
+        "--output_dir",
+        type=Path,
+        default=OUT_DIR,
+        help=f"Where to write figures and tables (default: {OUT_DIR}).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Run plot groups in this many processes; 0 uses every core (default: 1).",
+    )
+    parser.add_argument(
+        "--only",
+        type=str,
+        help="Comma-separated artifacts or groups to consider, e.g. e1,e25 or b. An artifact "
+        "selects the whole group that produces it.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Regenerate outputs even if their inputs and code are unchanged "
+        f"(fingerprints are kept in {CACHE_MANIFEST}).",
+    )
+    parser.add_argument(
+        "--feature_store",
+        type=str,
+        help="Read derived paper and author columns from this feature store directory "
+        "(written by update_hf_datasets.py --feature_store) instead of recomputing them.",
+    )
+    args = parser.parse_args()
+    OUT_DIR = args.output_dir
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    jobs = args.jobs or os.cpu_count()
+
+    # Only load the columns the selected groups read, e.g. --only a,d,g never reads abstracts
+    try:
+        groups = select_groups(args.only)
+    except ValueError as e:
+        parser.error(str(e))
+    columns = {column for group in groups for column in PLOT_GROUPS[group][2]}
+    if args.feature_store:
+        # Stored features are keyed by (date, paper_id)
+        columns |= {"date", "paper_id"}
+    columns = sorted(columns)
+    print(f"Loading {', '.join(columns)} from {args.data}...")
+    df = load_data(args.data, columns=columns, feature_store=args.feature_store)
     print(f"Loaded {len(df):,} papers\n")
 
-    print("Exploding author info...")
-    author_df = explode_authors(df)
-    print(f"Created {len(author_df):,} author-paper rows\n")
-
-    plot_group_a(df)
-    print()
-    plot_group_b(df)
-    print()
-    plot_group_c(df, author_df)
-    print()
-    plot_group_d(author_df)
-    print()
-    plot_group_e(df, author_df)
-    print()
-    plot_group_f(df)
-    print()
-    plot_group_g(author_df)
-    print()
-    plot_group_h(df, author_df)
-    print()
+    author_df = None
+    if any("author_df" in PLOT_GROUPS[group][1] for group in groups):
+        print("Exploding author info...")
+        author_df = explode_authors(df, feature_store=args.feature_store)
+        print(f"Created {len(author_df):,} author-paper rows\n")
+
+    # Only the store has per_author precomputed; without one, group h aggregates author_df
+    per_author = None
+    if args.feature_store and any("per_author" in PLOT_GROUPS[group][1] for group in groups):
+        per_author = load_features(args.feature_store, "per_author")
+    frames = {"df": df, "author_df": author_df, "per_author": per_author}
+
+    manifest = load_cache_manifest()
+    fingerprints = group_fingerprints(df, groups)
+    stale = [g for g in groups if args.force or not is_group_fresh(manifest, g, fingerprints[g])]
+    fresh = [g for g in groups if g not in stale]
+    if fresh:
+        print(f"Up to date, skipping groups: {', '.join(g.upper() for g in fresh)} (use --force to rebuild)\n")
+
+    started = time.time() - 1  # mtime granularity slack
+
+    def on_group_done(group):
+        record_group(manifest, group, fingerprints[group], started)
+
+    if jobs > 1 and len(stale) > 1:
+        print(f"Running plot groups with {jobs} processes...\n")
+        run_groups_parallel(frames, stale, jobs, on_group_done)
+    else:
+        for group in stale:
+            plot_fn, frame_names, _ = PLOT_GROUPS[group]
+            plot_fn(*(frames[name] for name in frame_names))
+            print()
+            on_group_done(group)
     print("Done! All outputs saved to", OUT_DIR)
 
 